@@ -0,0 +1,144 @@
+"""Benchmark da exportação .apkg: escritor em lote contra genanki.
+
+Gera cards sintéticos (basic, cloze e questão, em rodízio) e mede o tempo
+de ``ApkgWriter`` e do caminho anterior, um ``genanki.Note`` por card e
+``genanki.Package.write_to_file``. Mede também, para cada nível de
+compressão do zip, o tempo e o tamanho do pacote, e o pico de memória
+(tracemalloc) do base64 montado via BytesIO contra ``iter_apkg_base64``.
+
+Uso:
+    uv run python benchmarks/bench_apkg.py [--sizes 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from io import BytesIO
+from pathlib import Path
+
+import genanki
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from legal_anki.apkg import ApkgWriter  # noqa: E402
+from legal_anki.exporters import iter_apkg_base64  # noqa: E402
+from legal_anki.models import AnkiCard, get_model_for_card_type  # noqa: E402
+from legal_anki.serializers import map_card_to_fields  # noqa: E402
+
+
+def build_cards(n: int) -> list[AnkiCard]:
+    cards = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            card = AnkiCard(
+                front=f"Qual o prazo do mandado de segurança no caso {i}?",
+                back="120 dias, contados da ciência do ato impugnado (Lei 12.016/2009, art. 23).",
+                card_type="basic",
+                tags=["remedios_constitucionais"],
+            )
+        elif kind == 1:
+            card = AnkiCard(
+                front=f"A emenda {i} exige {{{{c1::três quintos}}}} em {{{{c2::dois turnos}}}}.",
+                back="Art. 60, § 2º, CF/88",
+                card_type="cloze",
+                tags=["processo_legislativo"],
+                extra={"fundamento": "Art. 60, § 2º, CF/88"},
+            )
+        else:
+            card = AnkiCard(
+                front=f"(CESPE/2023) Assertiva {i}: o direito ao silêncio é absoluto.",
+                back="ERRADO. O direito ao silêncio não é absoluto.",
+                card_type="questao",
+                tags=["direitos_fundamentais", "cespe"],
+                extra={"banca": "CESPE", "ano": "2023", "cargo": "Juiz"},
+            )
+        cards.append(card)
+    return cards
+
+
+def with_genanki(cards: list[AnkiCard], path: Path) -> None:
+    deck = genanki.Deck(deck_id=1, name="Bench")
+    for card in cards:
+        model = get_model_for_card_type(card.card_type)
+        deck.add_note(genanki.Note(model=model, fields=map_card_to_fields(card), tags=card.tags))
+    genanki.Package(deck).write_to_file(str(path))
+
+
+def with_writer(cards: list[AnkiCard], path: Path) -> None:
+    with ApkgWriter(path, deck_name="Bench", deck_id=1) as writer:
+        writer.write_cards(cards)
+
+
+def base64_in_memory(cards: list[AnkiCard]) -> int:
+    """Caminho anterior de export_to_apkg_base64: pacote, bytes e str inteiros."""
+    buffer = BytesIO()
+    with ApkgWriter(buffer, deck_name="Bench", deck_id=1) as writer:
+        writer.write_cards(cards)
+    return len(base64.b64encode(buffer.getvalue()).decode("utf-8"))
+
+
+def base64_streaming(cards: list[AnkiCard]) -> int:
+    """Partes enviadas (e descartadas) à medida que o zip é escrito."""
+    return sum(len(part) for part in iter_apkg_base64(cards, deck_name="Bench"))
+
+
+def peak_mib(fn, cards: list[AnkiCard]) -> tuple[float, float]:
+    """(segundos, pico de memória em MiB) de uma chamada."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn(cards)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", module="genanki")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            cards = build_cards(n)
+            results = []
+            for name, fn in (("genanki", with_genanki), ("em lote", with_writer)):
+                path = Path(tmp) / f"{name}.apkg"
+                t0 = time.perf_counter()
+                fn(cards, path)
+                results.append((name, time.perf_counter() - t0, path.stat().st_size))
+            base = results[0][1]
+            for name, elapsed, size in results:
+                print(
+                    f"{n:>7} cards, {name:>7}: {elapsed:6.2f}s "
+                    f"({n / elapsed:,.0f} notas/s, {base / elapsed:.1f}x), "
+                    f"{size / 2**20:.1f} MiB"
+                )
+
+            for level in (None, 1, 6):
+                path = Path(tmp) / f"zip{level}.apkg"
+                t0 = time.perf_counter()
+                with ApkgWriter(path, deck_name="Bench", deck_id=1, compresslevel=level) as w:
+                    w.write_cards(cards)
+                elapsed = time.perf_counter() - t0
+                label = "sem compressão" if level is None else f"deflate {level}"
+                print(
+                    f"{n:>7} cards, zip {label:>14}: {elapsed:6.2f}s, "
+                    f"{path.stat().st_size / 2**20:.1f} MiB"
+                )
+
+            for name, fn in (("BytesIO", base64_in_memory), ("streaming", base64_streaming)):
+                elapsed, peak = peak_mib(fn, cards)
+                print(f"{n:>7} cards, base64 {name:>9}: {elapsed:6.2f}s, pico {peak:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
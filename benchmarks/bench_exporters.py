@@ -0,0 +1,125 @@
+"""Benchmark dos escritores incrementais de CSV, TSV e JSON.
+
+Para cada tamanho, grava cards gerados sob demanda (um gerador, como na
+saída de ``generate_cards_iter``) com o escritor incremental e mede tempo e
+pico de memória (tracemalloc). Até ``--baseline-max`` cards, compara com a
+exportação anterior, que montava a saída inteira em memória a partir de
+uma lista antes de gravar.
+
+Uso:
+    uv run python benchmarks/bench_exporters.py [--sizes 10000 100000 1000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from legal_anki.exporters import open_card_writer  # noqa: E402
+from legal_anki.models import AnkiCard  # noqa: E402
+from legal_anki.serializers import _sanitize_text  # noqa: E402
+
+FORMATS = ("csv", "tsv", "json")
+
+
+def iter_cards(n: int) -> Iterator[AnkiCard]:
+    """Cards sintéticos de tamanho realista, criados sob demanda."""
+    for i in range(n):
+        yield AnkiCard(
+            front=f"Qual o prazo do mandado de segurança no caso {i}?",
+            back=(
+                "O prazo decadencial é de 120 dias, contados da ciência do ato "
+                "impugnado (art. 23 da Lei 12.016/2009)."
+            ),
+            card_type="basic",
+            tags=["remedios_constitucionais", "mandado_seguranca"],
+            extra={"fundamento": "Lei 12.016/2009, art. 23"},
+        )
+
+
+def stream(fmt: str, n: int, path: Path) -> None:
+    with open_card_writer(path, fmt) as writer:
+        writer.write_cards(iter_cards(n))
+
+
+def monolithic(fmt: str, n: int, path: Path) -> None:
+    """Exportação anterior: lista completa + conteúdo inteiro em memória."""
+    cards = list(iter_cards(n))
+    if fmt == "csv":
+        out = StringIO()
+        writer = csv.writer(out, delimiter=";", quoting=csv.QUOTE_ALL)
+        writer.writerow(["front", "back", "tags", "type", "extra"])
+        for card in cards:
+            writer.writerow(
+                [
+                    _sanitize_text(card.front),
+                    _sanitize_text(card.back),
+                    _sanitize_text(" ".join(card.tags)),
+                    card.card_type,
+                    _sanitize_text(json.dumps(card.extra, ensure_ascii=False)),
+                ]
+            )
+        content = out.getvalue()
+    elif fmt == "tsv":
+        content = "\n".join(
+            f"{_sanitize_text(c.front, chr(9))}\t{_sanitize_text(c.back, chr(9))}\t"
+            f"{_sanitize_text(' '.join(c.tags))}"
+            for c in cards
+        )
+    else:
+        content = json.dumps(
+            {"cards": [c.model_dump() for c in cards]}, ensure_ascii=False, indent=2
+        )
+    path.write_text(content, encoding="utf-8")
+
+
+def measure(fn: Callable[[str, int, Path], None], fmt: str, n: int, path: Path):
+    """(segundos, pico de memória em MiB); o pico vem de uma segunda execução."""
+    t0 = time.perf_counter()
+    fn(fmt, n, path)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    fn(fmt, n, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--baseline-max", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            for fmt in args.formats:
+                path = Path(tmp) / f"cards.{fmt}"
+                elapsed, peak = measure(stream, fmt, n, path)
+                size = path.stat().st_size / 2**20
+                print(
+                    f"{n:>9} {fmt}: incremental {elapsed:6.2f}s "
+                    f"({n / elapsed:,.0f} cards/s), pico {peak:7.1f} MiB, "
+                    f"arquivo {size:.0f} MiB"
+                )
+                if n <= args.baseline_max:
+                    elapsed, peak = measure(monolithic, fmt, n, path)
+                    print(
+                        f"{'':>9} {fmt}: em memória  {elapsed:6.2f}s "
+                        f"({n / elapsed:,.0f} cards/s), pico {peak:7.1f} MiB"
+                    )
+
+
+if __name__ == "__main__":
+    main()
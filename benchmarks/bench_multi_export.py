@@ -0,0 +1,107 @@
+"""Benchmark da exportação em vários formatos: uma passada contra chamadas em série.
+
+Exporta os mesmos cards para CSV, TSV, JSON, JSONL (gzip) e APKG de três
+formas: um exportador por formato, em sequência (caminho anterior);
+``export_multi`` numa passada, na thread atual; e ``export_multi`` com uma
+thread de escrita por formato.
+
+Uso:
+    uv run python benchmarks/bench_multi_export.py [--sizes 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from legal_anki.exporters import (  # noqa: E402
+    export_multi,
+    export_to_apkg,
+    export_to_csv,
+    export_to_json,
+    export_to_jsonl,
+    export_to_tsv,
+)
+from legal_anki.models import AnkiCard  # noqa: E402
+
+FORMATS = {"csv": "csv", "tsv": "tsv", "json": "json", "jsonl": "jsonl.gz", "apkg": "apkg"}
+
+
+def build_cards(n: int) -> list[AnkiCard]:
+    cards = []
+    for i in range(n):
+        if i % 3 == 1:
+            card = AnkiCard(
+                front=f"A emenda {i} exige {{{{c1::três quintos}}}} em {{{{c2::dois turnos}}}}.",
+                back="Art. 60, § 2º, CF/88",
+                card_type="cloze",
+                tags=["processo_legislativo"],
+                extra={"fundamento": "Art. 60, § 2º, CF/88"},
+            )
+        else:
+            card = AnkiCard(
+                front=f"Qual o prazo do mandado de segurança no caso {i}?",
+                back=(
+                    "O prazo decadencial é de 120 dias, contados da ciência do ato "
+                    "impugnado (art. 23 da Lei 12.016/2009)."
+                ),
+                card_type="basic",
+                tags=["remedios_constitucionais", "mandado_seguranca"],
+                extra={"fundamento": "Lei 12.016/2009, art. 23"},
+            )
+        cards.append(card)
+    return cards
+
+
+def sequential(cards: list[AnkiCard], outputs: dict[str, Path]) -> None:
+    """Caminho anterior: um exportador (e uma passada) por formato."""
+    export_to_csv(cards, outputs["csv"])
+    export_to_tsv(cards, outputs["tsv"])
+    export_to_json(cards, outputs["json"])
+    export_to_jsonl(cards, outputs["jsonl"])
+    export_to_apkg(cards, "Bench", outputs["apkg"])
+
+
+def single_pass(cards: list[AnkiCard], outputs: dict[str, Path]) -> None:
+    export_multi(cards, outputs, deck_name="Bench")
+
+
+def threaded(cards: list[AnkiCard], outputs: dict[str, Path]) -> None:
+    export_multi(cards, outputs, deck_name="Bench", threads=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3, help="Melhor de N execuções")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = {fmt: Path(tmp) / f"cards.{suffix}" for fmt, suffix in FORMATS.items()}
+        for n in args.sizes:
+            cards = build_cards(n)
+            base = None
+            for name, fn in (
+                ("em série", sequential),
+                ("uma passada", single_pass),
+                ("com threads", threaded),
+            ):
+                best = float("inf")
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    fn(cards, outputs)
+                    best = min(best, time.perf_counter() - t0)
+                base = base or best
+                print(
+                    f"{n:>7} cards, {name:>11}: {best:6.2f}s "
+                    f"({n / best:,.0f} cards/s, {base / best:.2f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark da detecção de cards quase duplicados (MinHash/LSH).
+
+Gera cards sintéticos em que ~10% são reformulações de um card anterior
+(uma palavra inserida ou trocada no front e no verso) e mede
+``deduplicate_near`` em 1 mil, 10 mil e 100 mil cards. Para 1 mil cards,
+compara também com a comparação ingênua de todos os pares (Jaccard exato),
+que é O(n²).
+
+Uso:
+    uv run python benchmarks/bench_near_duplicates.py [--sizes 1000 10000 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from legal_anki.minhash import normalize_text  # noqa: E402
+from legal_anki.models import AnkiCard  # noqa: E402
+from legal_anki.near_duplicates import deduplicate_near  # noqa: E402
+
+_VOCAB = (
+    "competência união estados municípios lei complementar ordinária prazo dias "
+    "quórum maioria absoluta emenda constitucional mandado segurança habeas corpus "
+    "data injunção ação direta inconstitucionalidade tribunal supremo federal "
+    "controle concentrado difuso legitimidade ativa pertinência temática súmula "
+    "vinculante direito fundamental preso silêncio liberdade propriedade função "
+    "social tributo imunidade recíproca princípio legalidade anterioridade"
+).split()
+
+
+def build_cards(n: int, dup_rate: float = 0.1, seed: int = 7) -> list[AnkiCard]:
+    """Gera ``n`` cards, uma fração ``dup_rate`` deles reformulações de anteriores."""
+    rng = random.Random(seed)
+    # Vocabulário jurídico + termos sintéticos: fronts aleatórios de um
+    # vocabulário minúsculo seriam todos parecidos entre si.
+    vocab = list(_VOCAB) + [f"termo{i}" for i in range(5_000)]
+    cards: list[AnkiCard] = []
+    for i in range(n):
+        if cards and rng.random() < dup_rate:
+            base = rng.choice(cards)
+            front = base.front.replace("?", f" {rng.choice(vocab)}?")
+            back = base.back + " Conforme jurisprudência."
+        else:
+            front = " ".join(rng.choices(vocab, k=10)).capitalize() + "?"
+            back = "Art. 5º da CF/88: " + " ".join(rng.choices(vocab, k=18)) + "."
+        cards.append(AnkiCard(front=front, back=back, card_type="basic", tags=["bench"]))
+    return cards
+
+
+def pairwise(cards: list[AnkiCard], threshold: float = 0.7) -> int:
+    """Deduplicação ingênua: Jaccard exato do front contra todos os mantidos."""
+    kept: list[set[str]] = []
+    for card in cards:
+        words = set(normalize_text(card.front).split())
+        if not any(len(words & k) / len(words | k) >= threshold for k in kept):
+            kept.append(words)
+    return len(kept)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        cards = build_cards(n)
+        t0 = time.perf_counter()
+        unique = deduplicate_near(cards)
+        elapsed = time.perf_counter() - t0
+        print(
+            f"{n:>7} cards: {len(unique)} únicos em {elapsed:.2f}s "
+            f"({n / elapsed:,.0f} cards/s)"
+        )
+        if n <= 1_000:
+            t0 = time.perf_counter()
+            kept = pairwise(cards)
+            naive = time.perf_counter() - t0
+            print(f"{'':>7}   todos os pares: {kept} únicos em {naive:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark do índice estrutural e dos clozes offline em texto do porte da CF/88.
+
+Gera um texto sintético com 250 artigos no corpo permanente e 114 no ADCT,
+com incisos, parágrafos e alíneas (~0,5 MB, próximo do texto integral da
+Constituição) e mede ``build_index``, algumas consultas e ``generate_clozes``.
+
+Uso:
+    uv run python benchmarks/bench_structure.py [--articles 250] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from legal_anki.cloze import generate_clozes  # noqa: E402
+from legal_anki.structure import build_index  # noqa: E402
+
+_ROMAN = [
+    "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X",
+    "XI", "XII", "XIII", "XIV", "XV", "XVI", "XVII", "XVIII", "XIX", "XX",
+]  # fmt: skip
+
+
+def build_text(articles: int, adct_articles: int = 114) -> str:
+    """Gera um texto normativo sintético no formato da CF/88."""
+    lines = ["CONSTITUIÇÃO DA REPÚBLICA FEDERATIVA DO BRASIL", "TÍTULO I"]
+
+    def article(n: int) -> None:
+        lines.append(f"Art. {n}{'º' if n < 10 else '.'} Disposição normativa do artigo {n}:")
+        for i, roman in enumerate(_ROMAN[: 5 + n % 15]):
+            lines.append(f"{roman} - inciso com prazo de {i + 5} dias e quórum de dois terços;")
+            if i % 7 == 0:
+                lines.extend(["a) primeira alínea;", "b) segunda alínea;"])
+        for p in range(1, 1 + n % 4):
+            lines.append(f"§ {p}º Parágrafo do artigo {n}, aprovado por maioria absoluta.")
+
+    for n in range(1, articles + 1):
+        if n % 20 == 0:
+            lines.append(f"CAPÍTULO {_ROMAN[n // 20 % 20]}")
+        article(n)
+
+    lines.append("ATO DAS DISPOSIÇÕES CONSTITUCIONAIS TRANSITÓRIAS")
+    for n in range(1, adct_articles + 1):
+        article(n)
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = build_text(args.articles)
+    best = float("inf")
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        index = build_index(text)
+        best = min(best, time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    for n in range(1, args.articles + 1):
+        index.resolve(f"art. {n}, I")
+        index.locate(len(text) * n // (args.articles + 1))
+    lookups = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cards = generate_clozes(text, topic="benchmark")
+    clozes = time.perf_counter() - t0
+
+    print(f"Texto: {len(text) / 1e6:.2f} MB, {len(index)} artigos")
+    print(f"build_index: {best * 1000:.1f} ms (melhor de {args.repeat})")
+    print(f"{2 * args.articles} consultas (resolve + locate): {lookups * 1000:.1f} ms")
+    print(f"generate_clozes: {len(cards)} cards em {clozes * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,25 @@ import logging
 import sys
 from pathlib import Path
 
-from legal_anki.exporters import export_to_csv
-from legal_anki.generator import generate_cards
-from legal_anki.parsers import SUPPORTED_EXTENSIONS, ParseError, parse_file
+from legal_anki.anki_connect import AnkiConnectClient, AnkiConnectError
+from legal_anki.anki_import import ApkgImportError, iter_anki_connect_notes, iter_apkg_notes
+from legal_anki.batching import generate_cards_batched_iter, iter_csv_items
+from legal_anki.cache import TextCache
+from legal_anki.card_index import CardIndex
+from legal_anki.cloze import generate_clozes
+from legal_anki.exporters import export_cards
+from legal_anki.generator import generate_cards, generate_cards_iter
+from legal_anki.identity import with_source
+from legal_anki.near_duplicates import deduplicate_near
+from legal_anki.parsers import (
+    SUPPORTED_EXTENSIONS,
+    ParseError,
+    iter_file,
+    parse_bytes,
+    parse_file,
+)
+from legal_anki.pipeline import batch_root, collect_inputs, is_batch_target, run_batch
+from legal_anki.question_bank import iter_question_bank
 
 # Configuração de logging básico para console
 logging.basicConfig(
@@ -24,7 +40,16 @@ def main():
     supported = ", ".join(f".{e}" for e in sorted(SUPPORTED_EXTENSIONS))
     parser.add_argument(
         "input",
-        help=f"Texto de origem ou caminho para arquivo ({supported})",
+        help=(
+            f"Texto de origem, caminho para arquivo ({supported}), '-' para stdin, "
+            "ou diretório/glob para processamento em lote"
+        ),
+    )
+    parser.add_argument(
+        "--stdin-format",
+        choices=sorted(SUPPORTED_EXTENSIONS),
+        default="txt",
+        help="Formato do conteúdo lido de stdin (input '-')",
     )
     parser.add_argument(
         "--topic",
@@ -33,8 +58,42 @@ def main():
     )
     parser.add_argument(
         "--output",
-        default="legal_anki_cards.csv",
-        help="Caminho do arquivo CSV de saída",
+        default=None,
+        help=(
+            "Caminho do arquivo de saída (em lote: arquivo único com todos os cards); "
+            "default: legal_anki_cards.<formato>"
+        ),
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "tsv", "json", "jsonl", "apkg"],
+        default="csv",
+        help="Formato de exportação",
+    )
+    parser.add_argument(
+        "--zip-level",
+        type=int,
+        choices=range(10),
+        default=None,
+        metavar="0-9",
+        help=(
+            "Com --format apkg, comprime o pacote (deflate) neste nível; sem a "
+            "opção, o zip é gravado sem compressão (mais rápido, arquivo maior)"
+        ),
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        metavar="ARQUIVO",
+        help=(
+            "Exportação incremental: grava só os cards novos ou alterados desde o "
+            "manifesto (JSON) e o atualiza; sem o arquivo, exporta tudo e o cria"
+        ),
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Em lote: grava um arquivo de saída por arquivo de entrada neste diretório",
     )
     parser.add_argument(
         "--difficulty",
@@ -54,19 +113,223 @@ def main():
         dest="include_legal_basis",
         help="Não obriga a inclusão de fundamento legal nos cards",
     )
+    parser.add_argument(
+        "--max-cards-per-call",
+        type=int,
+        default=None,
+        help="Divide pedidos maiores que este limite em sub-requisições paralelas",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Número máximo de chamadas simultâneas ao LLM",
+    )
+    parser.add_argument(
+        "--pdf-workers",
+        type=int,
+        default=None,
+        help="Processos para extração de PDFs grandes (padrão: todos os núcleos)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="use_cache",
+        help="Não usa o cache local de texto extraído de arquivos",
+    )
+    parser.add_argument(
+        "--no-clean",
+        action="store_false",
+        dest="clean",
+        help="Não remove cabeçalhos, rodapés e numeração de página de PDFs",
+    )
+    parser.add_argument(
+        "--cards-per-chunk",
+        type=int,
+        default=None,
+        help=(
+            "Modo streaming para arquivos grandes: lê o arquivo página a página "
+            "e gera até N cards por chunk (limitado a --max-cards no total)"
+        ),
+    )
+    parser.add_argument(
+        "--cards-per-row",
+        type=int,
+        default=None,
+        help=(
+            "Modo linha a linha para CSVs grandes (bancos de questões): lê o "
+            "arquivo em streaming e gera até N cards por linha, em lotes"
+        ),
+    )
+    parser.add_argument(
+        "--question-bank",
+        action="store_true",
+        help=(
+            "Converte um CSV de banco de questões (enunciado, gabarito, banca, "
+            "ano, cargo, fundamento) diretamente em cards, sem LLM; "
+            "--max-cards não se aplica"
+        ),
+    )
+    parser.add_argument(
+        "--enrich-missing",
+        action="store_true",
+        help="Com --question-bank, envia ao LLM apenas as linhas sem fundamento",
+    )
+    parser.add_argument(
+        "--offline-cloze",
+        action="store_true",
+        help="Gera cards cloze de lei seca localmente, por regras, sem LLM",
+    )
+    parser.add_argument(
+        "--law",
+        default="CF/88",
+        help="Nome da norma usado no fundamento dos clozes offline",
+    )
+    parser.add_argument(
+        "--dedupe-passages",
+        action="store_true",
+        help=(
+            "Em lote: envia ao LLM uma única vez passagens repetidas entre os "
+            "arquivos (mesmo artigo na lei e nos PDFs de aula)"
+        ),
+    )
+    parser.add_argument(
+        "--near-dup-threshold",
+        type=float,
+        default=None,
+        help=(
+            "Remove também cards quase duplicados (similaridade dos fronts a "
+            "partir deste valor, entre 0 e 1; ex.: 0.7)"
+        ),
+    )
+    parser.add_argument(
+        "--near-dup-policy",
+        choices=["keep_first", "keep_best"],
+        default="keep_first",
+        help="Card mantido de cada grupo de quase duplicatas",
+    )
+    parser.add_argument(
+        "--card-index",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="ARQUIVO",
+        help=(
+            "Usa o índice persistente de cards já exportados (SQLite): descarta "
+            "cards que já existem e registra os novos. Sem ARQUIVO, usa "
+            "LEGAL_ANKI_CARD_INDEX"
+        ),
+    )
+    parser.add_argument(
+        "--covered-hints",
+        action="store_true",
+        help="Com --card-index, informa ao LLM os cards do tópico que já existem",
+    )
+    parser.add_argument(
+        "--seed-apkg",
+        action="append",
+        default=[],
+        metavar="APKG",
+        help="Com --card-index, importa antes as notas de um .apkg (pode repetir)",
+    )
+    parser.add_argument(
+        "--seed-anki-connect",
+        nargs="?",
+        const="deck:*",
+        default=None,
+        metavar="BUSCA",
+        help="Com --card-index, importa antes as notas do Anki via AnkiConnect",
+    )
     # include_legal_basis já tem default True via action="store_false" + dest.
     # Removendo set_defaults redundante.
 
     args = parser.parse_args()
+    if args.output is None:
+        args.output = f"legal_anki_cards.{args.format}"
 
     if args.max_cards < 1 or args.max_cards > 1000:
         parser.error("--max-cards deve estar entre 1 e 1000")
+    if args.max_cards_per_call is not None and args.max_cards_per_call < 1:
+        parser.error("--max-cards-per-call deve ser maior que zero")
+    if args.workers < 1:
+        parser.error("--workers deve ser maior que zero")
+    if args.pdf_workers is not None and args.pdf_workers < 1:
+        parser.error("--pdf-workers deve ser maior que zero")
+    if args.cards_per_chunk is not None and not 1 <= args.cards_per_chunk <= 100:
+        parser.error("--cards-per-chunk deve estar entre 1 e 100")
+    if args.cards_per_row is not None and not 1 <= args.cards_per_row <= 10:
+        parser.error("--cards-per-row deve estar entre 1 e 10")
+    if args.near_dup_threshold is not None and not 0 < args.near_dup_threshold <= 1:
+        parser.error("--near-dup-threshold deve estar entre 0 e 1")
 
-    # 1. Determina o conteúdo de entrada
     input_path = Path(args.input)
-    if input_path.is_file():
+    is_csv = input_path.is_file() and input_path.suffix.lower() == ".csv"
+    if args.cards_per_row is not None and not is_csv:
+        parser.error("--cards-per-row requer um arquivo .csv como entrada")
+    if args.question_bank and not is_csv:
+        parser.error("--question-bank requer um arquivo .csv como entrada")
+    if args.enrich_missing and not args.question_bank:
+        parser.error("--enrich-missing requer --question-bank")
+    if args.zip_level is not None and args.format != "apkg":
+        parser.error("--zip-level requer --format apkg")
+    if args.covered_hints and args.card_index is None:
+        parser.error("--covered-hints requer --card-index")
+    if (args.seed_apkg or args.seed_anki_connect) and args.card_index is None:
+        parser.error("--seed-apkg e --seed-anki-connect requerem --card-index")
+    if args.offline_cloze and (
+        args.question_bank or args.cards_per_row is not None or args.cards_per_chunk is not None
+    ):
+        parser.error(
+            "--offline-cloze não combina com --question-bank, --cards-per-row "
+            "ou --cards-per-chunk"
+        )
+
+    if is_batch_target(args.input):
+        if (
+            args.question_bank
+            or args.offline_cloze
+            or args.cards_per_row is not None
+            or args.covered_hints
+            or args.manifest
+            or args.zip_level is not None
+        ):
+            parser.error(
+                "--question-bank, --offline-cloze, --cards-per-row, --covered-hints, "
+                "--manifest e --zip-level não são suportados em lote"
+            )
+        _run_batch(args)
+        return
+    if args.output_dir or args.dedupe_passages:
+        parser.error(
+            "--output-dir e --dedupe-passages requerem um diretório ou glob como entrada"
+        )
+
+    # 1. Determina o conteúdo de entrada
+    per_row = args.cards_per_row is not None
+    streaming = args.cards_per_chunk is not None and input_path.is_file()
+    if args.question_bank:
+        logger.info("Convertendo banco de questões: %s", args.input)
+    elif per_row:
+        logger.info("Lendo CSV linha a linha: %s", args.input)
+    elif streaming:
+        logger.info("Lendo arquivo em modo streaming: %s", args.input)
+    elif args.input == "-":
+        try:
+            content = parse_bytes(
+                sys.stdin.buffer, args.stdin_format, clean=args.clean, name="stdin"
+            )
+            logger.info("Lendo conteúdo de stdin (%s)", args.stdin_format)
+        except ParseError as e:
+            logger.error("Erro ao processar stdin: %s", e)
+            sys.exit(1)
+    elif input_path.is_file():
         try:
-            content = parse_file(input_path)
+            content = parse_file(
+                input_path,
+                workers=args.pdf_workers,
+                cache=TextCache() if args.use_cache else None,
+                clean=args.clean,
+            )
             logger.info("Lendo conteúdo do arquivo: %s", args.input)
         except ParseError as e:
             logger.error("Erro ao processar arquivo: %s", e)
@@ -84,25 +347,170 @@ def main():
         args.max_cards,
         args.topic,
     )
+    card_index = _open_card_index(args)
+    try:
+        if args.offline_cloze:
+            cards = generate_clozes(
+                content,
+                topic=args.topic,
+                law=args.law,
+                difficulty=args.difficulty,
+                max_cards=args.max_cards,
+            )
+        elif args.question_bank:
+            cards = [
+                card
+                for _, card in iter_question_bank(
+                    input_path,
+                    topic=args.topic,
+                    difficulty=args.difficulty,
+                    enrich_missing=args.enrich_missing,
+                    max_workers=args.workers,
+                )
+            ]
+        elif per_row:
+            cards = _generate_per_row(input_path, args)
+        elif streaming:
+            cards = list(
+                generate_cards_iter(
+                    iter_file(input_path),
+                    topic=args.topic,
+                    difficulty=args.difficulty,
+                    include_legal_basis=args.include_legal_basis,
+                    cards_per_chunk=args.cards_per_chunk,
+                    max_cards=args.max_cards,
+                    max_workers=args.workers,
+                )
+            )
+        else:
+            cards = generate_cards(
+                text=content,
+                topic=args.topic,
+                difficulty=args.difficulty,
+                include_legal_basis=args.include_legal_basis,
+                max_cards=args.max_cards,
+                max_cards_per_call=args.max_cards_per_call,
+                max_workers=args.workers,
+                card_index=card_index,
+                covered_hints=args.covered_hints,
+            )
+    except ParseError as e:
+        logger.error("Erro ao processar arquivo: %s", e)
+        sys.exit(1)
+    except Exception:
+        logger.exception("Falha na geração de cards")
+        sys.exit(1)
+
+    if args.near_dup_threshold is not None:
+        cards = deduplicate_near(
+            cards, threshold=args.near_dup_threshold, policy=args.near_dup_policy
+        )
+    llm_path = not (args.offline_cloze or args.question_bank or per_row or streaming)
+    if card_index is not None and not llm_path:
+        # generate_cards já filtra pelo índice (e usa as dicas de cobertura)
+        cards = card_index.filter_new(cards)
+    if input_path.is_file():
+        # A origem entra no GUID das notas: regerar o arquivo atualiza as mesmas
+        cards = [with_source(card, input_path.name) for card in cards]
+
+    # 3. Exporta no formato escolhido
     try:
-        cards = generate_cards(
-            text=content,
+        options = {} if args.zip_level is None else {"compresslevel": args.zip_level}
+        output_file = export_cards(
+            cards, args.output, format=args.format, manifest=args.manifest, **options
+        )
+        if output_file is not None:
+            logger.info("Sucesso! Cards exportados para: %s", output_file)
+    except Exception:
+        logger.exception("Erro ao exportar cards")
+        sys.exit(1)
+    if card_index is not None:
+        card_index.add(cards)
+        card_index.close()
+
+
+def _run_batch(args):
+    """Processa um diretório ou glob inteiro numa só execução."""
+    paths = collect_inputs(args.input)
+    if not paths:
+        logger.error("Nenhum arquivo suportado encontrado em: %s", args.input)
+        sys.exit(1)
+
+    logger.info("Processando %d arquivos em lote", len(paths))
+    card_index = _open_card_index(args)
+    try:
+        summary = run_batch(
+            paths,
             topic=args.topic,
+            output_format=args.format,
+            output_dir=args.output_dir,
+            merged_output=None if args.output_dir else args.output,
             difficulty=args.difficulty,
             include_legal_basis=args.include_legal_basis,
-            max_cards=args.max_cards,
+            cards_per_chunk=args.cards_per_chunk or 5,
+            max_cards_per_file=args.max_cards,
+            parse_workers=args.pdf_workers,
+            max_workers=args.workers,
+            cache=TextCache() if args.use_cache else None,
+            clean=args.clean,
+            dedupe_passages=args.dedupe_passages,
+            near_duplicate_threshold=args.near_dup_threshold,
+            near_duplicate_policy=args.near_dup_policy,
+            card_index=card_index,
+            root=batch_root(args.input),
         )
     except Exception:
-        logger.exception("Falha na geração de cards")
+        logger.exception("Falha no processamento em lote")
+        sys.exit(1)
+    finally:
+        if card_index is not None:
+            card_index.close()
+
+    print(summary.format())
+    if len(summary.failed) == len(paths):
         sys.exit(1)
 
-    # 3. Exporta para CSV
+
+def _open_card_index(args):
+    """Abre o índice de cards pedido por --card-index (ou None), já semeado."""
+    if args.card_index is None:
+        return None
+    card_index = CardIndex(args.card_index or None)
     try:
-        output_file = export_to_csv(cards, output_path=args.output)
-        logger.info("Sucesso! %d cards exportados para: %s", len(cards), output_file)
-    except Exception:
-        logger.exception("Erro ao exportar cards")
+        for path in args.seed_apkg:
+            card_index.add_notes(iter_apkg_notes(path))
+        if args.seed_anki_connect:
+            card_index.add_notes(
+                iter_anki_connect_notes(AnkiConnectClient(), args.seed_anki_connect)
+            )
+    except (ApkgImportError, AnkiConnectError) as e:
+        card_index.close()
+        logger.error("Erro ao importar notas para o índice: %s", e)
         sys.exit(1)
+    return card_index
+
+
+def _generate_per_row(path, args):
+    """Gera cards por linha de um CSV, parando ao atingir --max-cards."""
+    cards = []
+    rows = generate_cards_batched_iter(
+        iter_csv_items(path),
+        topic=args.topic,
+        difficulty=args.difficulty,
+        include_legal_basis=args.include_legal_basis,
+        cards_per_item=args.cards_per_row,
+        max_workers=args.workers,
+    )
+    try:
+        for item_id, row_cards in rows:
+            if not row_cards:
+                logger.warning("Nenhum card gerado para %s", item_id)
+            cards.extend(row_cards)
+            if len(cards) >= args.max_cards:
+                break
+    finally:
+        rows.close()
+    return cards[: args.max_cards]
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator
 from typing import TYPE_CHECKING, Any
 
 import httpx
@@ -12,6 +13,7 @@ from .models import get_model_for_card_type
 from .serializers import map_card_to_fields
 
 if TYPE_CHECKING:
+    from .card_index import CardIndex
     from .models import AnkiCard
 
 logger = logging.getLogger(__name__)
@@ -146,6 +148,51 @@ class AnkiConnectClient:
         """
         return self._invoke("addNotes", notes=notes)
 
+    def find_notes(self, query: str) -> list[int]:
+        """
+        Busca notas com a sintaxe de busca do Anki.
+
+        Args:
+            query: Busca (ex.: "deck:Constitucional tag:stf")
+
+        Returns:
+            IDs das notas encontradas
+        """
+        return self._invoke("findNotes", query=query)
+
+    def notes_info(self, note_ids: list[int]) -> list[dict[str, Any]]:
+        """
+        Retorna modelo, campos e tags de cada nota.
+
+        Args:
+            note_ids: IDs das notas
+
+        Returns:
+            Lista de dicionários no formato do ``notesInfo``
+        """
+        return self._invoke("notesInfo", notes=note_ids)
+
+    def iter_notes_info(self, query: str, page_size: int = 500) -> Iterator[dict[str, Any]]:
+        """
+        Percorre as notas de uma busca, pedindo ``notesInfo`` em páginas.
+
+        Coleções grandes num único ``notesInfo`` geram respostas enormes e
+        podem estourar o timeout.
+
+        Args:
+            query: Busca do Anki
+            page_size: Notas por chamada
+
+        Yields:
+            Dicionários no formato do ``notesInfo``
+        """
+        if page_size < 1:
+            raise ValueError("Parâmetro 'page_size' deve ser maior que zero")
+        note_ids = self.find_notes(query)
+        logger.info("AnkiConnect: %d notas encontradas para %r", len(note_ids), query)
+        for start in range(0, len(note_ids), page_size):
+            yield from self.notes_info(note_ids[start : start + page_size])
+
     def sync(self) -> None:
         """Sincroniza o Anki com AnkiWeb."""
         self._invoke("sync")
@@ -188,6 +235,7 @@ class AnkiConnectClient:
         cards: list["AnkiCard"],
         deck_name: str,
         allow_duplicate: bool = False,
+        card_index: CardIndex | None = None,
     ) -> list[int | None]:
         """
         Adiciona múltiplos AnkiCards ao Anki.
@@ -196,13 +244,23 @@ class AnkiConnectClient:
             cards: Lista de cards a adicionar
             deck_name: Nome do deck
             allow_duplicate: Se True, permite duplicatas
+            card_index: Índice semeado com as notas da coleção. Cards que o
+                        Anki recusaria como duplicata (mesmo note type e
+                        primeiro campo) não são enviados; os adicionados são
+                        registrados no índice.
 
         Returns:
-            Lista de IDs das notas criadas
+            Lista de IDs das notas criadas, alinhada com ``cards`` (None para
+            falhas e duplicatas puladas)
         """
+        result: list[int | None] = [None] * len(cards)
+        positions = []
         notes = []
+        skip_known = card_index is not None and not allow_duplicate
 
-        for card in cards:
+        for i, card in enumerate(cards):
+            if skip_known and card_index.is_anki_duplicate(card):
+                continue
             model = get_model_for_card_type(card.card_type)
             field_values = map_card_to_fields(card)
             field_names = [f["name"] for f in model.fields]
@@ -217,8 +275,16 @@ class AnkiConnectClient:
                     "options": {"allowDuplicate": allow_duplicate},
                 }
             )
-
-        result = self.add_notes_batch(notes)
+            positions.append(i)
+
+        skipped = len(cards) - len(notes)
+        if skipped:
+            logger.info("Pulados %d cards já existentes na coleção", skipped)
+        if notes:
+            for i, note_id in zip(positions, self.add_notes_batch(notes)):
+                result[i] = note_id
+        if card_index is not None:
+            card_index.add(card for card, note_id in zip(cards, result) if note_id is not None)
         logger.info(
             f"Adicionados {sum(1 for r in result if r is not None)} cards via AnkiConnect"
         )
@@ -0,0 +1,205 @@
+"""Leitura de notas de coleções Anki existentes (.apkg e AnkiConnect).
+
+Para não gerar de novo o que o usuário já estuda, o índice de cards pode ser
+semeado com as notas de decks antigos. Um ``.apkg`` é um zip com a coleção
+SQLite do Anki; ela é copiada em blocos para um arquivo temporário (o
+SQLite não lê de dentro do zip) e as notas são lidas por cursor, sem
+carregar a tabela inteira. Notas da coleção aberta no Anki Desktop vêm do
+AnkiConnect, em páginas de ``notesInfo``.
+
+Cada nota leva o checksum do primeiro campo calculado como o Anki faz na
+detecção de duplicatas (SHA-1 do campo sem HTML, primeiros 8 dígitos
+hexadecimais), de modo que a checagem pode ser feita offline.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+import logging
+import re
+import shutil
+import sqlite3
+import tempfile
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from .anki_connect import AnkiConnectClient
+
+logger = logging.getLogger(__name__)
+
+# Coleções legíveis pelo sqlite3, da mais nova para a mais antiga. A
+# "collection.anki21b" (Anki 2.1.50+) é comprimida com zstd.
+_COLLECTIONS = ("collection.anki21", "collection.anki2")
+_COMPRESSED_COLLECTION = "collection.anki21b"
+_COPY_CHUNK = 1 << 20
+_FIELD_SEPARATOR = "\x1f"
+
+# Mesmas expressões do stripHTMLMedia do Anki
+_MEDIA_RE = re.compile(r"(?i)<img[^>]+src=[\"']?([^\"'>]+)[\"']?[^>]*>")
+_COMMENT_RE = re.compile(r"(?s)<!--.*?-->")
+_STYLE_RE = re.compile(r"(?si)<style.*?>.*?</style>")
+_SCRIPT_RE = re.compile(r"(?si)<script.*?>.*?</script>")
+_TAG_RE = re.compile(r"(?s)<.*?>")
+
+
+class ApkgImportError(Exception):
+    """Erro ao ler um pacote .apkg."""
+
+    pass
+
+
+class AnkiNote(BaseModel):
+    """Nota de uma coleção Anki existente."""
+
+    note_id: int = Field(..., description="ID da nota na coleção de origem")
+    model: str = Field(..., description="Nome do note type")
+    fields: list[str] = Field(..., description="Valores dos campos, na ordem do note type")
+    tags: list[str] = Field(default_factory=list)
+
+    @property
+    def first_field(self) -> str:
+        """Primeiro campo, usado pelo Anki na detecção de duplicatas."""
+        return self.fields[0] if self.fields else ""
+
+    @property
+    def checksum(self) -> int:
+        """Checksum do primeiro campo, como o Anki calcula."""
+        return anki_checksum(self.first_field)
+
+
+def strip_html_media(text: str) -> str:
+    """
+    Remove HTML mantendo o nome dos arquivos de imagem, como o Anki.
+
+    Args:
+        text: Valor de um campo
+
+    Returns:
+        Texto sem tags, comentários, estilos e scripts, com entidades decodificadas
+    """
+    if "<" not in text and "&" not in text:
+        return text
+    text = _MEDIA_RE.sub(r" \1 ", text)
+    for pattern in (_COMMENT_RE, _STYLE_RE, _SCRIPT_RE, _TAG_RE):
+        text = pattern.sub("", text)
+    return html.unescape(text.replace("&nbsp;", " "))
+
+
+def anki_checksum(first_field: str) -> int:
+    """
+    Checksum do primeiro campo usado pelo Anki para detectar duplicatas.
+
+    Args:
+        first_field: Valor do primeiro campo da nota (com HTML)
+
+    Returns:
+        Inteiro de 32 bits (primeiros 8 dígitos hexadecimais do SHA-1)
+    """
+    return stripped_checksum(strip_html_media(first_field))
+
+
+def stripped_checksum(text: str) -> int:
+    """``anki_checksum`` de um campo já passado por ``strip_html_media``."""
+    return int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:4], "big")
+
+
+def iter_apkg_notes(path: Path | str) -> Iterator[AnkiNote]:
+    """
+    Lê as notas de um pacote .apkg.
+
+    Args:
+        path: Caminho do .apkg (ou .colpkg)
+
+    Yields:
+        Notas na ordem da coleção
+
+    Raises:
+        ApkgImportError: Se o arquivo não for um pacote legível
+    """
+    path = Path(path)
+    try:
+        archive = zipfile.ZipFile(path)
+    except (OSError, zipfile.BadZipFile) as e:
+        raise ApkgImportError(f"Pacote inválido {path}: {e}") from e
+
+    with archive, tempfile.TemporaryDirectory(prefix="legal_anki_apkg_") as tmp:
+        member = _collection_member(archive, path)
+        db_path = Path(tmp) / member
+        with archive.open(member) as src, open(db_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, _COPY_CHUNK)
+
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            models = _model_names(conn)
+            rows = conn.execute("SELECT id, mid, flds, tags FROM notes ORDER BY id")
+            count = 0
+            for note_id, mid, flds, tags in rows:
+                count += 1
+                yield AnkiNote(
+                    note_id=note_id,
+                    model=models.get(mid, str(mid)),
+                    fields=flds.split(_FIELD_SEPARATOR),
+                    tags=tags.split(),
+                )
+            logger.info("Lidas %d notas de %s", count, path)
+        except sqlite3.DatabaseError as e:
+            raise ApkgImportError(f"Coleção ilegível em {path}: {e}") from e
+        finally:
+            conn.close()
+
+
+def iter_anki_connect_notes(
+    client: AnkiConnectClient, query: str = "deck:*", page_size: int = 500
+) -> Iterator[AnkiNote]:
+    """
+    Lê notas da coleção aberta no Anki Desktop, em páginas.
+
+    Args:
+        client: Cliente AnkiConnect
+        query: Busca do Anki (ex.: "deck:Constitucional")
+        page_size: Notas por chamada a ``notesInfo``
+
+    Yields:
+        Notas encontradas pela busca
+    """
+    for info in client.iter_notes_info(query, page_size=page_size):
+        fields = sorted(info["fields"].values(), key=lambda f: f["order"])
+        yield AnkiNote(
+            note_id=info["noteId"],
+            model=info["modelName"],
+            fields=[f["value"] for f in fields],
+            tags=info.get("tags", []),
+        )
+
+
+def _collection_member(archive: zipfile.ZipFile, path: Path) -> str:
+    """Nome da coleção SQLite dentro do pacote."""
+    names = set(archive.namelist())
+    if _COLLECTIONS[0] in names:
+        return _COLLECTIONS[0]
+    if _COMPRESSED_COLLECTION in names:
+        # A "collection.anki2" que acompanha a anki21b só contém um aviso
+        raise ApkgImportError(
+            f"{path} usa o formato comprimido do Anki 2.1.50+; exporte de novo "
+            "marcando 'Suporte a versões antigas do Anki'"
+        )
+    if _COLLECTIONS[1] in names:
+        return _COLLECTIONS[1]
+    raise ApkgImportError(f"{path} não contém uma coleção Anki")
+
+
+def _model_names(conn: sqlite3.Connection) -> dict[int, str]:
+    """Nomes dos note types por ID (esquema antigo: JSON em col.models)."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    if "notetypes" in tables:
+        return dict(conn.execute("SELECT id, name FROM notetypes"))
+    row = conn.execute("SELECT models FROM col").fetchone()
+    models = json.loads(row[0]) if row and row[0] else {}
+    return {int(mid): model["name"] for mid, model in models.items()}
@@ -0,0 +1,411 @@
+"""Micro-batching de itens curtos e independentes em uma única chamada ao LLM.
+
+Entradas no estilo banco de questões (milhares de súmulas ou enunciados curtos)
+pagariam o system prompt inteiro em cada chamada se enviadas uma a uma. Este
+módulo empacota vários itens por requisição, identifica cada um por um ID local
+e mapeia os cards devolvidos de volta ao item de origem.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from .citations import extract_citations, fill_extra, format_citation_hints
+from .classifier import classify_chunk
+from .generator import (
+    MAX_CHUNK_CHARS,
+    deduplicate_cards,
+    ordered_results,
+    postprocess_cards,
+    resolve_llm_client,
+)
+from .models import BatchCardResponse
+from .parsers import iter_csv_rows
+from .prompts.system import build_system_prompt
+
+if TYPE_CHECKING:
+    from .citations import Citations
+    from .llm.protocol import LLMClient
+    from .models import AnkiCard
+
+logger = logging.getLogger(__name__)
+
+# Itens por requisição: amortiza o system prompt sem tornar a resposta
+# longa demais (latência de saída cresce com o número de tokens).
+_MAX_ITEMS_PER_BATCH = 25
+
+
+class SourceItem(BaseModel):
+    """Item de origem independente (súmula, questão, linha de CSV...)."""
+
+    item_id: str = Field(min_length=1, description="Identificador estável do item")
+    text: str = Field(min_length=1, description="Conteúdo do item")
+
+
+def pack_items(
+    items: Iterable[SourceItem],
+    max_items: int = _MAX_ITEMS_PER_BATCH,
+    max_chars: int = MAX_CHUNK_CHARS,
+) -> list[list[SourceItem]]:
+    """
+    Agrupa itens em lotes respeitando limites de quantidade e tamanho.
+
+    Um item maior que ``max_chars`` ocupa um lote sozinho.
+
+    Args:
+        items: Itens a agrupar, na ordem original
+        max_items: Número máximo de itens por lote
+        max_chars: Soma máxima de caracteres dos textos de um lote
+
+    Returns:
+        Lista de lotes (cada lote é uma lista não-vazia de itens)
+    """
+    return list(iter_batches(items, max_items=max_items, max_chars=max_chars))
+
+
+def iter_batches(
+    items: Iterable[SourceItem],
+    max_items: int = _MAX_ITEMS_PER_BATCH,
+    max_chars: int = MAX_CHUNK_CHARS,
+) -> Iterator[list[SourceItem]]:
+    """
+    Versão incremental de ``pack_items``: consome os itens sob demanda.
+
+    Apenas o lote em construção é mantido em memória.
+    """
+    if max_items < 1:
+        raise ValueError("Parâmetro 'max_items' deve ser maior que zero")
+
+    current: list[SourceItem] = []
+    current_len = 0
+
+    for item in items:
+        item_len = len(item.text)
+        if current and (
+            len(current) >= max_items or current_len + item_len > max_chars
+        ):
+            yield current
+            current = []
+            current_len = 0
+
+        current.append(item)
+        current_len += item_len
+
+    if current:
+        yield current
+
+
+def iter_csv_items(path: Path) -> Iterator[SourceItem]:
+    """
+    Lê um CSV linha a linha como itens independentes.
+
+    O ID de cada item é ``"<arquivo>:<linha>"``, permitindo rastrear cada
+    card até a linha de origem.
+
+    Args:
+        path: Caminho do arquivo CSV
+
+    Yields:
+        SourceItem por linha não vazia
+    """
+    for row in iter_csv_rows(path):
+        text = row.text
+        if text:
+            yield SourceItem(item_id=f"{path.name}:{row.number}", text=text)
+
+
+def generate_cards_batched(
+    items: Iterable[SourceItem],
+    topic: str,
+    difficulty: str = "medio",
+    include_legal_basis: bool = True,
+    card_type: str = "auto",
+    cards_per_item: int = 2,
+    max_items_per_batch: int = _MAX_ITEMS_PER_BATCH,
+    llm_client: "LLMClient | None" = None,
+    route_by_type: bool = True,
+    use_citations: bool = True,
+) -> dict[str, list["AnkiCard"]]:
+    """
+    Gera cards para muitos itens curtos, vários itens por chamada ao LLM.
+
+    Args:
+        items: Itens de origem com IDs únicos
+        topic: Tópico principal dos cards
+        difficulty: Nível de dificuldade ("facil", "medio", "dificil")
+        include_legal_basis: Se True, instrui o LLM a sempre incluir fundamento legal
+        card_type: Tipo de card a gerar ("auto" para deixar o LLM decidir)
+        cards_per_item: Número máximo de cards por item (1-10)
+        max_items_per_batch: Número máximo de itens por chamada ao LLM
+        llm_client: Cliente LLM opcional. Se None, usa OpenAI padrão com retry.
+        route_by_type: Se True e card_type for "auto", cada item é
+                       pré-classificado localmente e o tipo detectado é
+                       pedido para ele na mensagem (ver ``classify_chunk``)
+        use_citations: Se True, citações extraídas de cada item são enviadas
+                       como dicas junto ao item e usadas para completar ``extra``
+
+    Returns:
+        Dicionário item_id -> cards gerados, na ordem dos itens de entrada.
+        Itens sem cards (falha do lote ou omitidos pelo LLM) mapeiam para [].
+
+    Raises:
+        ValueError: Se os parâmetros de entrada forem inválidos
+        CardGenerationError: Se não houver cliente LLM configurado
+    """
+    if not topic or not topic.strip():
+        raise ValueError("Parâmetro 'topic' não pode ser vazio")
+    if cards_per_item < 1 or cards_per_item > 10:
+        raise ValueError("Parâmetro 'cards_per_item' deve estar entre 1 e 10")
+
+    items = list(items)
+    ids = [item.item_id for item in items]
+    if len(set(ids)) != len(ids):
+        raise ValueError("IDs de itens devem ser únicos")
+
+    topic = topic.strip()
+    llm_client = resolve_llm_client(llm_client)
+    system_prompt = build_system_prompt(
+        include_legal_basis=include_legal_basis,
+        difficulty=difficulty,
+    )
+
+    results: dict[str, list[AnkiCard]] = {item_id: [] for item_id in ids}
+    batches = pack_items(items, max_items=max_items_per_batch)
+    logger.info(
+        "Processando %d itens em %d lotes para tópico '%s'",
+        len(items),
+        len(batches),
+        topic,
+    )
+
+    for batch in batches:
+        results.update(
+            _process_batch(
+                llm_client,
+                system_prompt,
+                batch,
+                topic,
+                difficulty,
+                card_type,
+                cards_per_item,
+                route_by_type,
+                use_citations,
+            )
+        )
+
+    return results
+
+
+def generate_cards_batched_iter(
+    items: Iterable[SourceItem],
+    topic: str,
+    difficulty: str = "medio",
+    include_legal_basis: bool = True,
+    card_type: str = "auto",
+    cards_per_item: int = 2,
+    max_items_per_batch: int = _MAX_ITEMS_PER_BATCH,
+    llm_client: "LLMClient | None" = None,
+    max_workers: int = 4,
+    route_by_type: bool = True,
+    use_citations: bool = True,
+) -> Iterator[tuple[str, list["AnkiCard"]]]:
+    """
+    Versão em streaming de ``generate_cards_batched`` para entradas grandes.
+
+    Os itens são consumidos sob demanda e agrupados em lotes; até
+    ``max_workers`` lotes ficam em voo simultaneamente. A memória usada não
+    depende do tamanho da entrada (ex.: CSV de 100 mil linhas lido com
+    ``iter_csv_items``). Como os itens não são materializados, a unicidade
+    dos IDs é verificada apenas dentro de cada lote.
+
+    Args:
+        items: Itens de origem (iterável, possivelmente lazy)
+        topic: Tópico principal dos cards
+        difficulty: Nível de dificuldade ("facil", "medio", "dificil")
+        include_legal_basis: Se True, instrui o LLM a sempre incluir fundamento legal
+        card_type: Tipo de card a gerar ("auto" para deixar o LLM decidir)
+        cards_per_item: Número máximo de cards por item (1-10)
+        max_items_per_batch: Número máximo de itens por chamada ao LLM
+        llm_client: Cliente LLM opcional. Se None, usa OpenAI padrão com retry.
+        max_workers: Número máximo de lotes processados em paralelo
+        route_by_type: Se True, pré-classifica cada item (ver ``generate_cards_batched``)
+        use_citations: Se True, envia citações extraídas como dicas (idem)
+
+    Yields:
+        Tuplas (item_id, cards) na ordem dos itens de entrada. Itens sem
+        cards produzem lista vazia.
+
+    Raises:
+        ValueError: Se os parâmetros de entrada forem inválidos
+        CardGenerationError: Se não houver cliente LLM configurado
+    """
+    if not topic or not topic.strip():
+        raise ValueError("Parâmetro 'topic' não pode ser vazio")
+    if cards_per_item < 1 or cards_per_item > 10:
+        raise ValueError("Parâmetro 'cards_per_item' deve estar entre 1 e 10")
+    if max_workers < 1:
+        raise ValueError("Parâmetro 'max_workers' deve ser maior que zero")
+
+    topic = topic.strip()
+    llm_client = resolve_llm_client(llm_client)
+    system_prompt = build_system_prompt(
+        include_legal_basis=include_legal_basis,
+        difficulty=difficulty,
+    )
+
+    def run(batch: list[SourceItem]) -> list[tuple[str, list[AnkiCard]]]:
+        if len({item.item_id for item in batch}) != len(batch):
+            raise ValueError("IDs de itens devem ser únicos")
+        results = _process_batch(
+            llm_client,
+            system_prompt,
+            batch,
+            topic,
+            difficulty,
+            card_type,
+            cards_per_item,
+            route_by_type,
+            use_citations,
+        )
+        return [(item.item_id, results[item.item_id]) for item in batch]
+
+    items_done = 0
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for batch_results in ordered_results(
+            pool, run, iter_batches(items, max_items=max_items_per_batch), window=max_workers
+        ):
+            yield from batch_results
+            items_done += len(batch_results)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    logger.info("Processados %d itens em modo streaming", items_done)
+
+
+def _process_batch(
+    llm_client: "LLMClient",
+    system_prompt: str,
+    batch: list[SourceItem],
+    topic: str,
+    difficulty: str,
+    card_type: str,
+    cards_per_item: int,
+    route_by_type: bool = True,
+    use_citations: bool = True,
+) -> dict[str, list["AnkiCard"]]:
+    """Gera e pós-processa os cards de um lote; todo item do lote tem entrada."""
+    results: dict[str, list[AnkiCard]] = {item.item_id: [] for item in batch}
+    citations = (
+        {item.item_id: extract_citations(item.text) for item in batch} if use_citations else {}
+    )
+    notes = [
+        _item_notes(item, card_type, route_by_type, citations.get(item.item_id))
+        for item in batch
+    ]
+
+    for item_id, cards in _call_llm_batch(
+        llm_client, system_prompt, batch, topic, card_type, cards_per_item, notes
+    ).items():
+        if item_id in citations:
+            cards = [fill_extra(card, citations[item_id]) for card in cards]
+        cards = postprocess_cards(cards, topic, difficulty)
+        results[item_id] = deduplicate_cards(cards)[:cards_per_item]
+
+    return results
+
+
+def _call_llm_batch(
+    llm_client: "LLMClient",
+    system_prompt: str,
+    batch: list[SourceItem],
+    topic: str,
+    card_type: str,
+    cards_per_item: int,
+    notes: list[str] | None = None,
+) -> dict[str, list["AnkiCard"]]:
+    """Chama o LLM para um lote e remapeia os IDs locais para os de origem."""
+    # IDs locais curtos ("1", "2", ...) são menos propensos a serem
+    # reescritos pelo modelo do que IDs arbitrários do chamador.
+    local_ids = {str(i): item.item_id for i, item in enumerate(batch, start=1)}
+    user_message = _build_batch_message(batch, topic, card_type, cards_per_item, notes)
+
+    try:
+        result = llm_client.generate_structured(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            response_model=BatchCardResponse,
+        )
+    except Exception as e:
+        logger.warning("Erro ao processar lote de %d itens: %s", len(batch), e)
+        return {}
+
+    mapped: dict[str, list[AnkiCard]] = {}
+    for entry in result.items if result else []:
+        source_id = local_ids.get(entry.item_id.strip())
+        if source_id is None:
+            logger.warning("LLM retornou item_id desconhecido: %r", entry.item_id)
+            continue
+        mapped.setdefault(source_id, []).extend(entry.cards)
+
+    missing = len(batch) - len(mapped)
+    if missing:
+        logger.warning("LLM não retornou cards para %d itens do lote", missing)
+
+    return mapped
+
+
+def _item_notes(
+    item: SourceItem, card_type: str, route_by_type: bool, citations: Citations | None
+) -> str:
+    """Instruções específicas de um item: tipo pré-classificado e citações extraídas."""
+    notes = []
+    if card_type == "auto" and route_by_type:
+        detected = classify_chunk(item.text)
+        if detected is not None:
+            notes.append(f"Gere para este item apenas cards do tipo '{detected.value}'.")
+    if citations is not None:
+        hints = format_citation_hints(citations)
+        if hints:
+            notes.append(hints)
+    return "\n\n".join(notes)
+
+
+def _build_batch_message(
+    batch: list[SourceItem],
+    topic: str,
+    card_type: str,
+    cards_per_item: int,
+    notes: list[str] | None = None,
+) -> str:
+    """Constrói a mensagem do usuário para um lote de itens."""
+    type_instruction = ""
+    if card_type != "auto":
+        type_instruction = f"\n\nGere apenas cards do tipo '{card_type}'."
+
+    notes = notes or [""] * len(batch)
+    blocks = "\n\n".join(
+        f"[ITEM {i}]\n{item.text.strip()}\n[/ITEM {i}]"
+        if not note
+        else f"[ITEM {i}]\n{item.text.strip()}\n\n{note}\n[/ITEM {i}]"
+        for i, (item, note) in enumerate(zip(batch, notes), start=1)
+    )
+
+    return f"""Gere até {cards_per_item} flashcards Anki para CADA um dos {len(batch)} itens abaixo.
+Os itens são independentes entre si: cada card deve se basear apenas no seu item.
+
+**Tópico**: {topic}
+
+---
+{blocks}
+---
+{type_instruction}
+
+Retorne os cards agrupados por item em formato JSON, usando em `item_id`
+exatamente o número do item correspondente (ex: "1", "2")."""
@@ -0,0 +1,131 @@
+"""Cache local de texto extraído, indexado pelo hash do conteúdo do arquivo.
+
+Rodar o mesmo PDF com tópicos ou dificuldades diferentes não precisa repetir
+a extração: o texto é guardado em disco sob uma chave formada pelo SHA-256 do
+conteúdo, a versão do parser e o tipo de artefato (texto bruto, texto limpo,
+etc.). O diretório tem tamanho máximo e descarta as entradas menos usadas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_READ_BLOCK = 1 << 20  # 1 MiB
+_SUFFIX = ".txt"
+_SAFE_KEY_RE = re.compile(r"^[\w.\-]+$")
+
+
+def file_digest(path: Path) -> str:
+    """
+    Calcula o SHA-256 do conteúdo de um arquivo, lendo em blocos.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        Hash hexadecimal do conteúdo
+    """
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while block := f.read(_READ_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """Cache em disco de textos com remoção LRU por tamanho total."""
+
+    def __init__(self, directory: Path | str | None = None, max_bytes: int | None = None):
+        """
+        Inicializa o cache.
+
+        Args:
+            directory: Diretório do cache. Default usa settings.
+            max_bytes: Tamanho máximo do diretório em bytes. Default usa settings.
+        """
+        self.directory = Path(directory or settings.cache_dir).expanduser()
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else settings.cache_max_mb * 1024 * 1024
+        )
+
+    def get(self, key: str) -> str | None:
+        """
+        Retorna o texto associado à chave, ou None se ausente.
+
+        Um acerto atualiza o horário de acesso da entrada (política LRU).
+        """
+        entry = self._path(key)
+        try:
+            text = entry.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Falha ao ler entrada de cache %s: %s", entry.name, e)
+            return None
+
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        """Grava o texto sob a chave (escrita atômica) e aplica o limite de tamanho."""
+        entry = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp, entry)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            logger.warning("Falha ao gravar entrada de cache %s: %s", entry.name, e)
+            return
+
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        if not _SAFE_KEY_RE.match(key):
+            raise ValueError(f"Chave de cache inválida: {key!r}")
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return list(self.directory.glob(f"*{_SUFFIX}"))
+
+    def _evict(self) -> None:
+        """Remove as entradas menos recentemente usadas até caber no limite."""
+        stats = []
+        for entry in self._entries():
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            stats.append((st.st_mtime, st.st_size, entry))
+
+        total = sum(size for _, size, _ in stats)
+        for _, size, entry in sorted(stats, key=lambda s: s[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            logger.debug("Entrada de cache removida: %s", entry.name)
@@ -0,0 +1,328 @@
+"""Índice persistente dos cards já exportados, para não gerá-los de novo.
+
+A deduplicação de ``generate_cards`` vale só para uma chamada: a execução
+seguinte recria cards que já estão na coleção. Este módulo mantém, em
+SQLite, o hash do front normalizado de cada card exportado e as chaves de
+faixa LSH da sua assinatura MinHash. No pós-processamento, cards idênticos
+(mesmo hash) ou quase idênticos (mesma faixa e similaridade estimada acima
+do limiar) são descartados; opcionalmente, os fronts já cobertos de um
+tópico são enviados ao LLM como dica para que ele não os repita.
+
+O índice também guarda, por note type, o checksum do primeiro campo que o
+Anki usa na detecção de duplicatas. Semeado com decks existentes (ver
+``anki_import``), permite pular offline os cards que o ``addNotes``
+recusaria.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import time
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+
+from .anki_import import AnkiNote, anki_checksum, strip_html_media
+from .config import settings
+from .minhash import LSHIndex, MinHasher, normalize_text, similarity
+from .models import AnkiCard, get_model_for_card_type
+from .serializers import map_card_to_fields
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_VERSION = "1"
+# Fronts curtos: unigramas, como em ``near_duplicates``
+_SHINGLE_SIZE = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cards (
+    id INTEGER PRIMARY KEY,
+    front_hash TEXT NOT NULL UNIQUE,
+    front TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '',
+    signature BLOB,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band_key INTEGER NOT NULL,
+    card_id INTEGER NOT NULL REFERENCES cards(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS bands_key ON bands (band_key);
+CREATE TABLE IF NOT EXISTS anki_notes (
+    model TEXT NOT NULL,
+    checksum INTEGER NOT NULL,
+    first_field TEXT NOT NULL,
+    PRIMARY KEY (model, checksum, first_field)
+) WITHOUT ROWID;
+"""
+
+
+def front_hash(front: str) -> str:
+    """Hash do front normalizado (sem acentos, caixa e pontuação)."""
+    return hashlib.blake2b(normalize_text(front).encode(), digest_size=16).hexdigest()
+
+
+class CardIndex:
+    """
+    Índice SQLite de cards conhecidos.
+
+    Os parâmetros do MinHash são gravados na criação do banco; ao abrir um
+    banco existente, valem os parâmetros gravados, para que as chaves de
+    faixa continuem comparáveis.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+    ):
+        """
+        Abre (ou cria) o índice.
+
+        Args:
+            path: Arquivo SQLite. Default usa settings (":memory:" é aceito).
+            threshold: Similaridade mínima dos fronts para considerar duplicata
+            num_perm: Tamanho das assinaturas MinHash (só na criação)
+        """
+        self.path = str(path) if path is not None else settings.card_index_path
+        if self.path != ":memory:":
+            self.path = str(Path(self.path).expanduser())
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+        params = self._load_params(threshold, num_perm)
+        self.threshold = float(params["threshold"])
+        self._hasher = MinHasher(num_perm=int(params["num_perm"]))
+        self._lsh = LSHIndex(num_perm=int(params["num_perm"]), threshold=self.threshold)
+
+    def __enter__(self) -> CardIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+
+    def __contains__(self, card: object) -> bool:
+        return isinstance(card, AnkiCard) and self.find(card) is not None
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        self._conn.close()
+
+    def find(self, card: AnkiCard) -> int | None:
+        """
+        Busca um card conhecido igual ou quase igual a ``card``.
+
+        Args:
+            card: Card consultado
+
+        Returns:
+            ID do card conhecido, ou None
+        """
+        row = self._conn.execute(
+            "SELECT id FROM cards WHERE front_hash = ?", (front_hash(card.front),)
+        ).fetchone()
+        if row:
+            return row[0]
+
+        signature = self._hasher.text_signature(card.front, _SHINGLE_SIZE)
+        if not signature:
+            return None
+        keys = self._lsh.band_keys(signature)
+        rows = self._conn.execute(
+            "SELECT DISTINCT c.id, c.signature FROM bands b JOIN cards c ON c.id = b.card_id "
+            f"WHERE b.band_key IN ({','.join('?' * len(keys))})",
+            keys,
+        ).fetchall()
+
+        best: tuple[float, int] | None = None
+        for card_id, blob in rows:
+            stored = array("I")
+            stored.frombytes(blob)
+            score = similarity(signature, stored)
+            if score >= self.threshold and (best is None or score > best[0]):
+                best = (score, card_id)
+        return best[1] if best else None
+
+    def filter_new(self, cards: Iterable[AnkiCard]) -> list[AnkiCard]:
+        """
+        Remove os cards já conhecidos pelo índice.
+
+        Args:
+            cards: Cards recém-gerados
+
+        Returns:
+            Apenas os cards que não estão (nem quase estão) no índice
+        """
+        cards = list(cards)
+        new = [card for card in cards if self.find(card) is None]
+        if len(new) < len(cards):
+            logger.info("Descartados %d cards já existentes no índice", len(cards) - len(new))
+        return new
+
+    def add(self, cards: Iterable[AnkiCard]) -> int:
+        """
+        Registra cards exportados no índice.
+
+        Cards cujo front normalizado já esteja no índice são ignorados.
+
+        Args:
+            cards: Cards exportados
+
+        Returns:
+            Número de cards novos registrados
+        """
+        added = 0
+        now = time.time()
+        with self._conn:
+            for card in cards:
+                model = get_model_for_card_type(card.card_type).name
+                self._insert_note(model, map_card_to_fields(card)[0])
+                added += self._insert_front(card.front, card.tags, now)
+        logger.info("Índice de cards: %d novos registrados (%d no total)", added, len(self))
+        return added
+
+    def add_notes(self, notes: Iterable[AnkiNote]) -> int:
+        """
+        Semeia o índice com notas de uma coleção Anki existente.
+
+        O primeiro campo, sem HTML, é registrado como front (para a
+        deduplicação da geração) e seu checksum, para ``is_anki_duplicate``.
+
+        Args:
+            notes: Notas lidas de um .apkg ou do AnkiConnect
+
+        Returns:
+            Número de notas que ainda não estavam no índice
+        """
+        added = 0
+        now = time.time()
+        with self._conn:
+            for note in notes:
+                if not self._insert_note(note.model, note.first_field):
+                    continue
+                added += 1
+                front = strip_html_media(note.first_field).strip()
+                if front:
+                    self._insert_front(front, note.tags, now)
+        logger.info("Índice de cards: %d notas importadas", added)
+        return added
+
+    def has_note(self, model: str, first_field: str) -> bool:
+        """
+        Verifica se há nota do note type com o mesmo primeiro campo.
+
+        Mesmo critério do Anki: checksum e texto do campo sem HTML.
+
+        Args:
+            model: Nome do note type
+            first_field: Valor do primeiro campo (com HTML)
+
+        Returns:
+            True se o Anki consideraria a nota duplicata
+        """
+        row = self._conn.execute(
+            "SELECT 1 FROM anki_notes WHERE model = ? AND checksum = ? AND first_field = ?",
+            (model, anki_checksum(first_field), strip_html_media(first_field)),
+        ).fetchone()
+        return row is not None
+
+    def is_anki_duplicate(self, card: AnkiCard) -> bool:
+        """Verifica se o Anki recusaria o card como duplicata."""
+        model = get_model_for_card_type(card.card_type).name
+        return self.has_note(model, map_card_to_fields(card)[0])
+
+    def covered_fronts(self, topic: str | None = None, limit: int = 50) -> list[str]:
+        """
+        Fronts já existentes, dos mais recentes aos mais antigos.
+
+        Args:
+            topic: Se informado, apenas cards com essa tag
+            limit: Número máximo de fronts
+
+        Returns:
+            Lista de fronts
+        """
+        if topic:
+            rows = self._conn.execute(
+                "SELECT front FROM cards WHERE instr(tags, ?) > 0 ORDER BY id DESC LIMIT ?",
+                (f" {topic} ", limit),
+            )
+        else:
+            rows = self._conn.execute(
+                "SELECT front FROM cards ORDER BY id DESC LIMIT ?", (limit,)
+            )
+        return [row[0] for row in rows]
+
+    def _insert_front(self, front: str, tags: list[str], now: float) -> bool:
+        """Insere um front e suas chaves de faixa; False se já existia."""
+        signature = self._hasher.text_signature(front, _SHINGLE_SIZE)
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO cards (front_hash, front, tags, signature, added_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (front_hash(front), front, f" {' '.join(tags)} ", array("I", signature).tobytes(), now),
+        )
+        if not cursor.rowcount:
+            return False
+        if signature:
+            card_id = cursor.lastrowid
+            self._conn.executemany(
+                "INSERT INTO bands (band_key, card_id) VALUES (?, ?)",
+                [(key, card_id) for key in self._lsh.band_keys(signature)],
+            )
+        return True
+
+    def _insert_note(self, model: str, first_field: str) -> bool:
+        """Registra o checksum do primeiro campo; False se já existia."""
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO anki_notes (model, checksum, first_field) VALUES (?, ?, ?)",
+            (model, anki_checksum(first_field), strip_html_media(first_field)),
+        )
+        return bool(cursor.rowcount)
+
+    def _load_params(self, threshold: float, num_perm: int) -> dict[str, str]:
+        stored = dict(self._conn.execute("SELECT key, value FROM meta"))
+        if not stored:
+            stored = {
+                "schema": _SCHEMA_VERSION,
+                "num_perm": str(num_perm),
+                "threshold": str(threshold),
+            }
+            with self._conn:
+                self._conn.executemany("INSERT INTO meta VALUES (?, ?)", stored.items())
+        elif (stored["num_perm"], stored["threshold"]) != (str(num_perm), str(threshold)):
+            logger.info(
+                "Índice %s criado com num_perm=%s, threshold=%s; usando esses valores",
+                self.path,
+                stored["num_perm"],
+                stored["threshold"],
+            )
+        return stored
+
+
+def format_covered_hints(fronts: list[str]) -> str:
+    """
+    Formata fronts já existentes como dica para a mensagem do usuário.
+
+    Args:
+        fronts: Fronts de cards que o usuário já tem
+
+    Returns:
+        Bloco de texto com as dicas, ou string vazia se não houver fronts
+    """
+    if not fronts:
+        return ""
+    lines = ["**Cards que o usuário já possui** (não gere perguntas equivalentes):"]
+    lines.extend(f"- {front}" for front in fronts)
+    return "\n".join(lines)
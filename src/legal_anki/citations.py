@@ -0,0 +1,229 @@
+"""Extração offline de citações jurídicas para pré-preencher campos extra.
+
+Boa parte dos tokens de saída em cards de jurisprudência e questão é o modelo
+redigitando metadados presentes literalmente no texto fonte ("ADI 4277",
+"Súmula Vinculante 11", "(CESPE/2022 - Juiz Federal)"). Este módulo extrai
+esses metadados com expressões regulares pré-compiladas, para enviá-los como
+dicas estruturadas ao LLM e preencher ``extra`` deterministicamente depois.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from .config import CardType
+
+if TYPE_CHECKING:
+    from .models import AnkiCard
+
+_BANCAS = (
+    "CESPE|CEBRASPE|FCC|FGV|VUNESP|ESAF|FUNDEP|IBFC|QUADRIX|AOCP|"
+    "CONSULPLAN|IADES|FUNCAB|CESGRANRIO|FUMARC|FAURGS|IDECAN|INSTITUTO AOCP"
+)
+
+# "(CESPE/2022 - Juiz Federal)", "(FGV - 2019)", "(FCC/2018/TRF3 - Analista)"
+_QUESTAO_HEADER_RE = re.compile(
+    rf"\(\s*(?P<banca>{_BANCAS})\s*[/\-–]\s*(?P<ano>(?:19|20)\d{{2}})"
+    r"(?:\s*[/\-–]\s*(?P<cargo>[^)]+?))?\s*\)",
+    re.IGNORECASE,
+)
+
+# "Súmula Vinculante 11", "Súmula nº 473 do STF", "SV 56"
+_SUMULA_RE = re.compile(
+    r"\bS[úu]mula\s+(?P<vinculante>Vinculante\s+)?(?:n[º°o.]?\s*)?(?P<num>\d+)"
+    r"(?:\s*(?:do|da|-|/|–)\s*(?P<tribunal>STF|STJ|TST|TSE|STM))?"
+    r"|\bSV\s*(?P<sv>\d+)\b",
+    re.IGNORECASE,
+)
+
+# "ADI 4277", "RE 635.659/SP", "HC nº 126.292"
+_PROCESSO_RE = re.compile(
+    r"\b(?P<classe>ADI|ADC|ADO|ADPF|ARE|RE|REsp|AREsp|RHC|HC|RMS|MS|MI|Rcl|"
+    r"Inq|AP|Pet)\s+(?:n[º°o.]?\s*)?(?P<num>\d+(?:\.\d{3})*)\b"
+    r"(?:\s*/\s*(?P<uf>[A-Z]{2})\b)?",
+)
+
+_TRIBUNAL_RE = re.compile(r"\b(?P<tribunal>STF|STJ|TST|TSE|STM|TRF\s?\d|TJ[A-Z]{2})\b")
+
+# Classes processuais de competência exclusiva de um tribunal
+_CLASSE_TRIBUNAL = {
+    "ADI": "STF",
+    "ADC": "STF",
+    "ADO": "STF",
+    "ADPF": "STF",
+    "RE": "STF",
+    "ARE": "STF",
+    "REsp": "STJ",
+    "AREsp": "STJ",
+}
+
+
+class Citations(BaseModel):
+    """Metadados jurídicos extraídos de um trecho de texto."""
+
+    tribunais: list[str] = Field(default_factory=list)
+    processos: list[str] = Field(default_factory=list)
+    sumulas: list[str] = Field(default_factory=list)
+    bancas: list[str] = Field(default_factory=list)
+    anos: list[str] = Field(default_factory=list)
+    cargos: list[str] = Field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """Retorna True se nenhuma citação foi encontrada."""
+        return not any(
+            (
+                self.tribunais,
+                self.processos,
+                self.sumulas,
+                self.bancas,
+                self.anos,
+                self.cargos,
+            )
+        )
+
+
+def extract_citations(text: str) -> Citations:
+    """
+    Extrai tribunais, processos, súmulas e cabeçalhos de questão de um texto.
+
+    Args:
+        text: Texto fonte (chunk, item ou front de um card)
+
+    Returns:
+        Citations com listas deduplicadas na ordem de ocorrência
+    """
+    found = Citations()
+    if not text:
+        return found
+
+    for m in _QUESTAO_HEADER_RE.finditer(text):
+        _append(found.bancas, m["banca"].upper())
+        _append(found.anos, m["ano"])
+        if m["cargo"]:
+            _append(found.cargos, m["cargo"].strip())
+
+    for m in _SUMULA_RE.finditer(text):
+        if m["sv"]:
+            _append(found.sumulas, f"Súmula Vinculante {m['sv']}")
+            _append(found.tribunais, "STF")
+        elif m["vinculante"]:
+            _append(found.sumulas, f"Súmula Vinculante {m['num']}")
+            _append(found.tribunais, "STF")
+        else:
+            tribunal = (m["tribunal"] or "").upper()
+            label = f"Súmula {m['num']}" + (f" - {tribunal}" if tribunal else "")
+            _append(found.sumulas, label)
+
+    for m in _PROCESSO_RE.finditer(text):
+        classe = m["classe"]
+        label = f"{classe} {m['num']}" + (f"/{m['uf']}" if m["uf"] else "")
+        _append(found.processos, label)
+        if classe in _CLASSE_TRIBUNAL:
+            _append(found.tribunais, _CLASSE_TRIBUNAL[classe])
+
+    for m in _TRIBUNAL_RE.finditer(text):
+        _append(found.tribunais, m["tribunal"].replace(" ", ""))
+
+    return found
+
+
+def format_citation_hints(citations: Citations) -> str:
+    """
+    Formata as citações extraídas como dicas para a mensagem do usuário.
+
+    Campos inequívocos (um único valor no trecho) são marcados como
+    preenchidos automaticamente, para que o LLM não precise repeti-los.
+
+    Args:
+        citations: Citações extraídas do trecho
+
+    Returns:
+        Bloco de texto com as dicas, ou string vazia se não houver citações
+    """
+    if citations.is_empty():
+        return ""
+
+    lines = ["**Metadados extraídos do texto** (use-os; não invente outros):"]
+    for label, values in (
+        ("Tribunais", citations.tribunais),
+        ("Processos", citations.processos),
+        ("Súmulas", citations.sumulas),
+        ("Bancas", citations.bancas),
+        ("Anos", citations.anos),
+        ("Cargos", citations.cargos),
+    ):
+        if values:
+            lines.append(f"- {label}: {', '.join(values)}")
+
+    auto = [
+        name
+        for name, values in (
+            ("extra.banca", citations.bancas),
+            ("extra.ano", citations.anos),
+            ("extra.cargo", citations.cargos),
+            ("extra.tribunal", citations.tribunais),
+        )
+        if len(values) == 1
+    ]
+    if auto:
+        lines.append(
+            f"Os campos {', '.join(auto)} são preenchidos automaticamente "
+            "e podem ser omitidos."
+        )
+
+    return "\n".join(lines)
+
+
+def fill_extra(card: "AnkiCard", citations: Citations) -> "AnkiCard":
+    """
+    Preenche campos ``extra`` ausentes a partir das citações extraídas.
+
+    As citações do próprio card (front/back) têm precedência sobre as do
+    trecho de origem; de cada fonte só são usados valores inequívocos. Campos
+    já preenchidos pelo LLM nunca são sobrescritos.
+
+    Args:
+        card: Card gerado pelo LLM
+        citations: Citações extraídas do trecho de origem do card
+
+    Returns:
+        O próprio card (sem alterações) ou uma cópia com ``extra`` completado
+    """
+    if card.card_type not in (CardType.QUESTAO, CardType.JURISPRUDENCIA):
+        return card
+
+    own = extract_citations(f"{card.front}\n{card.back}")
+    extra = dict(card.extra or {})
+
+    def fill(key: str, attr: str) -> None:
+        if extra.get(key):
+            return
+        for source in (own, citations):
+            values = getattr(source, attr)
+            if len(values) == 1:
+                extra[key] = values[0]
+                return
+
+    if card.card_type == CardType.QUESTAO:
+        fill("banca", "bancas")
+        fill("ano", "anos")
+        fill("cargo", "cargos")
+    else:
+        fill("tribunal", "tribunais")
+        if not extra.get("fundamento_legal"):
+            refs = own.sumulas + own.processos
+            if len(refs) == 1:
+                extra["fundamento_legal"] = refs[0]
+
+    if extra == (card.extra or {}):
+        return card
+    return card.model_copy(update={"extra": extra})
+
+
+def _append(values: list[str], value: str) -> None:
+    """Adiciona valor à lista se ainda não estiver presente."""
+    if value not in values:
+        values.append(value)
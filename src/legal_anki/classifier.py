@@ -0,0 +1,118 @@
+"""Pré-classificação local de trechos para roteamento de tipo de card.
+
+Implementa localmente as regras de ``AUTO_TYPE_HEURISTICS`` (alternativas
+A–E → questão, texto literal de artigo → cloze, súmula/tese → jurisprudência)
+com expressões regulares pré-compiladas, para que o LLM receba um prompt
+específico do tipo em vez de redescobrir as regras a cada chamada.
+"""
+
+from __future__ import annotations
+
+import re
+
+from .config import CardType
+
+# --- questao -----------------------------------------------------------------
+
+# Alternativas no início da linha: "A) ...", "(B) ...", "c. ...", "D - ..."
+_ALTERNATIVE_RE = re.compile(r"^\s*\(?([A-Ea-e])\s*[\)\.\-–—]\s+\S", re.MULTILINE)
+# "certo e errado" é prosa comum; só "certo ou errado" e "Certo/Errado" contam
+_CERTO_ERRADO_RE = re.compile(r"\bcerto\s*(?:ou|/)\s*errado\b", re.IGNORECASE)
+_GABARITO_RE = re.compile(r"\bgabarito\b\s*:", re.IGNORECASE)
+# Cabeçalho de questão: "(CESPE/2022", "(FGV - 2019", "Banca: FCC"
+_BANCA_HEADER_RE = re.compile(
+    r"\(\s*(?:CESPE|CEBRASPE|FCC|FGV|VUNESP|ESAF|FUNDEP|IBFC|QUADRIX|AOCP|"
+    r"CONSULPLAN|IADES|FUNCAB|MPE|TRF\d?)\b[^)]{0,40}?\b(?:19|20)\d{2}"
+    r"|\bbanca\s*:",
+    re.IGNORECASE,
+)
+# Um marcador (Certo/Errado, gabarito, banca) a cada tantos caracteres, no
+# mínimo: um banco de questões tem um ou dois por item, enquanto um texto
+# doutrinário que cita um item isolado fica bem abaixo disso
+_QUESTAO_CHARS_PER_MARKER = 1000
+
+# --- cloze (lei seca) --------------------------------------------------------
+
+# Linhas que começam com marcadores estruturais de texto normativo
+_STATUTE_LINE_RE = re.compile(
+    r"^\s*(?:Art\.\s*\d+|§\s*\d+|Parágrafo\s+único|[IVXLC]+\s*[-–—]\s|[a-z]\)\s)",
+    re.MULTILINE,
+)
+_ARTICLE_LINE_RE = re.compile(r"^\s*Art\.\s*\d+", re.MULTILINE)
+
+# --- jurisprudencia ----------------------------------------------------------
+
+_STRONG_JURIS_RE = re.compile(
+    r"\bs[úu]mula(?:\s+vinculante)?\s+(?:n[º°o.]?\s*)?\d+"
+    r"|\btese\b"
+    r"|\brepercuss[ãa]o\s+geral\b"
+    r"|\binformativo\b",
+    re.IGNORECASE,
+)
+_WEAK_JURIS_RE = re.compile(
+    r"\b(?:ADI|ADC|ADO|ADPF|RE|REsp|ARE|HC|RHC|MS|MI|Rcl)\s+(?:n[º°.]?\s*)?\d"
+    r"|\bjulgad[oa]s?\b"
+    r"|\b(?:STF|STJ|TST|TSE)\s+(?:decidiu|entendeu|fixou|firmou|reconheceu)\b"
+    r"|\b(?:Rel\.|Relator[a]?)\s",
+    re.IGNORECASE,
+)
+
+# Proporção mínima de linhas estruturais para considerar o trecho "lei seca"
+_STATUTE_RATIO_STRONG = 0.5
+_STATUTE_RATIO_WEAK = 0.2
+
+
+def classify_chunk(text: str) -> CardType | None:
+    """
+    Classifica um trecho de texto jurídico no tipo de card mais adequado.
+
+    A ordem de precedência segue ``AUTO_TYPE_HEURISTICS``: questões primeiro
+    (alternativas ou Certo/Errado), depois texto normativo literal e, por fim,
+    jurisprudência. Alíneas "a)", "b)"... de um texto predominantemente
+    normativo não são confundidas com alternativas. Conteúdo doutrinário ou
+    ambíguo retorna None para que o LLM escolha (e varie) os tipos livremente.
+
+    Args:
+        text: Trecho de texto a classificar
+
+    Returns:
+        CardType detectado, ou None se nenhuma regra se aplicar com confiança
+    """
+    if not text or not text.strip():
+        return None
+
+    if _has_questao_marker(text):
+        return CardType.QUESTAO
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    statute_lines = len(_STATUTE_LINE_RE.findall(text))
+    statute_ratio = statute_lines / len(lines) if lines else 0.0
+    has_article = _ARTICLE_LINE_RE.search(text) is not None
+
+    if has_article and statute_ratio >= _STATUTE_RATIO_STRONG:
+        return CardType.CLOZE
+
+    if len({m.upper() for m in _ALTERNATIVE_RE.findall(text)}) >= 3:
+        return CardType.QUESTAO
+
+    strong_juris = _STRONG_JURIS_RE.search(text) is not None
+    weak_juris = len(_WEAK_JURIS_RE.findall(text))
+    if strong_juris or weak_juris >= 2:
+        return CardType.JURISPRUDENCIA
+
+    if has_article and statute_ratio >= _STATUTE_RATIO_WEAK:
+        return CardType.CLOZE
+
+    return None
+
+
+def _has_questao_marker(text: str) -> bool:
+    """
+    Detecta trechos de questões pelos marcadores (Certo/Errado, gabarito,
+    banca), exigindo densidade e não uma ocorrência isolada.
+    """
+    markers = sum(
+        len(pattern.findall(text))
+        for pattern in (_CERTO_ERRADO_RE, _GABARITO_RE, _BANCA_HEADER_RE)
+    )
+    return markers > 0 and markers * _QUESTAO_CHARS_PER_MARKER >= len(text.strip())
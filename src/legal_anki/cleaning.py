@@ -0,0 +1,138 @@
+"""Limpeza de ruído de página em textos extraídos de PDF.
+
+Cabeçalhos do DOU, números de página e timbres de tribunais se repetem em
+todas as páginas e acabam em cada chunk, cobrados como tokens de entrada. Este
+módulo detecta linhas repetidas nas mesmas posições (topo/rodapé) ao longo do
+documento, remove numeração de página e desfaz hifenizações e quebras de linha
+artificiais antes do chunking.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+from collections import Counter
+from collections.abc import Sequence
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Linhas não vazias inspecionadas no topo e no rodapé de cada página
+_ZONE_LINES = 3
+# Documentos com menos páginas não têm repetição suficiente para inferir ruído
+_MIN_PAGES_FOR_REPEATS = 3
+# Fração mínima de páginas em que a linha deve aparecer na mesma zona
+_REPEAT_RATIO = 0.5
+# Estimativa usada no restante do projeto (~4 caracteres por token em português)
+_CHARS_PER_TOKEN = 4
+
+_DIGITS_RE = re.compile(r"\d+")
+_PAGE_NUMBER_RE = re.compile(
+    r"^\s*[-–]?\s*(?:p[áa]g(?:ina)?\.?\s*)?\d{1,4}(?:\s*(?:/|de)\s*\d{1,4})?\s*[-–]?\s*$",
+    re.IGNORECASE,
+)
+_HYPHEN_END_RE = re.compile(r"[A-Za-zÀ-ÿ]-$")
+_SENTENCE_END = (".", ":", ";", "!", "?")
+# Alíneas ("a) ...") começam em minúscula mas são dispositivos próprios
+_ALINEA_RE = re.compile(r"^[a-z]\)\s")
+
+
+class CleaningStats(BaseModel):
+    """Estatísticas da limpeza de um documento."""
+
+    chars_before: int = 0
+    chars_after: int = 0
+    repeated_lines_removed: int = 0
+    page_numbers_removed: int = 0
+    hyphenations_joined: int = 0
+    lines_joined: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens de entrada estimados economizados pela limpeza."""
+        return max(0, self.chars_before - self.chars_after) // _CHARS_PER_TOKEN
+
+
+def clean_pages(pages: Sequence[str]) -> tuple[list[str], CleaningStats]:
+    """
+    Remove cabeçalhos/rodapés repetidos e desfaz quebras artificiais.
+
+    Uma linha é considerada ruído quando aparece (com dígitos normalizados,
+    para cobrir "Página 3", "DOU de 12/05") na mesma zona — topo ou rodapé —
+    de pelo menos metade das páginas.
+
+    Args:
+        pages: Texto de cada página, na ordem do documento
+
+    Returns:
+        Tupla (páginas limpas, estatísticas)
+    """
+    stats = CleaningStats(chars_before=sum(len(p) for p in pages))
+    page_lines = [p.splitlines() for p in pages]
+
+    noise: set[tuple[str, str]] = set()
+    if len(pages) >= _MIN_PAGES_FOR_REPEATS:
+        counts: Counter[tuple[str, str]] = Counter()
+        for lines in page_lines:
+            counts.update(
+                {(zone, _normalize(lines[i])) for i, zone in _zones(lines).items()}
+            )
+        threshold = max(2, math.ceil(len(pages) * _REPEAT_RATIO))
+        noise = {key for key, count in counts.items() if count >= threshold}
+
+    cleaned = []
+    for lines in page_lines:
+        zones = _zones(lines)
+        kept = []
+        for i, line in enumerate(lines):
+            zone = zones.get(i)
+            if zone is not None:
+                if _PAGE_NUMBER_RE.match(line):
+                    stats.page_numbers_removed += 1
+                    continue
+                if (zone, _normalize(line)) in noise:
+                    stats.repeated_lines_removed += 1
+                    continue
+            kept.append(line)
+        cleaned.append(_unwrap_lines(kept, stats))
+
+    stats.chars_after = sum(len(p) for p in cleaned)
+    return cleaned, stats
+
+
+def _zones(lines: list[str]) -> dict[int, str]:
+    """Mapeia índices das linhas de topo/rodapé para a zona correspondente."""
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    # Em páginas curtas as zonas não podem se sobrepor nem engolir o corpo
+    size = min(_ZONE_LINES, (len(non_empty) - 1) // 2)
+    if size <= 0:
+        return {}
+    zones = {i: "footer" for i in non_empty[-size:]}
+    zones.update({i: "header" for i in non_empty[:size]})
+    return zones
+
+
+def _normalize(line: str) -> str:
+    """Normaliza uma linha para comparação entre páginas."""
+    return _DIGITS_RE.sub("#", " ".join(line.split()).lower())
+
+
+def _unwrap_lines(lines: list[str], stats: CleaningStats) -> str:
+    """Junta palavras hifenizadas e linhas quebradas no meio da frase."""
+    out: list[str] = []
+    for line in lines:
+        stripped = line.strip()
+        prev = out[-1] if out else ""
+        starts_lower = stripped[:1].islower() and not _ALINEA_RE.match(stripped)
+
+        if prev and starts_lower and _HYPHEN_END_RE.search(prev):
+            out[-1] = prev[:-1] + stripped
+            stats.hyphenations_joined += 1
+        elif prev and starts_lower and not prev.endswith(_SENTENCE_END):
+            out[-1] = f"{prev} {stripped}"
+            stats.lines_joined += 1
+        else:
+            out.append(stripped)
+    return "\n".join(out)
@@ -0,0 +1,252 @@
+"""Gerador local de cards cloze para lei seca, baseado em regras.
+
+Para texto normativo puro, os cards desejados são quase sempre lacunas
+determinísticas sobre termos-chave (prazos, quóruns, competências, órgãos):
+não há por que pagar a latência do LLM por artigo. Este módulo percorre o
+índice estrutural do texto (``structure.build_index``), procura termos em
+listas pré-compiladas e gera cards ``CardType.CLOZE`` com até três lacunas,
+validados por ``validate_card``. Tudo roda offline.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Iterator
+
+from .config import CardType
+from .generator import postprocess_cards
+from .models import AnkiCard
+from .structure import Dispositivo, LegalIndex, build_index
+from .validators import CardValidationError, validate_card
+
+logger = logging.getLogger(__name__)
+
+_MAX_DELETIONS = 3
+# Dispositivos muito curtos ("I - a soberania;") não rendem um card útil
+_MIN_BODY_CHARS = 40
+
+_NUM_WORDS = (
+    r"(?:um|uma|dois|duas|três|quatro|cinco|seis|sete|oito|nove|dez|onze|doze|"
+    r"quinze|vinte|trinta|quarenta|cinquenta|sessenta|setenta|oitenta|noventa|"
+    r"cem|cento|duzentos|trezentos|quatrocentos|quinhentos)"
+    r"(?:\s+e\s+(?:um|uma|dois|duas|três|quatro|cinco|seis|sete|oito|nove|"
+    r"vinte|trinta|quarenta|cinquenta|sessenta|setenta|oitenta|noventa))*"
+)
+
+_ORGAOS = (
+    "Congresso Nacional",
+    "Senado Federal",
+    "Câmara dos Deputados",
+    "Presidente da República",
+    "Vice-Presidente da República",
+    "Supremo Tribunal Federal",
+    "Superior Tribunal de Justiça",
+    "Tribunal Superior do Trabalho",
+    "Tribunal Superior Eleitoral",
+    "Superior Tribunal Militar",
+    "Tribunal de Contas da União",
+    "Conselho Nacional de Justiça",
+    "Conselho Nacional do Ministério Público",
+    "Conselho da República",
+    "Conselho de Defesa Nacional",
+    "Procurador-Geral da República",
+    "Advogado-Geral da União",
+    "Advocacia-Geral da União",
+    "Ministério Público",
+    "Defensoria Pública",
+    "Polícia Federal",
+    "Assembleias? Legislativas?",
+    "Câmaras? Municipa(?:l|is)",
+    "Governador(?:es)?",
+    "Prefeitos?",
+)
+
+# Categorias em ordem de prioridade: quando há mais candidatos que lacunas,
+# prevalecem os primeiros (quóruns e prazos são o que mais cai em prova).
+_TERM_PATTERNS: tuple[tuple[str, re.Pattern[str]], ...] = (
+    (
+        "quorum",
+        re.compile(
+            r"\b(?:maioria\s+(?:absoluta|simples|relativa)|"
+            r"(?:dois|três|quatro)\s+(?:terços|quintos)|"
+            r"um\s+(?:terço|quinto|sexto)|metade|dois\s+turnos|turno\s+único)\b",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "prazo",
+        re.compile(
+            rf"\b(?:\d+|{_NUM_WORDS})\s+(?:dias|meses|anos|horas)(?:\s+úteis)?\b"
+            r"(?!\s+de\s+idade)",
+            re.IGNORECASE,
+        ),
+    ),
+    (
+        "idade",
+        re.compile(rf"\b(?:\d+|{_NUM_WORDS})\s+anos(?=\s+de\s+idade)", re.IGNORECASE),
+    ),
+    (
+        "competencia",
+        re.compile(r"\b(?:privativa|exclusiva|concorrente)(?:mente)?\b", re.IGNORECASE),
+    ),
+    ("orgao", re.compile(r"\b(?:" + "|".join(_ORGAOS) + r")\b")),
+    ("ente", re.compile(r"\b(?:União|Estados|Distrito Federal|Municípios)\b")),
+    (
+        "numero",
+        # Números soltos, exceto remissões ("art. 84", "§ 2º", "Lei nº 8.112")
+        re.compile(
+            r"(?<![\w.§])(?<!§\s)(?<![Aa]rt\.\s)(?<!arts\.\s)(?<!nº\s)"
+            r"\d+(?:[.,]\d+)*%?(?![\wº°])"
+        ),
+    ),
+)
+
+_MARKER_PREFIX_RE = re.compile(
+    r"^(?:Art\.?\s*[\d.]+\s*(?:[º°o]\.?)?(?:\s*-\s*[A-Z]\b)?\.?"
+    r"|§\s*\d+\s*(?:[º°o]\.?)?(?:\s*-\s*[A-Z]\b)?\.?"
+    r"|Par[áa]grafo\s+[úu]nico\.?"
+    r"|[IVXLCDM]+(?:\s*-\s*[A-Z]\b)?\s*[-–—]"
+    r"|[a-z]\))\s*"
+)
+_REVOKED_RE = re.compile(r"^\(?\s*(?:Revogad[oa]|Vetad[oa])", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def generate_clozes(
+    text: str,
+    topic: str,
+    law: str = "CF/88",
+    difficulty: str = "medio",
+    max_cards: int | None = None,
+) -> list[AnkiCard]:
+    """
+    Gera cards cloze a partir de texto de lei seca, sem LLM.
+
+    Args:
+        text: Texto normativo (CF/88, lei, código)
+        topic: Tópico principal dos cards (vira tag)
+        law: Nome da norma usado no fundamento (ex.: "CF/88", "Lei 8.112/90")
+        difficulty: Nível de dificuldade ("facil", "medio", "dificil")
+        max_cards: Número máximo de cards (None = sem limite)
+
+    Returns:
+        Lista de cards cloze validados, na ordem do texto
+
+    Raises:
+        ValueError: Se os parâmetros de entrada forem inválidos
+    """
+    if not topic or not topic.strip():
+        raise ValueError("Parâmetro 'topic' não pode ser vazio")
+    if max_cards is not None and max_cards < 1:
+        raise ValueError("Parâmetro 'max_cards' deve ser maior que zero")
+
+    index = build_index(text)
+    cards = []
+    for card in iter_clozes(index, topic.strip(), law, difficulty):
+        cards.append(card)
+        if max_cards is not None and len(cards) >= max_cards:
+            break
+
+    logger.info(
+        "Gerados %d cards cloze offline a partir de %d artigos", len(cards), len(index)
+    )
+    return cards
+
+
+def iter_clozes(
+    index: LegalIndex, topic: str, law: str = "CF/88", difficulty: str = "medio"
+) -> Iterator[AnkiCard]:
+    """
+    Gera um card cloze por dispositivo que contenha termos-chave.
+
+    Cada dispositivo (caput, parágrafo, inciso, alínea) contribui apenas com
+    o próprio texto, sem o dos filhos. Dispositivos revogados, curtos demais
+    ou sem termos reconhecidos são ignorados.
+
+    Args:
+        index: Índice estrutural do texto
+        topic: Tópico principal dos cards
+        law: Nome da norma usado no fundamento
+        difficulty: Nível de dificuldade
+
+    Yields:
+        Cards cloze validados, na ordem do texto
+    """
+    for node in _walk(index):
+        body = _own_text(index, node)
+        if len(body) < _MIN_BODY_CHARS or _REVOKED_RE.match(body):
+            continue
+
+        cloze = cloze_terms(body)
+        if cloze is None:
+            continue
+
+        ref = node.ref[0].upper() + node.ref[1:]
+        card = AnkiCard(
+            front=f"{ref} ({law}): {cloze}",
+            back=f"Literalidade do {node.ref}, {law}.",
+            card_type=CardType.CLOZE,
+            tags=["lei_seca"],
+            extra={"fundamento": f"{ref}, {law}"},
+        )
+        card = postprocess_cards([card], topic, difficulty)[0]
+        try:
+            validate_card(card)
+        except CardValidationError as e:
+            logger.debug("Cloze descartado (%s): %s", node.ref, e)
+            continue
+        yield card
+
+
+def cloze_terms(text: str, max_deletions: int = _MAX_DELETIONS) -> str | None:
+    """
+    Marca até ``max_deletions`` termos-chave do texto como lacunas.
+
+    Args:
+        text: Texto de um dispositivo
+        max_deletions: Número máximo de lacunas ({{c1::}} ... {{cN::}})
+
+    Returns:
+        Texto com as lacunas numeradas na ordem de leitura, ou None se nenhum
+        termo for encontrado
+    """
+    spans: list[tuple[int, int]] = []
+    for _, pattern in _TERM_PATTERNS:
+        for m in pattern.finditer(text):
+            start, end = m.span()
+            if any(start < e and s < end for s, e in spans):
+                continue
+            spans.append((start, end))
+            if len(spans) >= max_deletions:
+                break
+        if len(spans) >= max_deletions:
+            break
+
+    if not spans:
+        return None
+
+    parts = []
+    last = 0
+    for n, (start, end) in enumerate(sorted(spans), start=1):
+        parts.append(text[last:start])
+        parts.append(f"{{{{c{n}::{text[start:end]}}}}}")
+        last = end
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+def _walk(index: LegalIndex) -> Iterator[Dispositivo]:
+    """Percorre os dispositivos em pré-ordem (ordem do texto)."""
+    stack = list(reversed(list(index)))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(list(node.children.values())))
+
+
+def _own_text(index: LegalIndex, node: Dispositivo) -> str:
+    """Texto do dispositivo sem os filhos e sem o rótulo ("Art. 5º", "LXIII -")."""
+    end = min((c.start for c in node.children.values()), default=node.end)
+    raw = index.text[node.start : end]
+    return _MARKER_PREFIX_RE.sub("", _WHITESPACE_RE.sub(" ", raw).strip(), count=1)
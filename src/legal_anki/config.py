@@ -1,6 +1,6 @@
 """Configurações e constantes do LegalAnki."""
 
-import random
+import hashlib
 from enum import StrEnum
 from pathlib import Path
 
@@ -15,9 +15,21 @@ _project_root = Path(__file__).parent.parent.parent
 load_dotenv(_project_root / ".env")
 
 
-def _generate_anki_id() -> int:
-    """Gera um ID único válido para modelos/decks Anki."""
-    return random.randrange(1 << 30, 1 << 31)
+def stable_anki_id(name: str) -> int:
+    """
+    ID válido para modelos/decks Anki, derivado do nome.
+
+    O mesmo nome gera sempre o mesmo ID, em qualquer máquina ou processo, de
+    modo que o Anki reconhece o deck ou note type numa nova importação.
+
+    Args:
+        name: Nome qualificado (ex.: "deck:LegalAnki", "model:LegalAnki Basic")
+
+    Returns:
+        Inteiro entre 2**30 e 2**31
+    """
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return (1 << 30) + int.from_bytes(digest, "big") % (1 << 30)
 
 
 class Settings(BaseSettings):
@@ -27,19 +39,13 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(default="", alias="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4o-2024-08-06", alias="OPENAI_MODEL")
 
-    # Anki IDs
-    anki_deck_id: int = Field(default_factory=_generate_anki_id, alias="ANKI_DECK_ID")
-    anki_model_basic_id: int = Field(
-        default_factory=_generate_anki_id, alias="ANKI_MODEL_BASIC_ID"
-    )
-    anki_model_cloze_id: int = Field(
-        default_factory=_generate_anki_id, alias="ANKI_MODEL_CLOZE_ID"
-    )
-    anki_model_questao_id: int = Field(
-        default_factory=_generate_anki_id, alias="ANKI_MODEL_QUESTAO_ID"
-    )
-    anki_model_jurisprudencia_id: int = Field(
-        default_factory=_generate_anki_id, alias="ANKI_MODEL_JURISPRUDENCIA_ID"
+    # Anki IDs (se ausentes, derivados dos nomes via stable_anki_id)
+    anki_deck_id: int | None = Field(default=None, alias="ANKI_DECK_ID")
+    anki_model_basic_id: int | None = Field(default=None, alias="ANKI_MODEL_BASIC_ID")
+    anki_model_cloze_id: int | None = Field(default=None, alias="ANKI_MODEL_CLOZE_ID")
+    anki_model_questao_id: int | None = Field(default=None, alias="ANKI_MODEL_QUESTAO_ID")
+    anki_model_jurisprudencia_id: int | None = Field(
+        default=None, alias="ANKI_MODEL_JURISPRUDENCIA_ID"
     )
 
     # AnkiConnect
@@ -47,6 +53,15 @@ class Settings(BaseSettings):
         default="http://localhost:8765", alias="ANKI_CONNECT_URL"
     )
 
+    # Cache de texto extraído
+    cache_dir: str = Field(default="~/.cache/legal_anki", alias="LEGAL_ANKI_CACHE_DIR")
+    cache_max_mb: int = Field(default=512, alias="LEGAL_ANKI_CACHE_MAX_MB")
+
+    # Índice persistente de cards já exportados
+    card_index_path: str = Field(
+        default="~/.local/share/legal_anki/cards.sqlite3", alias="LEGAL_ANKI_CARD_INDEX"
+    )
+
     # Versioning
     skill_version: str = Field(default=__version__, alias="SKILL_VERSION")
 
@@ -1,4 +1,4 @@
-"""Exportadores para múltiplos formatos (CSV, TSV, JSON, APKG)."""
+"""Exportadores para múltiplos formatos (CSV, TSV, JSON, JSONL, APKG)."""
 
 from __future__ import annotations
 
@@ -6,42 +6,454 @@ import base64
 import csv
 import json
 import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, suppress
 from datetime import datetime
-from io import BytesIO, StringIO
+from io import StringIO
+from itertools import batched, chain
 from pathlib import Path
-from typing import TYPE_CHECKING
-
-import genanki
+from queue import Queue
+from threading import Event
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Self, TextIO
 
+from .apkg import DEFAULT_CHUNK_SIZE, ApkgWriter
 from .config import settings
-from .models import get_model_for_card_type
-from .serializers import map_card_to_fields
+from .jsonl import Compression, JsonlFormatError, build_header, open_text_writer
+from .manifest import (
+    ExportManifest,
+    file_sha256,
+    load_manifest,
+    select_changed,
+    write_manifest,
+)
+from .serializers import ExportError, SerializedCard, sanitize_text
 
 if TYPE_CHECKING:
     from .models import AnkiCard
 
 logger = logging.getLogger(__name__)
 
-
-class ExportError(Exception):
-    """Erro durante exportação."""
-
-    pass
+# Lotes pendentes por escritor em export_multi(threads=True)
+_MULTI_QUEUE_BATCHES = 4
 
 
 # =============================================================================
-# CSV Export (DEFAULT)
+# Escritores incrementais
 # =============================================================================
 
 
-def _sanitize_text(text: str | None, separator_char: str = ";") -> str:
-    """Remove quebras de linha e caracteres problemáticos para CSV/TSV."""
-    if not text:
-        return ""
-    # Remove tabs (se for o separador), newlines e carriage returns
-    return (
-        text.replace("\n", " ").replace("\r", "").replace(separator_char, " ").strip()
+# json.dumps com opções cria um encoder por chamada; aqui ele é reutilizado
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+class CardWriter(ABC):
+    """
+    Escritor incremental de cards (base dos formatos de texto).
+
+    Os cards são serializados um a um e gravados em blocos de
+    ``flush_every`` cards, de modo que a memória não cresce com o número de
+    cards e o arquivo começa a ser escrito antes do fim da geração. Uso::
+
+        with CsvCardWriter("cards.csv") as writer:
+            writer.write_cards(generate_cards_iter(...))
+
+    Se o bloco ``with`` falhar, o escritor é descartado (``abort``): o rodapé
+    não é escrito e o arquivo criado por ele é removido, para que uma
+    exportação incompleta não pareça completa.
+    """
+
+    format_name = ""
+    # Atributos de SerializedCard lidos por _write_card
+    uses: frozenset[str] = frozenset()
+
+    def __init__(self, output: Path | str | TextIO, flush_every: int = 1000):
+        """
+        Args:
+            output: Caminho do arquivo ou stream de texto já aberto (que não
+                    é fechado pelo escritor)
+            flush_every: Número de cards acumulados antes de cada gravação
+        """
+        if flush_every < 1:
+            raise ValueError("Parâmetro 'flush_every' deve ser maior que zero")
+        self.output = output
+        self.flush_every = flush_every
+        self.count = 0
+        self._stream: TextIO | None = None
+        self._owns_stream = False
+        self._parts: list[str] = []
+
+    def __enter__(self) -> Self:
+        return self.open()
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open(self) -> Self:
+        """
+        Abre o destino e escreve o cabeçalho do formato.
+
+        Raises:
+            ExportError: Se o arquivo não puder ser criado
+        """
+        if self._stream is not None:
+            return self
+        if isinstance(self.output, (str, Path)):
+            try:
+                self._stream = self._open_file(Path(self.output))
+            except OSError as e:
+                raise self._error(e) from e
+            self._owns_stream = True
+        else:
+            self._stream = self.output
+        self._write_header()
+        return self
+
+    def write_card(self, card: AnkiCard) -> None:
+        """
+        Serializa um card.
+
+        Raises:
+            ExportError: Se o escritor não estiver aberto ou a gravação falhar
+        """
+        if self._stream is None:
+            raise ExportError(f"Escritor {self.format_name} não está aberto")
+        self._write_card(card)
+        self.count += 1
+        if len(self._parts) >= self.flush_every:
+            self._flush()
+
+    def write_serialized(self, items: Iterable[SerializedCard]) -> None:
+        """
+        Grava cards já serializados (compartilhados entre os escritores na
+        exportação para vários formatos); cada item deve ter as partes de
+        ``uses``.
+
+        Raises:
+            ExportError: Se o escritor não estiver aberto ou a gravação falhar
+        """
+        if self._stream is None:
+            raise ExportError(f"Escritor {self.format_name} não está aberto")
+        write_item = self._write_item
+        for item in items:
+            write_item(item)
+            self.count += 1
+            if len(self._parts) >= self.flush_every:
+                self._flush()
+
+    def write_cards(self, cards: Iterable[AnkiCard]) -> int:
+        """
+        Serializa todos os cards de um iterável (lista, gerador, ...).
+
+        Returns:
+            Número de cards escritos nesta chamada
+        """
+        before = self.count
+        for card in cards:
+            self.write_card(card)
+        return self.count - before
+
+    def close(self) -> None:
+        """
+        Escreve o rodapé do formato, grava o restante e fecha o arquivo.
+
+        Raises:
+            ExportError: Se a gravação falhar (o arquivo é descartado)
+        """
+        if self._stream is None:
+            return
+        try:
+            self._write_footer()
+            self._flush()
+            if self._owns_stream:
+                self._stream.close()
+        except OSError as e:
+            self.abort()
+            raise self._error(e) from e
+        except BaseException:
+            self.abort()
+            raise
+        self._stream = None
+
+    def abort(self) -> None:
+        """
+        Descarta a exportação: não escreve o rodapé nem o que estava pendente
+        e remove o arquivo, se foi criado pelo escritor. Streams recebidos
+        prontos não são fechados.
+        """
+        if self._stream is None:
+            return
+        self._parts.clear()
+        stream, self._stream = self._stream, None
+        if self._owns_stream:
+            with suppress(OSError):
+                stream.close()
+            Path(self.output).unlink(missing_ok=True)
+
+    def _write(self, text: str) -> None:
+        self._parts.append(text)
+
+    def _flush(self) -> None:
+        if not self._parts:
+            return
+        try:
+            self._stream.write("".join(self._parts))
+        except OSError as e:
+            raise self._error(e) from e
+        self._parts.clear()
+
+    def _error(self, exc: Exception) -> ExportError:
+        return ExportError(
+            f"Erro ao escrever arquivo {self.format_name} para {self.output}: {exc}"
+        )
+
+    def _open_file(self, path: Path) -> TextIO:
+        return open(path, "w", encoding="utf-8", newline="")
+
+    def _write_header(self) -> None:
+        pass
+
+    @abstractmethod
+    def _write_card(self, card: AnkiCard) -> None:
+        """Serializa um card no bloco pendente."""
+
+    @abstractmethod
+    def _write_item(self, item: SerializedCard) -> None:
+        """Como ``_write_card``, a partir das partes já serializadas."""
+
+    def _write_footer(self) -> None:
+        pass
+
+
+class CsvCardWriter(CardWriter):
+    """
+    CSV com ponto-e-vírgula (compatível com Excel BR), todos os campos entre
+    aspas e quebras de linha removidas.
+    """
+
+    format_name = "CSV"
+    uses = frozenset({"front_line", "back_line", "tags_text", "extra_text"})
+
+    def __init__(
+        self,
+        output: Path | str | TextIO,
+        include_header: bool = True,
+        flush_every: int = 1000,
+    ):
+        super().__init__(output, flush_every)
+        self.include_header = include_header
+        # O csv.writer grava cada linha com uma única chamada a write(),
+        # direto no bloco pendente
+        self._csv = csv.writer(
+            SimpleNamespace(write=self._write), delimiter=";", quoting=csv.QUOTE_ALL
+        )
+
+    def _write_header(self) -> None:
+        if self.include_header:
+            self._csv.writerow(["front", "back", "tags", "type", "extra"])
+
+    def _write_card(self, card: AnkiCard) -> None:
+        extra_str = (
+            sanitize_text(json.dumps(card.extra, ensure_ascii=False))
+            if card.extra
+            else ""
+        )
+        self._csv.writerow(
+            [
+                sanitize_text(card.front, separator_char=";"),
+                sanitize_text(card.back, separator_char=";"),
+                sanitize_text(" ".join(card.tags)),
+                card.card_type,
+                extra_str,
+            ]
+        )
+
+    def _write_item(self, item: SerializedCard) -> None:
+        self._csv.writerow(
+            [
+                item.front_line.replace(";", " ").strip(),
+                item.back_line.replace(";", " ").strip(),
+                item.tags_text,
+                item.card.card_type,
+                item.extra_text,
+            ]
+        )
+
+
+class TsvCardWriter(CardWriter):
+    """TSV simples (front, back, tags), importável direto no Anki."""
+
+    format_name = "TSV"
+    uses = frozenset({"front_line", "back_line", "tags_text"})
+
+    def _write_card(self, card: AnkiCard) -> None:
+        tab = "\t"
+        front = sanitize_text(card.front, separator_char=tab)
+        back = sanitize_text(card.back, separator_char=tab)
+        tags_str = sanitize_text(" ".join(card.tags))
+        # Linhas separadas por "\n", sem quebra após a última
+        separator = "\n" if self.count else ""
+        self._write(f"{separator}{front}\t{back}\t{tags_str}")
+
+    def _write_item(self, item: SerializedCard) -> None:
+        front = item.front_line.replace("\t", " ").strip()
+        back = item.back_line.replace("\t", " ").strip()
+        separator = "\n" if self.count else ""
+        self._write(f"{separator}{front}\t{back}\t{item.tags_text}")
+
+
+class JsonCardWriter(CardWriter):
+    """
+    Documento JSON ``{"cards": [...], "metadata": {...}}`` indentado.
+
+    A metadata vai ao final porque o total de cards só é conhecido no
+    fechamento.
+    """
+
+    format_name = "JSON"
+    uses = frozenset({"json_text"})
+
+    def __init__(
+        self,
+        output: Path | str | TextIO,
+        include_metadata: bool = True,
+        flush_every: int = 1000,
+    ):
+        super().__init__(output, flush_every)
+        self.include_metadata = include_metadata
+
+    def _write_header(self) -> None:
+        self._write('{\n  "cards": [')
+
+    def _write_card(self, card: AnkiCard) -> None:
+        # Serializador do pydantic (Rust): mesmo documento, ~2x mais rápido
+        # que json.dumps(card.model_dump(), indent=2)
+        self._write_body(card.model_dump_json(indent=2))
+
+    def _write_item(self, item: SerializedCard) -> None:
+        self._write_body(item.json_text)
+
+    def _write_body(self, body: str) -> None:
+        separator = ",\n    " if self.count else "\n    "
+        self._write(separator + body.replace("\n", "\n    "))
+
+    def _write_footer(self) -> None:
+        self._write("\n  ]" if self.count else "]")
+        if self.include_metadata:
+            metadata = {
+                "skill_version": settings.skill_version,
+                "model": settings.openai_model,
+                "generated_at": datetime.now().isoformat(),
+                "total_cards": self.count,
+            }
+            body = _JSON_ENCODER.encode(metadata)
+            self._write(',\n  "metadata": ' + body.replace("\n", "\n  "))
+        self._write("\n}")
+
+
+class JsonlCardWriter(CardWriter):
+    """
+    JSON Lines: cabeçalho com metadata na primeira linha e um card por linha.
+
+    Comprimido com gzip ou zstd conforme ``compression`` (por padrão, pela
+    extensão .gz/.zst). Lido de volta por ``jsonl.JsonlCardReader``.
+    """
+
+    format_name = "JSONL"
+    uses = frozenset({"json_line"})
+
+    def __init__(
+        self,
+        output: Path | str | TextIO,
+        metadata: dict[str, Any] | None = None,
+        compression: Compression = "auto",
+        flush_every: int = 1000,
+    ):
+        """
+        Args:
+            output: Caminho do arquivo ou stream de texto
+            metadata: Campos adicionais do cabeçalho (ex.: topic)
+            compression: "auto", "gzip", "zstd" ou "none" (só para caminhos)
+            flush_every: Número de cards acumulados antes de cada gravação
+        """
+        super().__init__(output, flush_every)
+        self.metadata = metadata or {}
+        self.compression = compression
+
+    def _open_file(self, path: Path) -> TextIO:
+        try:
+            return open_text_writer(path, self.compression)
+        except JsonlFormatError as e:
+            raise ExportError(str(e)) from e
+
+    def _write_header(self) -> None:
+        header = build_header(**self.metadata)
+        self._write(json.dumps(header, ensure_ascii=False) + "\n")
+
+    def _write_card(self, card: AnkiCard) -> None:
+        self._write(card.model_dump_json() + "\n")
+
+    def _write_item(self, item: SerializedCard) -> None:
+        self._write(item.json_line + "\n")
+
+
+_WRITERS: dict[str, type[CardWriter]] = {
+    "csv": CsvCardWriter,
+    "tsv": TsvCardWriter,
+    "json": JsonCardWriter,
+    "jsonl": JsonlCardWriter,
+}
+
+
+def open_card_writer(
+    output: Path | str | TextIO, format: str = "csv", **kwargs
+) -> CardWriter:
+    """
+    Cria o escritor incremental de um formato de texto.
+
+    Args:
+        output: Caminho do arquivo ou stream de texto
+        format: "csv", "tsv", "json" ou "jsonl"
+        **kwargs: Opções do escritor (ex.: include_header, flush_every)
+
+    Returns:
+        Escritor ainda não aberto (use ``with`` ou ``open()``)
+
+    Raises:
+        ExportError: Se o formato não tiver escritor incremental
+    """
+    writer_cls = _WRITERS.get(format.lower())
+    if writer_cls is None:
+        raise ExportError(
+            f"Formato sem escrita incremental: {format}. Use {', '.join(_WRITERS)}."
+        )
+    return writer_cls(output, **kwargs)
+
+
+def _export_text(
+    writer: CardWriter, cards: list[AnkiCard], output_path: Path | str | None
+) -> str | Path:
+    """Grava ``cards`` com o escritor; sem ``output_path``, retorna o conteúdo."""
+    with writer:
+        writer.write_cards(cards)
+
+    if output_path is None:
+        logger.info("Exportados %d cards para %s (string)", writer.count, writer.format_name)
+        return writer.output.getvalue()
+    logger.info(
+        "Exportados %d cards para %s: %s", writer.count, writer.format_name, output_path
     )
+    return Path(output_path)
+
+
+# =============================================================================
+# CSV Export (DEFAULT)
+# =============================================================================
 
 
 def export_to_csv(
@@ -69,47 +481,9 @@ def export_to_csv(
     if not cards:
         raise ExportError("Lista de cards vazia para exportação CSV")
 
-    if not output_path:
-        output_path = None
-
-    output = StringIO()
-    writer = csv.writer(output, delimiter=";", quoting=csv.QUOTE_ALL)
-
-    if include_header:
-        writer.writerow(["front", "back", "tags", "type", "extra"])
-
-    for card in cards:
-        tags_str = _sanitize_text(" ".join(card.tags))
-        extra_str = (
-            _sanitize_text(json.dumps(card.extra, ensure_ascii=False))
-            if card.extra
-            else ""
-        )
-        writer.writerow(
-            [
-                _sanitize_text(card.front, separator_char=";"),
-                _sanitize_text(card.back, separator_char=";"),
-                tags_str,
-                card.card_type,
-                extra_str,
-            ]
-        )
-
-    csv_content = output.getvalue()
-
-    if output_path is None:
-        logger.info("Exportados %d cards para CSV (string)", len(cards))
-        return csv_content
-
-    output_path = Path(output_path) if output_path else Path("legal_anki_cards.csv")
-    try:
-        output_path.write_text(csv_content, encoding="utf-8")
-        logger.info("Exportados %d cards para CSV: %s", len(cards), output_path)
-    except Exception as e:
-        raise ExportError(
-            f"Erro ao escrever arquivo CSV para {output_path}: {e}"
-        ) from e
-    return output_path
+    output_path = output_path or None
+    writer = CsvCardWriter(output_path or StringIO(), include_header=include_header)
+    return _export_text(writer, cards, output_path)
 
 
 # =============================================================================
@@ -128,7 +502,7 @@ def export_to_tsv(
 
     Args:
         cards: Lista de cards a exportar
-        output_path: Caminho do arquivo de saída. Se None, usa um nome padrão.
+        output_path: Caminho do arquivo de saída. Se None, retorna string.
 
     Returns:
         Path do arquivo criado ou string com o conteúdo TSV
@@ -139,37 +513,8 @@ def export_to_tsv(
     if not cards:
         raise ExportError("Lista de cards vazia para exportação TSV")
 
-    if not output_path:
-        output_path = (
-            None  # Garantir que se for string vazia vire None para o check abaixo
-        )
-
-    lines = []
-
-    tab = "\t"
-    for card in cards:
-        tags_str = _sanitize_text(" ".join(card.tags))
-        # TSV simples: front\tback\ttags
-        front = _sanitize_text(card.front, separator_char=tab)
-        back = _sanitize_text(card.back, separator_char=tab)
-        line = f"{front}\t{back}\t{tags_str}"
-        lines.append(line)
-
-    tsv_content = "\n".join(lines)
-
-    if output_path is None:
-        logger.info("Exportados %d cards para TSV (string)", len(cards))
-        return tsv_content
-
-    output_path = Path(output_path)
-    try:
-        output_path.write_text(tsv_content, encoding="utf-8")
-        logger.info("Exportados %d cards para TSV: %s", len(cards), output_path)
-    except Exception as e:
-        raise ExportError(
-            f"Erro ao escrever arquivo TSV para {output_path}: {e}"
-        ) from e
-    return output_path
+    output_path = output_path or None
+    return _export_text(TsvCardWriter(output_path or StringIO()), cards, output_path)
 
 
 # =============================================================================
@@ -187,7 +532,7 @@ def export_to_json(
 
     Args:
         cards: Lista de cards a exportar
-        output_path: Caminho do arquivo de saída. Se None, usa um nome padrão.
+        output_path: Caminho do arquivo de saída. Se None, retorna string.
         include_metadata: Se True, inclui metadata (versão, modelo, timestamp)
 
     Returns:
@@ -199,36 +544,49 @@ def export_to_json(
     if not cards:
         raise ExportError("Lista de cards vazia para exportação JSON")
 
-    if not output_path:
-        output_path = None
+    output_path = output_path or None
+    writer = JsonCardWriter(output_path or StringIO(), include_metadata=include_metadata)
+    return _export_text(writer, cards, output_path)
 
-    data: dict = {}
 
-    if include_metadata:
-        data["metadata"] = {
-            "skill_version": settings.skill_version,
-            "model": settings.openai_model,
-            "generated_at": datetime.now().isoformat(),
-            "total_cards": len(cards),
-        }
+# =============================================================================
+# JSON Lines Export
+# =============================================================================
 
-    data["cards"] = [card.model_dump() for card in cards]
 
-    json_content = json.dumps(data, ensure_ascii=False, indent=2)
+def export_to_jsonl(
+    cards: list["AnkiCard"],
+    output_path: Path | str | None = None,
+    metadata: dict[str, Any] | None = None,
+    compression: Compression = "auto",
+) -> str | Path:
+    """
+    Exporta cards para JSON Lines (um card por linha, cabeçalho na primeira).
 
-    if output_path is None:
-        logger.info("Exportados %d cards para JSON (string)", len(cards))
-        return json_content
+    Formato para logs e reprocessamento: lido em streaming por
+    ``jsonl.iter_jsonl_cards``.
 
-    output_path = Path(output_path)
-    try:
-        output_path.write_text(json_content, encoding="utf-8")
-        logger.info("Exportados %d cards para JSON: %s", len(cards), output_path)
-    except Exception as e:
-        raise ExportError(
-            f"Erro ao escrever arquivo JSON para {output_path}: {e}"
-        ) from e
-    return output_path
+    Args:
+        cards: Lista de cards a exportar
+        output_path: Caminho do arquivo (.jsonl, .jsonl.gz, .jsonl.zst). Se
+                     None, retorna string.
+        metadata: Campos adicionais do cabeçalho
+        compression: "auto" (pela extensão), "gzip", "zstd" ou "none"
+
+    Returns:
+        Path do arquivo criado ou string com o conteúdo
+
+    Raises:
+        ExportError: Se a lista de cards estiver vazia
+    """
+    if not cards:
+        raise ExportError("Lista de cards vazia para exportação JSONL")
+
+    output_path = output_path or None
+    writer = JsonlCardWriter(
+        output_path or StringIO(), metadata=metadata, compression=compression
+    )
+    return _export_text(writer, cards, output_path)
 
 
 # =============================================================================
@@ -240,14 +598,19 @@ def export_to_apkg(
     cards: list["AnkiCard"],
     deck_name: str = "LegalAnki",
     output_path: Path | str | None = None,
+    compresslevel: int | None = None,
 ) -> Path:
     """
     Exporta cards para arquivo .apkg (Anki Package).
 
+    Usa o escritor em lote ``apkg.ApkgWriter`` (mesma coleção do genanki,
+    gravada com inserções em bloco).
+
     Args:
         cards: Lista de cards a exportar
         deck_name: Nome do deck no Anki
         output_path: Caminho do arquivo .apkg. Se None, usa um nome padrão.
+        compresslevel: Nível do deflate (0 a 9); None grava sem compressão
 
     Returns:
         Path do arquivo criado
@@ -260,25 +623,9 @@ def export_to_apkg(
 
     output_path = Path(output_path or "legal_anki_deck.apkg")
 
-    deck = genanki.Deck(
-        deck_id=settings.anki_deck_id,
-        name=deck_name,
-    )
-
-    for card in cards:
-        model = get_model_for_card_type(card.card_type)
-        fields = map_card_to_fields(card)
-
-        note = genanki.Note(
-            model=model,
-            fields=fields,
-            tags=card.tags,
-        )
-        deck.add_note(note)
-
-    package = genanki.Package(deck)
     try:
-        package.write_to_file(str(output_path))
+        with ApkgWriter(output_path, deck_name=deck_name, compresslevel=compresslevel) as writer:
+            writer.write_cards(cards)
         logger.info("Exportados %d cards para APKG: %s", len(cards), output_path)
     except Exception as e:
         raise ExportError(
@@ -290,43 +637,276 @@ def export_to_apkg(
 def export_to_apkg_base64(
     cards: list["AnkiCard"],
     deck_name: str,
+    compresslevel: int | None = None,
 ) -> str:
     """
-    Exporta cards para APKG em formato base64 usando BytesIO (sem tempfile).
+    Exporta cards para APKG em formato base64, sem gravar o pacote em disco.
 
-    Útil para APIs e bots que precisam transmitir o arquivo.
+    Útil para APIs e bots que precisam transmitir o arquivo. Para decks
+    grandes, ``iter_apkg_base64`` entrega o mesmo conteúdo em partes.
 
     Args:
         cards: Lista de cards a exportar
         deck_name: Nome do deck no Anki
+        compresslevel: Nível do deflate (0 a 9); None grava sem compressão
 
     Returns:
         String base64 do arquivo .apkg
     """
-    deck = genanki.Deck(
-        deck_id=settings.anki_deck_id,
-        name=deck_name,
-    )
+    return "".join(iter_apkg_base64(cards, deck_name, compresslevel=compresslevel))
 
-    for card in cards:
-        model = get_model_for_card_type(card.card_type)
-        fields = map_card_to_fields(card)
 
-        note = genanki.Note(
-            model=model,
-            fields=fields,
-            tags=card.tags,
-        )
-        deck.add_note(note)
+def iter_apkg_bytes(
+    cards: Iterable[AnkiCard],
+    deck_name: str = "LegalAnki",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compresslevel: int | None = None,
+) -> Iterator[bytes]:
+    """
+    Gera um .apkg em blocos de bytes, sem montar o pacote em memória.
+
+    A coleção é gravada (em disco temporário) no primeiro ``next``; depois o
+    zip é produzido e entregue aos poucos, adequado a respostas HTTP em
+    partes (chunked).
+
+    Args:
+        cards: Cards a exportar (lista ou iterável)
+        deck_name: Nome do deck no Anki
+        chunk_size: Tamanho aproximado de cada bloco, em bytes
+        compresslevel: Nível do deflate (0 a 9); None grava sem compressão
+
+    Yields:
+        Blocos do .apkg
+
+    Raises:
+        ExportError: Se a escrita falhar
+    """
+    writer = ApkgWriter(None, deck_name=deck_name, compresslevel=compresslevel).open()
+    try:
+        writer.write_cards(cards)
+        yield from writer.iter_package(chunk_size)
+    except ExportError:
+        raise
+    except Exception as e:
+        raise ExportError(f"Erro ao gerar pacote APKG: {e}") from e
+    finally:
+        writer.abort()
+
+
+def iter_apkg_base64(
+    cards: Iterable[AnkiCard],
+    deck_name: str = "LegalAnki",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    compresslevel: int | None = None,
+) -> Iterator[str]:
+    """
+    Como ``iter_apkg_bytes``, em base64: a concatenação das partes é o
+    base64 do pacote inteiro.
+
+    Yields:
+        Partes em base64 (cada uma codifica um múltiplo de 3 bytes, exceto
+        a última)
+    """
+    rest = b""
+    for chunk in iter_apkg_bytes(cards, deck_name, chunk_size, compresslevel):
+        data = rest + chunk if rest else chunk
+        cut = len(data) - len(data) % 3
+        rest = data[cut:]
+        if cut:
+            yield base64.b64encode(memoryview(data)[:cut]).decode("ascii")
+    if rest:
+        yield base64.b64encode(rest).decode("ascii")
+
+
+# =============================================================================
+# Multi-format Export
+# =============================================================================
+
+
+class _Interrupted(ExportError):
+    """Escritor descartado porque outra parte da exportação falhou."""
+
+
+def export_multi(
+    cards: Iterable[AnkiCard],
+    outputs: dict[str, Path | str],
+    deck_name: str = "LegalAnki",
+    threads: bool = False,
+    batch_size: int = 1000,
+) -> dict[str, Path]:
+    """
+    Exporta os mesmos cards para vários formatos numa única passada.
 
-    package = genanki.Package(deck)
+    Cada card é serializado uma vez (``SerializedCard`` com a união das
+    partes que os escritores usam) e entregue a todos os escritores, de modo
+    que ``cards`` pode ser um gerador percorrido uma só vez. Com
+    ``threads=True`` cada escritor roda na sua thread, recebendo os cards em
+    lotes de ``batch_size`` por uma fila limitada; a serialização fica na
+    thread principal e a gravação (arquivo, gzip, SQLite) dos formatos se
+    sobrepõe.
 
-    # Usa BytesIO ao invés de tempfile
-    buffer = BytesIO()
-    package.write_to_file(buffer)
-    buffer.seek(0)
+    Args:
+        cards: Cards a exportar (lista ou iterável)
+        outputs: Formato -> caminho (ex.: {"csv": "a.csv", "apkg": "a.apkg"})
+        deck_name: Nome do deck (apenas para APKG)
+        threads: Grava cada formato numa thread
+        batch_size: Cards serializados por lote entregue a cada escritor
+
+    Returns:
+        Formato -> Path do arquivo criado
+
+    Raises:
+        ExportError: Se não houver cards, um formato não for suportado ou a
+                     gravação falhar (erros levantados por ``cards`` passam
+                     sem alteração). Em qualquer falha, nenhum arquivo
+                     gravado pela chamada é mantido; os que ela não chegou a
+                     abrir ficam como estavam.
+    """
+    if not outputs:
+        raise ExportError("Nenhum formato informado para exportação")
+    if batch_size < 1:
+        raise ValueError("Parâmetro 'batch_size' deve ser maior que zero")
+    writers = {
+        fmt.lower(): _multi_writer(fmt.lower(), path, deck_name) for fmt, path in outputs.items()
+    }
+    cards = iter(cards)
+    first = next(cards, None)
+    if first is None:
+        raise ExportError("Lista de cards vazia para exportação")
+    parts = frozenset().union(*(writer.uses for writer in writers.values()))
+    items = (SerializedCard(card, parts) for card in chain((first,), cards))
+
+    finished: list[CardWriter | ApkgWriter] = []
+    try:
+        if threads:
+            count = _fan_out_threaded(items, list(writers.values()), batch_size, finished)
+        else:
+            count = _fan_out(items, list(writers.values()), batch_size, finished)
+    except BaseException:
+        # Cada escritor que falha já descarta o próprio arquivo; os que
+        # chegaram a fechar antes da falha de outro também saem, para não
+        # deixar um conjunto parcial que pareça completo. Arquivos que esta
+        # chamada não gravou (ex.: de uma execução anterior) ficam.
+        for writer in finished:
+            Path(writer.output).unlink(missing_ok=True)
+        raise
+    logger.info("Exportados %d cards para %s", count, ", ".join(writers))
+    return {fmt: Path(writer.output) for fmt, writer in writers.items()}
+
+
+def _multi_writer(fmt: str, path: Path | str, deck_name: str) -> CardWriter | ApkgWriter:
+    if fmt == "apkg":
+        return ApkgWriter(path, deck_name=deck_name)
+    return open_card_writer(path, fmt)
+
+
+def _fan_out(
+    items: Iterable[SerializedCard],
+    writers: list[CardWriter | ApkgWriter],
+    batch_size: int,
+    finished: list[CardWriter | ApkgWriter],
+) -> int:
+    """
+    Entrega os cards a todos os escritores, na thread atual.
 
-    return base64.b64encode(buffer.read()).decode("utf-8")
+    Um lote por escritor de cada vez, e não card a card: alternar entre
+    escritores a cada card é bem mais lento (cache de CPU). Os escritores
+    fechados com sucesso são acrescentados a ``finished``.
+    """
+    count = 0
+    with ExitStack() as stack:
+        for writer in writers:
+            stack.push(_record_finished(writer, finished))
+            stack.enter_context(writer)
+        for batch in batched(items, batch_size):
+            try:
+                for writer in writers:
+                    writer.write_serialized(batch)
+            except ExportError:
+                raise
+            except Exception as e:
+                raise ExportError(f"Erro na exportação: {e}") from e
+            count += len(batch)
+    return count
+
+
+def _record_finished(
+    writer: CardWriter | ApkgWriter, finished: list[CardWriter | ApkgWriter]
+) -> Callable[..., None]:
+    """Callback de ExitStack que registra ``writer`` se ele fechou sem erro."""
+
+    def record(exc_type: object, *exc: object) -> None:
+        if exc_type is None:
+            finished.append(writer)
+
+    return record
+
+
+def _fan_out_threaded(
+    items: Iterable[SerializedCard],
+    writers: list[CardWriter | ApkgWriter],
+    batch_size: int,
+    finished: list[CardWriter | ApkgWriter],
+) -> int:
+    """
+    Entrega os cards em lotes a uma thread por escritor; os escritores
+    fechados com sucesso são acrescentados a ``finished``.
+    """
+    queues = [Queue(maxsize=_MULTI_QUEUE_BATCHES) for _ in writers]
+    stop = Event()
+    count = 0
+    with ThreadPoolExecutor(max_workers=len(writers), thread_name_prefix="export") as pool:
+        futures = [
+            pool.submit(_consume, writer, queue, stop, finished)
+            for writer, queue in zip(writers, queues, strict=True)
+        ]
+        try:
+            for batch in batched(items, batch_size):
+                if stop.is_set():
+                    break
+                for queue in queues:
+                    queue.put(batch)
+                count += len(batch)
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            for queue in queues:
+                queue.put(None)
+        errors = [error for future in futures if (error := future.exception())]
+    if errors:
+        # O erro de origem, não o dos escritores interrompidos por causa dele
+        error = min(errors, key=lambda e: isinstance(e, _Interrupted))
+        if isinstance(error, ExportError):
+            raise error
+        raise ExportError(f"Erro na exportação: {error}") from error
+    return count
+
+
+def _consume(
+    writer: CardWriter | ApkgWriter,
+    queue: Queue,
+    stop: Event,
+    finished: list[CardWriter | ApkgWriter],
+) -> None:
+    """Grava os lotes da fila até o sentinela ``None``."""
+    drained = False
+    try:
+        with writer:
+            while (batch := queue.get()) is not None:
+                if not stop.is_set():
+                    writer.write_serialized(batch)
+            drained = True
+            if stop.is_set():
+                # Descarta (abort) em vez de fechar como completo
+                raise _Interrupted("Exportação interrompida")
+        finished.append(writer)
+    except BaseException:
+        stop.set()
+        # Esvazia a fila para não bloquear a thread principal no put()
+        while not drained and queue.get() is not None:
+            pass
+        raise
 
 
 # =============================================================================
@@ -339,21 +919,36 @@ def export_cards(
     output_path: Path | str,
     format: str = "csv",
     deck_name: str = "LegalAnki",
+    manifest: Path | str | None = None,
     **kwargs,
-) -> Path | str:
+) -> Path | str | None:
     """
     Função unificada de exportação.
 
+    Com ``manifest``, a exportação é incremental: só os cards novos ou
+    alterados desde o manifesto anterior vão para o arquivo, e o manifesto é
+    reescrito com o estado atual do deck (ver ``manifest``).
+
     Args:
         cards: Lista de cards a exportar
         output_path: Caminho do arquivo de saída
-        format: Formato de exportação ("csv", "tsv", "json", "apkg")
+        format: Formato de exportação ("csv", "tsv", "json", "jsonl", "apkg")
         deck_name: Nome do deck (apenas para APKG)
+        manifest: Manifesto da exportação anterior, atualizado ao final. Se
+                  não existir, todos os cards são exportados.
         **kwargs: Argumentos adicionais para o exportador específico
 
     Returns:
-        Path do arquivo criado
+        Path do arquivo criado, ou None se a exportação incremental não tiver
+        cards novos ou alterados (nenhum arquivo é gerado)
+
+    Raises:
+        ExportError: Se o formato não for suportado
+        ManifestError: Se o manifesto anterior for inválido
     """
+    if manifest is not None:
+        return _export_delta(cards, output_path, format, deck_name, manifest, **kwargs)
+
     format = format.lower()
 
     if format == "csv":
@@ -362,9 +957,36 @@ def export_cards(
         return export_to_tsv(cards, output_path)
     elif format == "json":
         return export_to_json(cards, output_path, **kwargs)
+    elif format == "jsonl":
+        return export_to_jsonl(cards, output_path, **kwargs)
     elif format == "apkg":
-        return export_to_apkg(cards, deck_name, output_path)
+        return export_to_apkg(cards, deck_name, output_path, **kwargs)
     else:
         raise ExportError(
-            f"Formato não suportado: {format}. Use csv, tsv, json ou apkg."
+            f"Formato não suportado: {format}. Use csv, tsv, json, jsonl ou apkg."
         )
+
+
+def _export_delta(
+    cards: list[AnkiCard],
+    output_path: Path | str,
+    format: str,
+    deck_name: str,
+    manifest_path: Path | str,
+    **kwargs,
+) -> Path | str | None:
+    """Exporta só os cards novos ou alterados e grava o manifesto atualizado."""
+    delta, entries = select_changed(cards, load_manifest(manifest_path))
+    updated = ExportManifest(format=format.lower(), deck_name=deck_name, cards=entries)
+
+    output = None
+    if delta:
+        output = export_cards(delta, output_path, format=format, deck_name=deck_name, **kwargs)
+        updated.delta_cards = len(delta)
+        updated.artifact = Path(output).name
+        updated.artifact_sha256 = file_sha256(output)
+    else:
+        logger.info("Nenhum card novo ou alterado desde %s; nada a exportar", manifest_path)
+    write_manifest(updated, manifest_path)
+    logger.info("Manifesto atualizado: %s", manifest_path)
+    return output
@@ -3,14 +3,24 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING
-
+import math
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, TypeVar
+
+from .card_index import format_covered_hints
+from .citations import extract_citations, fill_extra, format_citation_hints
+from .classifier import classify_chunk
 from .config import settings
 from .models import AnkiCard, CardResponse
+from .near_duplicates import KeepPolicy, deduplicate_near
 from .prompts.system import build_system_prompt
 from .utils import normalize_tags
 
 if TYPE_CHECKING:
+    from .card_index import CardIndex
     from .llm.protocol import LLMClient
 
 logger = logging.getLogger(__name__)
@@ -18,7 +28,10 @@ logger = logging.getLogger(__name__)
 # Limite conservador para texto por chamada ao LLM.
 # ~12 500 tokens para português (~4 chars/token), deixando margem para
 # system prompt (~3k tokens) e resposta (~4k tokens) dentro do context window.
-_MAX_CHUNK_CHARS = 50_000
+MAX_CHUNK_CHARS = 50_000
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 
 class CardGenerationError(Exception):
@@ -35,12 +48,21 @@ def generate_cards(
     card_type: str = "auto",
     max_cards: int = 10,
     llm_client: "LLMClient | None" = None,
+    route_by_type: bool = True,
+    use_citations: bool = True,
+    max_cards_per_call: int | None = None,
+    max_workers: int = 4,
+    near_duplicate_threshold: float | None = None,
+    near_duplicate_policy: KeepPolicy = "keep_first",
+    card_index: "CardIndex | None" = None,
+    covered_hints: bool = False,
 ) -> list[AnkiCard]:
     """
     Gera cards Anki a partir de um texto jurídico.
 
     Textos longos são automaticamente divididos em chunks e processados
-    separadamente, com deduplicação ao final.
+    separadamente (em paralelo, até ``max_workers`` chamadas simultâneas),
+    com deduplicação ao final.
 
     Args:
         text: Texto fonte (artigo, súmula, questão, etc.)
@@ -50,6 +72,26 @@ def generate_cards(
         card_type: Tipo de card a gerar ("auto" para deixar o LLM decidir)
         max_cards: Número máximo de cards a gerar (1-100)
         llm_client: Cliente LLM opcional. Se None, usa OpenAI padrão com retry.
+        route_by_type: Se True e card_type for "auto", cada chunk é pré-classificado
+                       localmente e enviado com um prompt específico do tipo
+                       detectado (ver ``classifier.classify_chunk``).
+        use_citations: Se True, citações extraídas localmente de cada chunk
+                       (tribunal, processo, súmula, banca/ano/cargo) são
+                       enviadas como dicas e usadas para completar ``extra``.
+        max_cards_per_call: Se informado, chunks que pedem mais cards que esse
+                            limite são divididos em sub-requisições paralelas,
+                            cada uma focada em uma faixa disjunta do chunk
+                            (ex: grupos de artigos). None desativa o fan-out.
+        max_workers: Número máximo de chamadas simultâneas ao LLM
+        near_duplicate_threshold: Se informado, remove também cards quase
+                                  duplicados (similaridade dos fronts a partir
+                                  desse valor; ver ``near_duplicates``)
+        near_duplicate_policy: Card mantido de cada grupo de quase duplicatas
+                               ("keep_first" ou "keep_best")
+        card_index: Índice persistente de cards já exportados; cards que já
+                    estão nele são descartados (ver ``card_index``)
+        covered_hints: Se True (e houver ``card_index``), os fronts já
+                       existentes do tópico são enviados ao LLM como dica
 
     Returns:
         Lista de AnkiCard gerados
@@ -65,57 +107,343 @@ def generate_cards(
         raise ValueError("Parâmetro 'topic' não pode ser vazio")
     if max_cards < 1 or max_cards > 100:
         raise ValueError("Parâmetro 'max_cards' deve estar entre 1 e 100")
+    if max_cards_per_call is not None and max_cards_per_call < 1:
+        raise ValueError("Parâmetro 'max_cards_per_call' deve ser maior que zero")
+    if max_workers < 1:
+        raise ValueError("Parâmetro 'max_workers' deve ser maior que zero")
+    if near_duplicate_threshold is not None and not 0 < near_duplicate_threshold <= 1:
+        raise ValueError("Parâmetro 'near_duplicate_threshold' deve estar entre 0 e 1")
 
     text = text.strip()
     topic = topic.strip()
 
-    if llm_client is None:
-        if not settings.openai_api_key:
-            raise CardGenerationError(
-                "OPENAI_API_KEY não configurada. Configure em .env ou variável de ambiente."
-            )
+    llm_client = resolve_llm_client(llm_client)
+
+    logger.info("Gerando cards para tópico '%s'", topic)
+
+    chunks = chunk_text(text)
+    chunk_types = [_route_chunk(c, card_type, route_by_type) for c in chunks]
+
+    if len(chunks) > 1:
+        logger.info("Texto dividido em %d partes para processamento", len(chunks))
+
+    requests: list[tuple[str, str, int]] = []
+    cards_per_chunk = max(1, max_cards // len(chunks))
+    remainder = max_cards % len(chunks)
+    for i, (chunk, chunk_type) in enumerate(zip(chunks, chunk_types)):
+        n = cards_per_chunk + (1 if i < remainder else 0)
+        requests.extend(_fan_out(chunk, chunk_type, n, max_cards_per_call))
+
+    if len(requests) > len(chunks):
+        logger.info("Requisições divididas em %d sub-requisições", len(requests))
+
+    covered = ""
+    if card_index is not None and covered_hints:
+        covered = format_covered_hints(card_index.covered_fronts(_topic_tag(topic)))
+
+    def run(request: tuple[str, str, int]) -> list[AnkiCard]:
+        req_text, req_type, n = request
+        return _call_llm(
+            llm_client,
+            _system_prompt(include_legal_basis, difficulty, req_type),
+            req_text,
+            topic,
+            req_type,
+            n,
+            use_citations,
+            covered,
+        )
+
+    if len(requests) == 1 or max_workers == 1:
+        results = [run(request) for request in requests]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(requests))) as pool:
+            results = list(pool.map(run, requests))
+
+    raw_cards = [card for result in results for card in result]
+
+    if not raw_cards:
+        raise CardGenerationError("LLM não retornou nenhum card")
+
+    cards = postprocess_cards(raw_cards, topic, difficulty)
+    cards = deduplicate_cards(cards)
+    if near_duplicate_threshold is not None:
+        cards = deduplicate_near(
+            cards, threshold=near_duplicate_threshold, policy=near_duplicate_policy
+        )
+    if card_index is not None:
+        cards = card_index.filter_new(cards)
+
+    logger.info("Gerados %d cards com sucesso", len(cards))
+    return cards[:max_cards]
+
+
+def generate_cards_iter(
+    segments: Iterable[str],
+    topic: str,
+    difficulty: str = "medio",
+    include_legal_basis: bool = True,
+    card_type: str = "auto",
+    cards_per_chunk: int = 5,
+    max_cards: int | None = None,
+    llm_client: "LLMClient | None" = None,
+    route_by_type: bool = True,
+    use_citations: bool = True,
+    max_workers: int = 4,
+) -> Iterator[AnkiCard]:
+    """
+    Gera cards de forma incremental a partir de um fluxo de segmentos de texto.
+
+    Variante de ``generate_cards`` para documentos grandes (ex: códigos
+    consolidados com milhares de páginas): os segmentos (ver
+    ``parsers.iter_file``) são agrupados em chunks sob demanda e no máximo
+    ``max_workers`` chunks ficam em memória/processamento ao mesmo tempo.
+    Como o número de chunks não é conhecido de antemão, a quantidade de cards
+    é definida por chunk, e não distribuída a partir de um total.
+
+    Args:
+        segments: Iterável de trechos de texto (páginas, parágrafos)
+        topic: Tópico principal dos cards
+        difficulty: Nível de dificuldade ("facil", "medio", "dificil")
+        include_legal_basis: Se True, instrui o LLM a sempre incluir fundamento legal
+        card_type: Tipo de card a gerar ("auto" para deixar o LLM decidir)
+        cards_per_chunk: Número máximo de cards por chunk (1-100)
+        max_cards: Limite total opcional; a geração para ao atingi-lo
+        llm_client: Cliente LLM opcional. Se None, usa OpenAI padrão com retry.
+        route_by_type: Se True, pré-classifica cada chunk (ver ``generate_cards``)
+        use_citations: Se True, usa citações extraídas como dicas (ver ``generate_cards``)
+        max_workers: Número máximo de chunks processados simultaneamente
+
+    Yields:
+        AnkiCard pós-processados, sem fronts repetidos, na ordem dos chunks
 
-        from .llm.openai_client import OpenAILLMClient
+    Raises:
+        ValueError: Se os parâmetros de entrada forem inválidos
+        CardGenerationError: Se não houver cliente LLM configurado
+    """
+    if not topic or not topic.strip():
+        raise ValueError("Parâmetro 'topic' não pode ser vazio")
+    if cards_per_chunk < 1 or cards_per_chunk > 100:
+        raise ValueError("Parâmetro 'cards_per_chunk' deve estar entre 1 e 100")
+    if max_cards is not None and max_cards < 1:
+        raise ValueError("Parâmetro 'max_cards' deve ser maior que zero")
+    if max_workers < 1:
+        raise ValueError("Parâmetro 'max_workers' deve ser maior que zero")
 
-        llm_client = OpenAILLMClient(
-            api_key=settings.openai_api_key,
-            model=settings.openai_model,
+    topic = topic.strip()
+    llm_client = resolve_llm_client(llm_client)
+
+    def run(chunk: str) -> list[AnkiCard]:
+        return generate_chunk(
+            llm_client,
+            chunk,
+            topic,
+            difficulty,
+            include_legal_basis,
+            card_type,
+            route_by_type,
+            cards_per_chunk,
+            use_citations,
         )
 
-    system_prompt = build_system_prompt(
+    chunks = (c for c in _iter_chunks(segments) if c.strip())
+    seen: set[str] = set()
+    emitted = 0
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for cards in ordered_results(pool, run, chunks, window=max_workers):
+            for card in cards:
+                key = card.front.strip().lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield card
+                emitted += 1
+                if max_cards is not None and emitted >= max_cards:
+                    logger.info("Limite de %d cards atingido", max_cards)
+                    return
+    finally:
+        # Chunks ainda não iniciados são descartados ao atingir o limite
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    logger.info("Gerados %d cards em modo streaming", emitted)
+
+
+def generate_chunk(
+    llm_client: "LLMClient",
+    chunk: str,
+    topic: str,
+    difficulty: str,
+    include_legal_basis: bool,
+    card_type: str,
+    route_by_type: bool,
+    max_cards: int,
+    use_citations: bool,
+) -> list[AnkiCard]:
+    """
+    Roteia, gera e pós-processa os cards de um único chunk.
+
+    Args:
+        llm_client: Cliente LLM já resolvido (ver ``resolve_llm_client``)
+        chunk: Texto do chunk
+        topic: Tópico principal dos cards
+        difficulty: Nível de dificuldade
+        include_legal_basis: Se True, instrui o LLM a sempre incluir fundamento legal
+        card_type: Tipo de card ("auto" para pré-classificar ou deixar o LLM decidir)
+        route_by_type: Se True, pré-classifica o chunk (ver ``generate_cards``)
+        max_cards: Número máximo de cards do chunk
+        use_citations: Se True, usa citações extraídas como dicas
+
+    Returns:
+        Cards pós-processados (ver ``postprocess_cards``); lista vazia se o LLM falhar
+    """
+    chunk_type = _route_chunk(chunk, card_type, route_by_type)
+    raw = _call_llm(
+        llm_client,
+        _system_prompt(include_legal_basis, difficulty, chunk_type),
+        chunk,
+        topic,
+        chunk_type,
+        max_cards,
+        use_citations,
+    )
+    return postprocess_cards(raw, topic, difficulty)
+
+
+def ordered_results(
+    pool: ThreadPoolExecutor,
+    fn: Callable[[_T], _R],
+    items: Iterable[_T],
+    window: int,
+) -> Iterator[_R]:
+    """
+    Executa ``fn`` no pool com até ``window`` itens em voo, em ordem.
+
+    Args:
+        pool: Pool onde as chamadas são submetidas
+        fn: Função aplicada a cada item
+        items: Itens de entrada, consumidos sob demanda
+        window: Número máximo de chamadas pendentes
+
+    Yields:
+        Resultados de ``fn``, na ordem dos itens
+    """
+    pending: deque[Future[_R]] = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+@lru_cache(maxsize=None)
+def _system_prompt(include_legal_basis: bool, difficulty: str, card_type: str) -> str:
+    """System prompt por combinação de parâmetros (cacheado, seguro entre threads)."""
+    return build_system_prompt(
         include_legal_basis=include_legal_basis,
         difficulty=difficulty,
+        card_type=card_type,
     )
 
-    logger.info("Gerando cards para tópico '%s'", topic)
 
-    chunks = _chunk_text(text)
+def resolve_llm_client(llm_client: "LLMClient | None") -> "LLMClient":
+    """
+    Retorna o cliente informado ou cria o cliente OpenAI padrão.
+
+    Args:
+        llm_client: Cliente LLM opcional
+
+    Returns:
+        O próprio ``llm_client`` ou um ``OpenAILLMClient`` configurado
+
+    Raises:
+        CardGenerationError: Se não houver cliente e OPENAI_API_KEY não estiver configurada
+    """
+    if llm_client is not None:
+        return llm_client
 
-    if len(chunks) == 1:
-        raw_cards = _call_llm(
-            llm_client, system_prompt, chunks[0], topic, card_type, max_cards
+    if not settings.openai_api_key:
+        raise CardGenerationError(
+            "OPENAI_API_KEY não configurada. Configure em .env ou variável de ambiente."
         )
-    else:
-        logger.info("Texto dividido em %d partes para processamento", len(chunks))
-        raw_cards = []
-        cards_per_chunk = max(1, max_cards // len(chunks))
-        remainder = max_cards % len(chunks)
 
-        for i, chunk in enumerate(chunks):
-            n = cards_per_chunk + (1 if i < remainder else 0)
-            chunk_cards = _call_llm(
-                llm_client, system_prompt, chunk, topic, card_type, n
-            )
-            raw_cards.extend(chunk_cards)
+    from .llm.openai_client import OpenAILLMClient
 
-    if not raw_cards:
-        raise CardGenerationError("LLM não retornou nenhum card")
+    return OpenAILLMClient(
+        api_key=settings.openai_api_key,
+        model=settings.openai_model,
+    )
 
-    cards = _postprocess_cards(raw_cards, topic, difficulty)
-    cards = _deduplicate_cards(cards)
 
-    logger.info("Gerados %d cards com sucesso", len(cards))
-    return cards[:max_cards]
+def _topic_tag(topic: str) -> str | None:
+    """Tag do tópico, ou None se ele não tiver nada aproveitável como tag (ex.: "!!!")."""
+    tags = normalize_tags([topic])
+    return tags[0] if tags else None
+
+
+def _route_chunk(chunk: str, card_type: str, route_by_type: bool) -> str:
+    """Define o tipo de card de um chunk, pré-classificando-o se necessário."""
+    if card_type != "auto" or not route_by_type:
+        return card_type
+
+    detected = classify_chunk(chunk)
+    if detected is None:
+        return "auto"
+
+    logger.debug("Chunk pré-classificado como '%s'", detected)
+    return detected.value
+
+
+def _fan_out(
+    chunk: str, chunk_type: str, n: int, max_cards_per_call: int | None
+) -> list[tuple[str, str, int]]:
+    """
+    Divide o pedido de ``n`` cards de um chunk em sub-requisições menores.
+
+    Cada sub-requisição recebe uma faixa contígua e disjunta do chunk, de modo
+    que os cards gerados em paralelo tratem de dispositivos diferentes.
+
+    Returns:
+        Lista de (texto, tipo de card, número de cards)
+    """
+    if max_cards_per_call is None or n <= max_cards_per_call:
+        return [(chunk, chunk_type, n)]
+
+    parts = _split_into_parts(chunk, math.ceil(n / max_cards_per_call))
+    per_part, remainder = divmod(n, len(parts))
+    return [
+        (part, chunk_type, per_part + (1 if i < remainder else 0))
+        for i, part in enumerate(parts)
+    ]
+
+
+# Separadores tentados, do mais grosso ao mais fino, ao dividir um chunk
+_PART_SEPARATORS = ("\n\n", "\n", ". ")
+
+
+def _split_into_parts(text: str, parts: int) -> list[str]:
+    """
+    Divide um texto em até ``parts`` faixas contíguas de tamanho semelhante.
+
+    Usa parágrafos quando há parágrafos suficientes; caso contrário, linhas
+    e, por fim, frases. Textos curtos demais resultam em menos faixas.
+    """
+    for sep in _PART_SEPARATORS:
+        units = [u for u in text.split(sep) if u.strip()]
+        if len(units) >= parts:
+            break
+
+    parts = max(1, min(parts, len(units)))
+    total = sum(len(u) for u in units) or 1
+    groups: list[list[str]] = [[] for _ in range(parts)]
+    offset = 0
+    for unit in units:
+        groups[min(parts - 1, offset * parts // total)].append(unit)
+        offset += len(unit)
+
+    return [sep.join(group) for group in groups if group]
 
 
 def _call_llm(
@@ -125,9 +453,15 @@ def _call_llm(
     topic: str,
     card_type: str,
     max_cards: int,
+    use_citations: bool = False,
+    extra_hints: str = "",
 ) -> list[AnkiCard]:
     """Chama o LLM para um trecho de texto e retorna os cards crus."""
-    user_message = _build_user_message(text, topic, card_type, max_cards)
+    citations = extract_citations(text) if use_citations else None
+    hints = format_citation_hints(citations) if citations else ""
+    if extra_hints:
+        hints = f"{hints}\n\n{extra_hints}" if hints else extra_hints
+    user_message = _build_user_message(text, topic, card_type, max_cards, hints)
 
     try:
         result = llm_client.generate_structured(
@@ -137,17 +471,24 @@ def _call_llm(
         )
         if not result or not result.cards:
             return []
-        return result.cards
     except Exception as e:
         logger.warning("Erro ao processar chunk: %s", e)
         return []
 
+    if citations is None:
+        return result.cards
+    return [fill_extra(card, citations) for card in result.cards]
+
 
-def _build_user_message(text: str, topic: str, card_type: str, max_cards: int) -> str:
+def _build_user_message(
+    text: str, topic: str, card_type: str, max_cards: int, hints: str = ""
+) -> str:
     """Constrói a mensagem do usuário para o LLM."""
     type_instruction = ""
     if card_type != "auto":
         type_instruction = f"\n\nGere apenas cards do tipo '{card_type}'."
+    if hints:
+        hints = f"\n\n{hints}"
 
     return f"""Gere até {max_cards} flashcards Anki sobre o seguinte conteúdo:
 
@@ -156,13 +497,13 @@ def _build_user_message(text: str, topic: str, card_type: str, max_cards: int) -
 ---
 {text}
 ---
-
+{hints}
 {type_instruction}
 
 Retorne os cards em formato JSON conforme especificado."""
 
 
-def _chunk_text(text: str, max_chars: int = _MAX_CHUNK_CHARS) -> list[str]:
+def chunk_text(text: str, max_chars: int = MAX_CHUNK_CHARS) -> list[str]:
     """
     Divide texto longo em chunks menores respeitando limites de parágrafos.
 
@@ -173,33 +514,56 @@ def _chunk_text(text: str, max_chars: int = _MAX_CHUNK_CHARS) -> list[str]:
     Returns:
         Lista de chunks (pelo menos 1)
     """
-    if len(text) <= max_chars:
-        return [text]
+    return list(_iter_chunks([text], max_chars)) or [text]
+
+
+def _iter_chunks(
+    segments: Iterable[str], max_chars: int = MAX_CHUNK_CHARS
+) -> Iterator[str]:
+    """
+    Agrupa segmentos de texto (páginas, parágrafos) em chunks, sob demanda.
+
+    Consome o iterador de forma incremental: apenas o chunk em construção é
+    mantido em memória. Parágrafos (separados por ``\\n\\n``) nunca são
+    quebrados; um parágrafo maior que ``max_chars`` forma um chunk próprio.
+
+    Args:
+        segments: Iterável de trechos de texto, na ordem do documento
+        max_chars: Tamanho máximo de cada chunk em caracteres
 
-    paragraphs = text.split("\n\n")
-    chunks: list[str] = []
+    Yields:
+        Chunks de texto com parágrafos unidos por ``\\n\\n``
+    """
     current_parts: list[str] = []
     current_len = 0
 
-    for para in paragraphs:
-        para_len = len(para) + 2  # +2 para o \n\n separador
+    for segment in segments:
+        for para in segment.split("\n\n"):
+            sep_len = 2 if current_parts else 0  # \n\n separador
 
-        if current_len + para_len > max_chars and current_parts:
-            chunks.append("\n\n".join(current_parts))
-            current_parts = []
-            current_len = 0
+            if current_parts and current_len + sep_len + len(para) > max_chars:
+                yield "\n\n".join(current_parts)
+                current_parts = []
+                current_len = 0
+                sep_len = 0
 
-        current_parts.append(para)
-        current_len += para_len
+            current_parts.append(para)
+            current_len += sep_len + len(para)
 
     if current_parts:
-        chunks.append("\n\n".join(current_parts))
+        yield "\n\n".join(current_parts)
 
-    return chunks
 
+def deduplicate_cards(cards: list[AnkiCard]) -> list[AnkiCard]:
+    """
+    Remove cards com front idêntico (case-insensitive), mantendo o primeiro.
 
-def _deduplicate_cards(cards: list[AnkiCard]) -> list[AnkiCard]:
-    """Remove cards com front idêntico (case-insensitive), mantendo o primeiro."""
+    Args:
+        cards: Cards na ordem de geração
+
+    Returns:
+        Cards sem fronts repetidos, na ordem original
+    """
     seen: set[str] = set()
     unique: list[AnkiCard] = []
 
@@ -212,7 +576,7 @@ def _deduplicate_cards(cards: list[AnkiCard]) -> list[AnkiCard]:
     return unique
 
 
-def _postprocess_cards(
+def postprocess_cards(
     cards: list[AnkiCard], topic: str, difficulty: str
 ) -> list[AnkiCard]:
     """
@@ -221,15 +585,23 @@ def _postprocess_cards(
     - Normaliza tags
     - Adiciona tag de tópico e dificuldade
     - Limpa espaços extras
+
+    Args:
+        cards: Cards crus (do LLM ou de um gerador local)
+        topic: Tópico principal, adicionado como tag
+        difficulty: Nível de dificuldade, adicionado como ``dificuldade::<nível>``
+
+    Returns:
+        Novos cards com tags normalizadas e textos sem espaços extras
     """
     processed = []
+    topic_tag = _topic_tag(topic) if topic else None
 
     for card in cards:
         # Normaliza tags existentes
         tags = normalize_tags(card.tags)
 
         # Adiciona tag de tópico se não existir
-        topic_tag = normalize_tags([topic])[0] if topic else None
         if topic_tag and topic_tag not in tags:
             tags.insert(0, topic_tag)
 
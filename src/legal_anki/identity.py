@@ -0,0 +1,93 @@
+"""Identidade estável de cards, GUIDs de notas e IDs de deck/modelo.
+
+Para o Anki, uma nota importada é a mesma de antes quando tem o mesmo GUID,
+e um note type/deck é o mesmo quando tem o mesmo ID. O GUID padrão do
+genanki é o hash de todos os campos (editar o verso cria uma nota nova) e os
+IDs eram sorteados por processo. Aqui o GUID vem da identidade do card
+(origem + tipo + front normalizado) e os IDs vêm do nome, de modo que um
+pacote regenerado é mesclado pelo Anki nas notas existentes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from genanki.util import BASE91_TABLE
+
+from .config import settings, stable_anki_id
+from .minhash import normalize_text
+
+if TYPE_CHECKING:
+    from .models import AnkiCard
+
+# Chave de ``extra`` com a localização de origem do card (ex.: "cf88.pdf")
+SOURCE_KEY = "origem"
+
+_BASE91_SQUARED = 91 * 91
+_BASE91_PAIRS = [a + b for a in BASE91_TABLE for b in BASE91_TABLE]
+
+
+def deck_id_for(deck_name: str) -> int:
+    """ID do deck: ANKI_DECK_ID, se configurado, ou derivado do nome."""
+    if settings.anki_deck_id is not None:
+        return settings.anki_deck_id
+    return stable_anki_id(f"deck:{deck_name}")
+
+
+def card_source(card: AnkiCard) -> str:
+    """Localização de origem registrada no card ("" se não houver)."""
+    return str((card.extra or {}).get(SOURCE_KEY, ""))
+
+
+def with_source(card: AnkiCard, source: str) -> AnkiCard:
+    """
+    Registra a origem no ``extra`` do card, se ele ainda não tiver uma.
+
+    Args:
+        card: Card gerado
+        source: Localização de origem (ex.: nome do arquivo)
+
+    Returns:
+        O próprio card, se já tinha origem, ou uma cópia com a origem
+    """
+    if card_source(card) or not source:
+        return card
+    return card.model_copy(update={"extra": {**(card.extra or {}), SOURCE_KEY: source}})
+
+
+def card_identity(card: AnkiCard) -> str:
+    """
+    Identidade estável de um card: origem, tipo e front normalizado.
+
+    Não depende do verso nem dos campos extras, que mudam em revisões;
+    também ignora caixa, acentos e pontuação do front.
+
+    Args:
+        card: Card
+
+    Returns:
+        String que identifica o card entre gerações
+    """
+    return "\x1f".join((card_source(card), card.card_type, normalize_text(card.front)))
+
+
+def card_guid(card: AnkiCard) -> str:
+    """
+    GUID da nota do card, derivado de ``card_identity``.
+
+    Mesmo formato do genanki (8 bytes de SHA-256 em base 91).
+    """
+    digest = hashlib.sha256(card_identity(card).encode()).digest()
+    return _base91(int.from_bytes(digest[:8], "big"))
+
+
+def _base91(value: int) -> str:
+    """Base 91 do Anki, dois dígitos por divisão."""
+    digits = []
+    while value >= _BASE91_SQUARED:
+        value, pair = divmod(value, _BASE91_SQUARED)
+        digits.append(_BASE91_PAIRS[pair])
+    if value:
+        digits.append(_BASE91_PAIRS[value] if value >= 91 else BASE91_TABLE[value])
+    return "".join(reversed(digits))
@@ -0,0 +1,308 @@
+"""Formato JSON Lines de cards: leitura em streaming para reprocessamento.
+
+O JSON de ``export_to_json`` é um documento único que precisa ser carregado
+inteiro para ser lido de volta. No formato JSON Lines cada linha é um card
+(``AnkiCard`` serializado) e a primeira linha é um cabeçalho com metadata:
+versão do skill, modelo do LLM, versão dos prompts e o que mais o chamador
+informar. A leitura é feita linha a linha, cada card é validado pelo
+pydantic, e a posição (em bytes, no conteúdo descomprimido) de cada card
+pode ser guardada para retomar a leitura daquele ponto.
+
+Arquivos podem ser comprimidos com gzip (stdlib) ou zstd (pacote opcional
+``zstandard``, extra ``zstd``, ou ``compression.zstd`` do Python 3.14+).
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Literal, Self
+
+from pydantic import ValidationError
+
+from .config import settings
+from .models import AnkiCard
+from .prompts.system import prompt_version
+
+logger = logging.getLogger(__name__)
+
+Compression = Literal["auto", "gzip", "zstd", "none"]
+
+JSONL_FORMAT = "legal_anki.cards"
+JSONL_VERSION = 1
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_SKIP_CHUNK = 1 << 20
+_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+
+class JsonlFormatError(Exception):
+    """Linha inválida ou cabeçalho incompatível num arquivo JSON Lines."""
+
+    pass
+
+
+def build_header(**metadata: Any) -> dict[str, Any]:
+    """
+    Cabeçalho de um arquivo JSON Lines de cards.
+
+    Args:
+        **metadata: Campos adicionais (ex.: topic, source)
+
+    Returns:
+        Dicionário com formato, versões e data de geração
+    """
+    return {
+        "format": JSONL_FORMAT,
+        "version": JSONL_VERSION,
+        "skill_version": settings.skill_version,
+        "model": settings.openai_model,
+        "prompt_version": prompt_version(),
+        "generated_at": datetime.now().isoformat(),
+        **metadata,
+    }
+
+
+def open_compressed(
+    path: Path | str, mode: Literal["rb", "wb"], compression: Compression = "auto"
+) -> IO[bytes]:
+    """
+    Abre um arquivo binário, comprimido ou não.
+
+    Args:
+        path: Caminho do arquivo
+        mode: "rb" ou "wb"
+        compression: "auto" detecta pelo conteúdo (leitura) ou pela extensão
+                     (.gz, .zst) na escrita
+
+    Returns:
+        Arquivo binário com o conteúdo descomprimido
+
+    Raises:
+        JsonlFormatError: Se zstd for pedido sem suporte instalado
+    """
+    path = Path(path)
+    if compression == "auto":
+        compression = _detect_compression(path, mode)
+    if compression == "gzip":
+        return gzip.open(path, mode)
+    if compression == "zstd":
+        return _zstd_open(path, mode)
+    return open(path, mode)
+
+
+def open_text_writer(path: Path | str, compression: Compression = "auto") -> io.TextIOWrapper:
+    """Abre um arquivo JSON Lines para escrita de texto UTF-8, comprimido ou não."""
+    return io.TextIOWrapper(
+        open_compressed(path, "wb", compression), encoding="utf-8", newline=""
+    )
+
+
+class JsonlCardReader:
+    """
+    Leitor em streaming de cards em JSON Lines.
+
+    Uso::
+
+        with JsonlCardReader("cards.jsonl.gz") as reader:
+            print(reader.header["prompt_version"])
+            for offset, card in reader.iter_with_offsets():
+                ...
+
+    ``offset`` é a posição da linha do card no conteúdo descomprimido; passar
+    esse valor a ``iter_with_offsets(offset)`` retoma a leitura naquele card.
+    Arquivos sem compressão usam ``seek``; nos comprimidos, cujos
+    descompressores não voltam atrás (zstandard), o arquivo é reaberto e
+    descomprimido até a posição.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        compression: Compression = "auto",
+        skip_invalid: bool = False,
+    ):
+        """
+        Args:
+            path: Arquivo .jsonl (opcionalmente .gz/.zst)
+            compression: Ver ``open_compressed``
+            skip_invalid: Se True, linhas inválidas são registradas no log e
+                          puladas; se False, levantam JsonlFormatError
+        """
+        self.path = Path(path)
+        self.compression = compression
+        self.skip_invalid = skip_invalid
+        self.header: dict[str, Any] = {}
+        self.skipped = 0
+        self._file: IO[bytes] | None = None
+        self._codec: Compression = "none"
+        self._position = 0
+        self._data_start = 0
+
+    def __enter__(self) -> Self:
+        return self.open()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[AnkiCard]:
+        for _, card in self.iter_with_offsets():
+            yield card
+
+    def open(self) -> Self:
+        """
+        Abre o arquivo e lê o cabeçalho (arquivos sem cabeçalho são aceitos).
+
+        Raises:
+            JsonlFormatError: Se o cabeçalho for de versão não suportada
+        """
+        if self._file is not None:
+            return self
+        self._codec = self.compression
+        if self._codec == "auto":
+            self._codec = _detect_compression(self.path, "rb")
+        self._file = open_compressed(self.path, "rb", self._codec)
+        first = self._file.readline()
+        self._position = len(first)
+        header = _parse_header(first)
+        if header is None:
+            self._data_start = 0
+        else:
+            if header.get("version", 0) > JSONL_VERSION:
+                self.close()
+                raise JsonlFormatError(
+                    f"{self.path}: versão {header['version']} não suportada "
+                    f"(máximo {JSONL_VERSION})"
+                )
+            self.header = header
+            self._data_start = len(first)
+        return self
+
+    def close(self) -> None:
+        """Fecha o arquivo."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def iter_with_offsets(self, offset: int | None = None) -> Iterator[tuple[int, AnkiCard]]:
+        """
+        Percorre os cards a partir do início ou de uma posição.
+
+        Args:
+            offset: Posição (em bytes) de uma linha de card, obtida numa
+                    leitura anterior. None começa do primeiro card.
+
+        Yields:
+            Pares (posição da linha, card validado)
+
+        Raises:
+            JsonlFormatError: Se uma linha for inválida e ``skip_invalid`` for False
+        """
+        self.open()
+        position = self._data_start if offset is None else offset
+        self._move_to(position)
+        for line in self._file:
+            start = position
+            position += len(line)
+            self._position = position
+            if not line.strip():
+                continue
+            try:
+                card = AnkiCard.model_validate_json(line)
+            except ValidationError as e:
+                if not self.skip_invalid:
+                    raise JsonlFormatError(
+                        f"{self.path}: card inválido na posição {start}: {e}"
+                    ) from e
+                self.skipped += 1
+                logger.warning("Card inválido ignorado em %s (posição %d)", self.path, start)
+                continue
+            yield start, card
+
+    def _move_to(self, position: int) -> None:
+        """Posiciona a leitura em ``position`` (bytes do conteúdo descomprimido)."""
+        if self._codec == "none":
+            self._file.seek(position)
+            self._position = position
+            return
+        if position < self._position:
+            self._file.close()
+            self._file = open_compressed(self.path, "rb", self._codec)
+            self._position = 0
+        while self._position < position:
+            chunk = self._file.read(min(position - self._position, _SKIP_CHUNK))
+            if not chunk:
+                break
+            self._position += len(chunk)
+
+
+def iter_jsonl_cards(
+    path: Path | str,
+    offset: int | None = None,
+    compression: Compression = "auto",
+    skip_invalid: bool = False,
+) -> Iterator[AnkiCard]:
+    """
+    Atalho para ler os cards de um arquivo JSON Lines.
+
+    Args:
+        path: Arquivo .jsonl (opcionalmente .gz/.zst)
+        offset: Posição de um card para retomar a leitura
+        compression: Ver ``open_compressed``
+        skip_invalid: Pula linhas inválidas em vez de levantar erro
+
+    Yields:
+        Cards validados
+    """
+    with JsonlCardReader(path, compression, skip_invalid) as reader:
+        for _, card in reader.iter_with_offsets(offset):
+            yield card
+
+
+def _parse_header(line: bytes) -> dict[str, Any] | None:
+    """Cabeçalho da primeira linha, ou None se ela já for um card."""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(data, dict) and data.get("format") == JSONL_FORMAT:
+        return data
+    return None
+
+
+def _detect_compression(path: Path, mode: str) -> Compression:
+    if "w" in mode:
+        return _SUFFIXES.get(path.suffix.lower(), "none")
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if magic == _ZSTD_MAGIC:
+        return "zstd"
+    return "none"
+
+
+def _zstd_open(path: Path, mode: str) -> IO[bytes]:
+    """
+    Abre um arquivo zstd; na leitura o descompressor é envolvido num
+    ``io.BufferedReader`` para ter ``readline`` e iteração por linhas.
+    """
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        try:
+            import zstandard as zstd
+        except ImportError:
+            raise JsonlFormatError(
+                "Compressão zstd requer o extra 'zstd' (uv sync --extra zstd)"
+            ) from None
+    stream = zstd.open(path, mode)
+    if "r" in mode:
+        return io.BufferedReader(stream)
+    return stream
@@ -0,0 +1,168 @@
+"""Manifesto de exportação: exportação incremental (delta) de um deck.
+
+Regerar um tópico produz quase sempre os mesmos cards, mas o pacote inteiro
+era redistribuído a cada versão. O manifesto guarda, para cada card
+exportado, a identidade estável (``identity.card_identity``) e o hash do
+conteúdo; na exportação seguinte só vão para o pacote os cards novos ou
+alterados. Como o GUID das notas vem da mesma identidade, o Anki atualiza as
+notas já importadas com os cards alterados do delta.
+
+O manifesto é um JSON pequeno, gravado de forma atômica ao lado do pacote, com
+o SHA-256 do arquivo gerado para conferência na distribuição.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .identity import card_identity
+
+if TYPE_CHECKING:
+    from .models import AnkiCard
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+_HASH_CHUNK = 1 << 20
+
+
+class ManifestError(Exception):
+    """Manifesto de exportação ilegível ou de versão não suportada."""
+
+    pass
+
+
+class ExportManifest(BaseModel):
+    """Estado de uma exportação: identidade -> hash do conteúdo de cada card."""
+
+    version: int = MANIFEST_VERSION
+    generated_at: str = Field(default_factory=lambda: datetime.now().isoformat())
+    format: str = ""
+    deck_name: str = ""
+    cards: dict[str, str] = Field(
+        default_factory=dict, description="Identidade do card -> hash do conteúdo"
+    )
+    artifact: str | None = Field(default=None, description="Arquivo gerado nesta exportação")
+    artifact_sha256: str | None = None
+    delta_cards: int = Field(default=0, description="Cards incluídos no arquivo gerado")
+
+
+def content_hash(card: AnkiCard) -> str:
+    """
+    Hash de tudo o que é exportado de um card (front, verso, tipo, tags, extra).
+
+    Args:
+        card: Card
+
+    Returns:
+        Hash hexadecimal (BLAKE2b, 16 bytes)
+    """
+    data = json.dumps(card.model_dump(mode="json"), ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def select_changed(
+    cards: list[AnkiCard], previous: ExportManifest
+) -> tuple[list[AnkiCard], dict[str, str]]:
+    """
+    Separa os cards novos ou alterados desde a exportação anterior.
+
+    Args:
+        cards: Cards da geração atual (o deck completo)
+        previous: Manifesto da exportação anterior
+
+    Returns:
+        Tupla (cards novos ou alterados, entradas do manifesto atualizado).
+        As entradas refletem só os cards atuais; cards repetidos pela mesma
+        identidade contam uma vez (o primeiro).
+    """
+    delta: list[AnkiCard] = []
+    entries: dict[str, str] = {}
+    for card in cards:
+        identity = card_identity(card)
+        if identity in entries:
+            continue
+        entries[identity] = digest = content_hash(card)
+        if previous.cards.get(identity) != digest:
+            delta.append(card)
+
+    removed = len(previous.cards.keys() - entries.keys())
+    if removed:
+        logger.info("%d cards do manifesto anterior não estão mais no deck", removed)
+    logger.info("Delta: %d de %d cards novos ou alterados", len(delta), len(entries))
+    return delta, entries
+
+
+def load_manifest(path: Path | str) -> ExportManifest:
+    """
+    Lê um manifesto; se o arquivo não existir, retorna um manifesto vazio.
+
+    Args:
+        path: Caminho do manifesto (.json)
+
+    Returns:
+        Manifesto lido (vazio na primeira exportação)
+
+    Raises:
+        ManifestError: Se o arquivo for inválido ou de versão mais nova
+    """
+    path = Path(path)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return ExportManifest()
+    except OSError as e:
+        raise ManifestError(f"Erro ao ler manifesto {path}: {e}") from e
+
+    try:
+        manifest = ExportManifest.model_validate_json(data)
+    except ValidationError as e:
+        raise ManifestError(f"Manifesto inválido {path}: {e}") from e
+    if manifest.version > MANIFEST_VERSION:
+        raise ManifestError(
+            f"{path}: versão {manifest.version} não suportada (máximo {MANIFEST_VERSION})"
+        )
+    return manifest
+
+
+def write_manifest(manifest: ExportManifest, path: Path | str) -> Path:
+    """
+    Grava o manifesto de forma atômica (arquivo temporário + rename).
+
+    Args:
+        manifest: Manifesto atualizado
+        path: Caminho de destino
+
+    Returns:
+        Path do manifesto gravado
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(manifest.model_dump_json(indent=2))
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def file_sha256(path: Path | str) -> str:
+    """SHA-256 de um arquivo, lido em blocos."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
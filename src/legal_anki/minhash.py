@@ -0,0 +1,266 @@
+"""Assinaturas MinHash e índice LSH para detecção de quase-duplicatas.
+
+Comparar cada texto com todos os outros é O(n²). Aqui cada texto vira um
+conjunto de shingles (n-gramas de palavras normalizadas), resumido numa
+assinatura MinHash de tamanho fixo cuja taxa de coincidência estima a
+similaridade de Jaccard. O índice LSH divide a assinatura em faixas e só
+compara textos que coincidem em pelo menos uma faixa, o que mantém a busca
+aproximadamente linear.
+
+Em Python puro, aplicar ``num_perm`` funções de hash a cada shingle seria o
+gargalo. Aqui uma única chamada a SHAKE-128 por shingle produz os
+``num_perm`` valores de uma vez, e os valores dos shingles mais frequentes
+ficam num cache único do módulo, compartilhado por todos os ``MinHasher``:
+vocabulário jurídico se repete muito, então boa parte dos shingles de cards
+curtos já foi vista. Os hashes são estáveis entre execuções, de modo que
+assinaturas e chaves de faixa podem ser persistidas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+import sys
+import unicodedata
+import zlib
+from array import array
+from collections.abc import Hashable, Iterable, Sequence
+from functools import lru_cache
+
+# Entradas dos caches de shingles, compartilhados por todo o processo. Cada
+# entrada de valores é um array("I") de num_perm * 4 bytes, mais ~300 bytes de
+# objeto, chave e nó do LRU: ~2,3 MB no total com num_perm=64.
+_CACHE_SIZE = 4096
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza texto para comparação: sem acentos, minúsculo, só palavras.
+
+    Caracteres sem equivalente ASCII após remover os acentos são descartados.
+
+    Args:
+        text: Texto original
+
+    Returns:
+        Palavras do texto separadas por um espaço
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = decomposed.encode("ascii", "ignore").decode("ascii")
+    return " ".join(_WORD_RE.findall(stripped))
+
+
+def shingles(text: str, size: int = 3) -> set[int]:
+    """
+    Converte o texto no conjunto de hashes de seus n-gramas de palavras.
+
+    Textos com menos de ``size`` palavras viram um único shingle.
+
+    Args:
+        text: Texto original (é normalizado aqui)
+        size: Número de palavras por shingle
+
+    Returns:
+        Hashes de 64 bits, estáveis entre execuções (vazio para texto sem palavras)
+    """
+    if size < 1:
+        raise ValueError("Parâmetro 'size' deve ser maior que zero")
+    words = normalize_text(text).split()
+    if not words:
+        return set()
+    if size == 1:
+        grams = set(words)
+    elif len(words) <= size:
+        grams = {" ".join(words)}
+    else:
+        grams = {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+    return {_gram_hash(gram) for gram in grams}
+
+
+def jaccard(a: set[int], b: set[int]) -> float:
+    """Similaridade de Jaccard exata entre dois conjuntos de shingles."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def containment(a: set[int], b: set[int]) -> float:
+    """
+    Fração do menor conjunto de shingles contida no outro.
+
+    Ao contrário do Jaccard, não cai quando um dos textos acrescenta
+    palavras: útil para versos que dizem o mesmo com redações diferentes.
+    """
+    if not a or not b:
+        return 0.0
+    return len(a & b) / min(len(a), len(b))
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estima a similaridade de Jaccard entre duas assinaturas MinHash."""
+    if not a or not b or len(a) != len(b):
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+class MinHasher:
+    """
+    Calcula assinaturas MinHash de ``num_perm`` posições.
+
+    Duas instâncias com os mesmos parâmetros produzem assinaturas comparáveis.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        if num_perm < 2:
+            raise ValueError("Parâmetro 'num_perm' deve ser pelo menos 2")
+        self.num_perm = num_perm
+        self.seed = seed
+
+    def signature(self, hashes: Iterable[int]) -> tuple[int, ...]:
+        """
+        Calcula a assinatura de um conjunto de shingles.
+
+        Args:
+            hashes: Hashes dos shingles (ver ``shingles``)
+
+        Returns:
+            Assinatura com ``num_perm`` valores de 32 bits, ou tupla vazia se
+            não houver shingles (textos vazios não são similares a nada)
+        """
+        num_perm, seed = self.num_perm, self.seed
+        rows = [_perm_values(seed, num_perm, h) for h in hashes]
+        if not rows:
+            return ()
+        return tuple(map(min, *rows)) if len(rows) > 1 else tuple(rows[0])
+
+    def text_signature(self, text: str, size: int = 3) -> tuple[int, ...]:
+        """Atalho para ``signature(shingles(text, size))``."""
+        return self.signature(shingles(text, size))
+
+
+class LSHIndex:
+    """
+    Índice LSH sobre assinaturas MinHash.
+
+    A assinatura é dividida em ``bands`` faixas de ``rows`` valores; dois
+    textos viram candidatos se coincidirem numa faixa inteira. O par
+    (bands, rows) é escolhido para que a probabilidade de colisão suba
+    bruscamente em torno de ``threshold``. Os candidatos são confirmados pela
+    similaridade estimada das assinaturas completas.
+    """
+
+    def __init__(self, num_perm: int = 64, threshold: float = 0.8):
+        if not 0 < threshold <= 1:
+            raise ValueError("Parâmetro 'threshold' deve estar entre 0 e 1")
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.bands, self.rows = optimal_bands(num_perm, threshold)
+        self._pack = struct.Struct(f"<{self.rows}I").pack
+        self._buckets: dict[int, list[Hashable]] = {}
+        # array("I") ocupa 4 bytes por posição, contra ~28 de um int em tupla
+        self._signatures: dict[Hashable, array[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._signatures
+
+    def band_keys(self, signature: Sequence[int]) -> list[int]:
+        """
+        Chaves de faixa de uma assinatura: número da faixa nos bits altos e
+        CRC-32 dos valores da faixa nos baixos.
+
+        Estáveis entre execuções e dentro de um INTEGER do SQLite.
+        """
+        rows = self.rows
+        pack = self._pack
+        return [
+            (band << 32) | zlib.crc32(pack(*signature[band * rows : (band + 1) * rows]))
+            for band in range(self.bands)
+        ]
+
+    def insert(self, key: Hashable, signature: tuple[int, ...]) -> None:
+        """Adiciona uma assinatura ao índice (assinaturas vazias são ignoradas)."""
+        if not signature:
+            return
+        if len(signature) != self.num_perm:
+            raise ValueError("Assinatura com tamanho diferente de 'num_perm'")
+        self._signatures[key] = array("I", signature)
+        for band_key in self.band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def query(
+        self, signature: tuple[int, ...], threshold: float | None = None
+    ) -> list[tuple[Hashable, float]]:
+        """
+        Busca assinaturas similares já indexadas.
+
+        Args:
+            signature: Assinatura consultada
+            threshold: Similaridade mínima (default: a do índice)
+
+        Returns:
+            Pares (chave, similaridade estimada), do mais ao menos similar
+        """
+        if not signature:
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        seen: set[Hashable] = set()
+        matches: list[tuple[Hashable, float]] = []
+        for band_key in self.band_keys(signature):
+            for key in self._buckets.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                score = similarity(signature, self._signatures[key])
+                if score >= threshold:
+                    matches.append((key, score))
+        matches.sort(key=lambda m: -m[1])
+        return matches
+
+    def remove(self, key: Hashable) -> None:
+        """Remove uma chave do índice (no-op se ausente)."""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self.band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+
+def optimal_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    Escolhe (bands, rows) com ``bands * rows == num_perm``.
+
+    O limiar efetivo do LSH é aproximadamente ``(1 / bands) ** (1 / rows)``.
+    Fica o maior limiar efetivo que não passa de ``threshold``: falsos
+    candidatos são descartados na confirmação, falsos negativos não são
+    recuperados.
+    """
+    pairs = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    effective = {pair: (1 / pair[0]) ** (1 / pair[1]) for pair in pairs}
+    below = [pair for pair in pairs if effective[pair] <= threshold]
+    if below:
+        return max(below, key=effective.__getitem__)
+    return min(pairs, key=effective.__getitem__)
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _perm_values(seed: int, num_perm: int, h: int) -> array[int]:
+    """Valores das ``num_perm`` posições para um shingle: 32 bits cada, do mesmo digest."""
+    data = hashlib.shake_128(seed.to_bytes(8, "little") + h.to_bytes(8, "little"))
+    values = array("I", data.digest(4 * num_perm))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _gram_hash(gram: str) -> int:
+    return int.from_bytes(hashlib.blake2b(gram.encode(), digest_size=8).digest(), "little")
@@ -3,7 +3,7 @@
 import genanki
 from pydantic import BaseModel, Field, field_validator
 
-from .config import CardType, settings
+from .config import CardType, settings, stable_anki_id
 
 # =============================================================================
 # Modelos Pydantic para Cards
@@ -44,6 +44,19 @@ class CardResponse(BaseModel):
     cards: list[AnkiCard] = Field(description="Lista de cards gerados")
 
 
+class ItemCards(BaseModel):
+    """Cards gerados para um item específico de um lote."""
+
+    item_id: str = Field(description="Identificador do item de origem no lote")
+    cards: list[AnkiCard] = Field(description="Cards gerados para o item")
+
+
+class BatchCardResponse(BaseModel):
+    """Resposta estruturada do LLM para um lote de itens independentes."""
+
+    items: list[ItemCards] = Field(description="Cards agrupados por item de origem")
+
+
 # =============================================================================
 # Modelos Genanki (templates Anki)
 # =============================================================================
@@ -110,10 +123,15 @@ hr#answer {
 """
 
 
+def _model_id(configured: int | None, name: str) -> int:
+    """ID do modelo: o configurado no ambiente ou o derivado do nome."""
+    return configured if configured is not None else stable_anki_id(f"model:{name}")
+
+
 def create_basic_model() -> genanki.Model:
     """Cria modelo Basic (Pergunta/Resposta)."""
     return genanki.Model(
-        model_id=settings.anki_model_basic_id,
+        model_id=_model_id(settings.anki_model_basic_id, "LegalAnki Basic"),
         name="LegalAnki Basic",
         fields=[
             {"name": "Front"},
@@ -137,7 +155,7 @@ def create_basic_model() -> genanki.Model:
 def create_cloze_model() -> genanki.Model:
     """Cria modelo Cloze para lacunas."""
     return genanki.Model(
-        model_id=settings.anki_model_cloze_id,
+        model_id=_model_id(settings.anki_model_cloze_id, "LegalAnki Cloze"),
         name="LegalAnki Cloze",
         model_type=genanki.Model.CLOZE,
         fields=[
@@ -163,7 +181,7 @@ def create_cloze_model() -> genanki.Model:
 def create_questao_model() -> genanki.Model:
     """Cria modelo para questões de concurso."""
     return genanki.Model(
-        model_id=settings.anki_model_questao_id,
+        model_id=_model_id(settings.anki_model_questao_id, "LegalAnki Questao"),
         name="LegalAnki Questao",
         fields=[
             {"name": "Front"},
@@ -204,7 +222,7 @@ def create_questao_model() -> genanki.Model:
 def create_jurisprudencia_model() -> genanki.Model:
     """Cria modelo para súmulas e julgados."""
     return genanki.Model(
-        model_id=settings.anki_model_jurisprudencia_id,
+        model_id=_model_id(settings.anki_model_jurisprudencia_id, "LegalAnki Jurisprudencia"),
         name="LegalAnki Jurisprudencia",
         fields=[
             {"name": "Front"},
@@ -0,0 +1,178 @@
+"""Detecção de cards quase duplicados via MinHash/LSH.
+
+``deduplicate_cards`` só remove fronts idênticos: "Qual o fundamento do
+direito ao silêncio?" e "Qual é o fundamento constitucional do direito ao
+silêncio do preso?" passam os dois. Comparar todos os pares seria O(n²) em
+coleções de dezenas de milhares de cards; aqui o front de cada card é
+indexado num ``LSHIndex`` e só os candidatos do índice são comparados, com
+confirmação também pelo verso. Versos da mesma resposta costumam ter
+redações e tamanhos diferentes, então o verso é comparado por contenção
+(fração das palavras do menor contida no outro), não por Jaccard.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Hashable, Iterable
+from typing import Literal
+
+from .minhash import LSHIndex, MinHasher, containment, shingles
+from .models import AnkiCard
+from .validators import CardValidationError, has_legal_basis, validate_card
+
+logger = logging.getLogger(__name__)
+
+KeepPolicy = Literal["keep_first", "keep_best"]
+
+# Fronts são curtos: palavras isoladas (unigramas) dão uma estimativa de
+# Jaccard mais estável que n-gramas maiores.
+_SHINGLE_SIZE = 1
+
+# Contenção mínima entre versos. Versos da mesma resposta, redigidos de forma
+# diferente, ficam em torno de 0,5; versos sem relação, abaixo de 0,1.
+_BACK_THRESHOLD = 0.4
+
+
+class NearDuplicateIndex:
+    """
+    Índice incremental de cards para busca de quase duplicatas.
+
+    Um card é duplicata de outro quando a similaridade estimada dos fronts é
+    pelo menos ``threshold`` e a contenção exata entre os versos é pelo menos
+    ``back_threshold`` (0 desativa a verificação do verso). Só os fronts são
+    assinados e indexados; o verso é comparado apenas nos candidatos do LSH,
+    que são poucos.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        back_threshold: float = _BACK_THRESHOLD,
+        num_perm: int = 64,
+        shingle_size: int = _SHINGLE_SIZE,
+    ):
+        if not 0 <= back_threshold <= 1:
+            raise ValueError("Parâmetro 'back_threshold' deve estar entre 0 e 1")
+        self.back_threshold = back_threshold
+        self.shingle_size = shingle_size
+        self._hasher = MinHasher(num_perm=num_perm)
+        self._lsh = LSHIndex(num_perm=num_perm, threshold=threshold)
+        self._backs: dict[Hashable, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._lsh)
+
+    def signature(self, card: AnkiCard) -> tuple[int, ...]:
+        """Assinatura MinHash do front de um card."""
+        return self._hasher.text_signature(card.front, self.shingle_size)
+
+    def find(self, card: AnkiCard, signature: tuple[int, ...] | None = None) -> Hashable | None:
+        """
+        Busca um card indexado do qual ``card`` seja quase duplicata.
+
+        Args:
+            card: Card consultado
+            signature: Assinatura do front já calculada (evita recalcular)
+
+        Returns:
+            Chave do card indexado mais similar, ou None
+        """
+        matches = self._lsh.query(signature or self.signature(card))
+        if not matches or not self.back_threshold:
+            return matches[0][0] if matches else None
+
+        back = shingles(card.back, self.shingle_size)
+        for key, _ in matches:
+            other = shingles(self._backs[key], self.shingle_size)
+            if containment(back, other) >= self.back_threshold:
+                return key
+        return None
+
+    def add(self, key: Hashable, card: AnkiCard, signature: tuple[int, ...] | None = None) -> None:
+        """Indexa um card sob a chave informada."""
+        self._lsh.insert(key, signature or self.signature(card))
+        if self.back_threshold:
+            self._backs[key] = card.back
+
+
+def group_near_duplicates(
+    cards: Iterable[AnkiCard],
+    threshold: float = 0.7,
+    back_threshold: float = _BACK_THRESHOLD,
+) -> list[list[int]]:
+    """
+    Agrupa cards quase duplicados.
+
+    Cada card é comparado apenas com o primeiro card de cada grupo já
+    formado (via LSH), o que mantém o custo aproximadamente linear.
+
+    Args:
+        cards: Cards a agrupar
+        threshold: Similaridade mínima entre fronts
+        back_threshold: Contenção mínima entre versos (0 ignora o verso)
+
+    Returns:
+        Grupos de índices na ordem de entrada; cards sem duplicata formam
+        grupos de um elemento
+    """
+    index = NearDuplicateIndex(threshold=threshold, back_threshold=back_threshold)
+    groups: list[list[int]] = []
+    for i, card in enumerate(cards):
+        signature = index.signature(card)
+        match = index.find(card, signature)
+        if match is None:
+            index.add(len(groups), card, signature)
+            groups.append([i])
+        else:
+            groups[match].append(i)
+    return groups
+
+
+def deduplicate_near(
+    cards: list[AnkiCard],
+    threshold: float = 0.7,
+    back_threshold: float = _BACK_THRESHOLD,
+    policy: KeepPolicy = "keep_first",
+) -> list[AnkiCard]:
+    """
+    Remove cards quase duplicados.
+
+    Args:
+        cards: Cards a filtrar
+        threshold: Similaridade mínima entre fronts
+        back_threshold: Contenção mínima entre versos (0 ignora o verso)
+        policy: "keep_first" mantém o primeiro card de cada grupo;
+                "keep_best" mantém o mais completo (válido, com fundamento
+                legal, verso mais longo), na posição do primeiro
+
+    Returns:
+        Um card por grupo, na ordem de entrada
+
+    Raises:
+        ValueError: Se a política for desconhecida
+    """
+    if policy not in ("keep_first", "keep_best"):
+        raise ValueError(f"Política desconhecida: {policy!r}")
+
+    groups = group_near_duplicates(cards, threshold, back_threshold)
+    if policy == "keep_first":
+        unique = [cards[group[0]] for group in groups]
+    else:
+        unique = [
+            max((cards[i] for i in group), key=_quality) if len(group) > 1 else cards[group[0]]
+            for group in groups
+        ]
+
+    if len(unique) < len(cards):
+        logger.info("Removidos %d cards quase duplicados", len(cards) - len(unique))
+    return unique
+
+
+def _quality(card: AnkiCard) -> tuple[bool, bool, int]:
+    """Critério do "keep_best": válido, com fundamento legal, verso mais longo."""
+    try:
+        validate_card(card)
+        valid = True
+    except CardValidationError:
+        valid = False
+    return valid, has_legal_basis(card), len(card.back)
@@ -3,15 +3,43 @@
 from __future__ import annotations
 
 import csv
+import io
+import itertools
 import logging
-from io import StringIO
+import mmap
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, TextIO, Union
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from .cache import TextCache
 
 logger = logging.getLogger(__name__)
 
 # Extensões suportadas (sem ponto)
 SUPPORTED_EXTENSIONS = {"txt", "pdf", "docx", "csv"}
 
+# Versão da extração de texto. Incrementar sempre que a saída dos parsers
+# mudar, para invalidar entradas antigas do cache.
+PARSER_VERSION = 2
+
+# PDFs com menos páginas são extraídos serialmente: abrir o documento e subir
+# processos custa mais do que a extração paralela economiza.
+_PARALLEL_PDF_MIN_PAGES = 64
+
+# Trecho inicial usado para detectar o delimitador do CSV
+_CSV_SNIFF_CHARS = 2048
+
+# TXT a partir deste tamanho é lido via mmap
+_MMAP_MIN_BYTES = 8 * 1024 * 1024
+
+# Entradas em memória aceitas por ``parse_bytes``
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
 
 class ParseError(Exception):
     """Erro ao extrair texto de um arquivo."""
@@ -19,12 +47,24 @@ class ParseError(Exception):
     pass
 
 
-def parse_file(path: Path) -> str:
+def parse_file(
+    path: Path,
+    workers: int | None = None,
+    cache: "TextCache | None" = None,
+    clean: bool = False,
+) -> str:
     """
     Extrai texto de um arquivo baseado na extensão.
 
     Args:
         path: Caminho do arquivo de entrada
+        workers: Processos para extração de PDF. None usa todos os núcleos
+                 disponíveis; 1 força extração serial. PDFs pequenos são
+                 sempre extraídos serialmente.
+        cache: Cache opcional de texto extraído, indexado pelo hash do conteúdo
+               do arquivo e por ``PARSER_VERSION``
+        clean: Se True, remove ruído de página de PDFs (cabeçalhos, rodapés,
+               numeração, hifenização) antes de retornar o texto
 
     Returns:
         Texto extraído do arquivo
@@ -44,9 +84,25 @@ def parse_file(path: Path) -> str:
             f"Use: {', '.join(f'.{e}' for e in sorted(SUPPORTED_EXTENSIONS))}"
         )
 
+    cache_key = None
+    if cache is not None:
+        from .cache import file_digest
+
+        kind = "clean" if clean and ext == "pdf" else "text"
+        cache_key = f"{file_digest(path)}.{ext}.v{PARSER_VERSION}.{kind}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(
+                "Cache hit: %d caracteres de %s (%s)",
+                len(cached),
+                path.name,
+                cache_key[:12],
+            )
+            return cached
+
     parser = _PARSERS[ext]
     try:
-        text = parser(path)
+        text = _parse_pdf(path, workers, clean) if ext == "pdf" else parser(path)
     except ParseError:
         raise
     except Exception as e:
@@ -55,76 +111,417 @@ def parse_file(path: Path) -> str:
     if not text or not text.strip():
         raise ParseError(f"Arquivo {path.name} está vazio ou não contém texto extraível")
 
-    logger.info("Extraídos %d caracteres de %s", len(text.strip()), path.name)
-    return text.strip()
+    text = text.strip()
+    logger.info("Extraídos %d caracteres de %s", len(text), path.name)
+
+    if cache is not None and cache_key is not None:
+        cache.set(cache_key, text)
+    return text
+
+
+def iter_file(path: Path) -> Iterator[str]:
+    """
+    Extrai texto de um arquivo de forma incremental, segmento a segmento.
+
+    Variante de ``parse_file`` com memória limitada para documentos grandes:
+    PDFs são lidos página a página, TXT em blocos de parágrafos e DOCX/CSV
+    parágrafo a parágrafo/linha a linha. Segmentos vazios são omitidos.
+
+    Args:
+        path: Caminho do arquivo de entrada
+
+    Yields:
+        Segmentos de texto na ordem do documento
+
+    Raises:
+        ParseError: Se o formato não for suportado, houver erro na leitura
+            ou o arquivo não contiver texto
+        FileNotFoundError: Se o arquivo não existir
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    ext = path.suffix.lower().lstrip(".")
+
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ParseError(
+            f"Formato não suportado: .{ext}. "
+            f"Use: {', '.join(f'.{e}' for e in sorted(SUPPORTED_EXTENSIONS))}"
+        )
+
+    total = 0
+    try:
+        for segment in _SEGMENT_PARSERS[ext](path):
+            if segment.strip():
+                total += len(segment)
+                yield segment
+    except ParseError:
+        raise
+    except Exception as e:
+        raise ParseError(f"Erro ao ler arquivo {path.name}: {e}") from e
+
+    if not total:
+        raise ParseError(f"Arquivo {path.name} está vazio ou não contém texto extraível")
+
+    logger.info("Extraídos %d caracteres de %s (streaming)", total, path.name)
+
+
+def parse_bytes(
+    source: Buffer | BinaryIO,
+    ext: str,
+    clean: bool = False,
+    name: str = "<memória>",
+) -> str:
+    """
+    Extrai texto de um conteúdo em memória, sem passar pelo disco.
+
+    PDFs são abertos direto do buffer (``pymupdf.open(stream=...)``) e DOCX a
+    partir de um stream; ``BytesIO`` é lido via ``getbuffer()``, sem cópia.
+
+    Args:
+        source: Conteúdo do arquivo (bytes, bytearray, memoryview, mmap) ou
+                objeto file-like binário (upload, ``sys.stdin.buffer``)
+        ext: Formato do conteúdo, sem ponto ("pdf", "docx", "txt", "csv")
+        clean: Se True, remove ruído de página de PDFs (ver ``parse_file``)
+        name: Nome usado nas mensagens de log e de erro
+
+    Returns:
+        Texto extraído
+
+    Raises:
+        ParseError: Se o formato não for suportado ou houver erro na leitura
+    """
+    ext = ext.lower().lstrip(".")
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ParseError(
+            f"Formato não suportado: .{ext}. "
+            f"Use: {', '.join(f'.{e}' for e in sorted(SUPPORTED_EXTENSIONS))}"
+        )
+
+    try:
+        if ext == "docx":
+            # python-docx lê de qualquer stream posicionável
+            seekable = isinstance(source, io.IOBase) and source.seekable()
+            stream = source if seekable else io.BytesIO(_as_buffer(source))
+            text = "\n\n".join(_iter_docx(stream))
+        elif ext == "pdf":
+            text = _parse_pdf_buffer(_as_buffer(source), name, clean)
+        elif ext == "csv":
+            csv_stream = io.StringIO(_decode_text(_as_buffer(source)), newline="")
+            text = "\n".join(
+                row.text for row in _iter_csv_stream(csv_stream, name) if row.text
+            )
+        else:
+            text = _decode_text(_as_buffer(source))
+    except ParseError:
+        raise
+    except Exception as e:
+        raise ParseError(f"Erro ao ler {name}: {e}") from e
+
+    if not text or not text.strip():
+        raise ParseError(f"{name} está vazio ou não contém texto extraível")
+
+    text = text.strip()
+    logger.info("Extraídos %d caracteres de %s", len(text), name)
+    return text
+
+
+def _as_buffer(source: Buffer | BinaryIO) -> Buffer:
+    """Obtém um buffer do conteúdo, evitando cópias quando possível."""
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return source
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer()
+    return source.read()
+
+
+def _parse_pdf_buffer(data: Buffer, name: str, clean: bool) -> str:
+    """Extrai texto de um PDF em memória (serial: o buffer não vai aos workers)."""
+    import pymupdf
+
+    # pymupdf não aceita mmap como stream, mas aceita uma memoryview dele
+    with memoryview(data) as view, pymupdf.open(stream=view, filetype="pdf") as doc:
+        pages = list(_iter_pdf_doc(doc, name))
+
+    if clean:
+        from .cleaning import clean_pages
+
+        pages, stats = clean_pages(pages)
+        logger.info("Limpeza de %s: ~%d tokens economizados", name, stats.tokens_saved)
+
+    return "\n\n".join(pages)
 
 
 def _parse_txt(path: Path) -> str:
-    """Lê arquivo de texto puro."""
-    return path.read_text(encoding="utf-8")
+    """
+    Lê arquivo de texto puro.
+
+    Arquivos grandes são mapeados em memória e decodificados direto do
+    mapeamento, sem a cópia intermediária em bytes.
+    """
+    if path.stat().st_size < _MMAP_MIN_BYTES:
+        return path.read_text(encoding="utf-8-sig")
+
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return _decode_text(mm)
+
+
+def _decode_text(data: Buffer) -> str:
+    """Decodifica UTF-8 (com ou sem BOM) normalizando quebras de linha."""
+    text = str(data, "utf-8-sig")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _iter_txt(path: Path) -> Iterator[str]:
+    """Lê arquivo de texto puro em blocos de parágrafos (linhas em branco)."""
+    with path.open(encoding="utf-8-sig") as f:
+        block: list[str] = []
+        for line in f:
+            if line.strip():
+                block.append(line)
+            elif block:
+                yield "".join(block)
+                block = []
+        if block:
+            yield "".join(block)
+
+
+def _parse_pdf(path: Path, workers: int | None = 1, clean: bool = False) -> str:
+    """
+    Extrai texto de PDF usando PyMuPDF (sem OCR).
 
+    Com ``workers`` > 1 (ou None, para usar todos os núcleos), documentos
+    grandes têm o intervalo de páginas dividido entre processos; cada processo
+    abre o documento de forma independente e as páginas são remontadas em ordem.
+    Com ``clean``, cabeçalhos/rodapés repetidos e quebras artificiais são
+    removidos (ver ``cleaning.clean_pages``).
+    """
+    pages = _extract_pdf_pages(path, workers)
+
+    if clean:
+        from .cleaning import clean_pages
+
+        pages, stats = clean_pages(pages)
+        logger.info(
+            "Limpeza de %s: %d linhas repetidas e %d números de página removidos, "
+            "~%d tokens economizados (%d -> %d caracteres)",
+            path.name,
+            stats.repeated_lines_removed,
+            stats.page_numbers_removed,
+            stats.tokens_saved,
+            stats.chars_before,
+            stats.chars_after,
+        )
+
+    return "\n\n".join(pages)
 
-def _parse_pdf(path: Path) -> str:
-    """Extrai texto de PDF usando PyMuPDF (sem OCR)."""
+
+def _extract_pdf_pages(path: Path, workers: int | None) -> list[str]:
+    """Extrai as páginas não vazias de um PDF, em paralelo quando compensa."""
     import pymupdf
 
-    pages = []
-    with pymupdf.open(str(path)) as doc:
-        for page in doc:
-            text = page.get_text()
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with pymupdf.open(str(path)) as doc:
+            page_count = doc.page_count
+        if page_count >= _PARALLEL_PDF_MIN_PAGES:
+            pages = _extract_pdf_parallel(path, page_count, workers)
+            if not pages:
+                raise ParseError(
+                    f"PDF {path.name} não contém texto extraível (pode requerer OCR)"
+                )
+            return pages
+
+    return list(_iter_pdf(path))
+
+
+def _extract_pdf_parallel(path: Path, page_count: int, workers: int) -> list[str]:
+    """Extrai páginas de um PDF em paralelo, preservando a ordem."""
+    # Mais faixas que processos equilibra a carga entre páginas leves e pesadas
+    n_ranges = min(page_count, workers * 4)
+    bounds = [page_count * i // n_ranges for i in range(n_ranges + 1)]
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+
+    logger.debug(
+        "Extraindo %d páginas de %s com %d processos", page_count, path.name, workers
+    )
+    with ProcessPoolExecutor(max_workers=min(workers, n_ranges)) as pool:
+        results = pool.map(
+            _extract_pdf_range,
+            [str(path)] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges],
+        )
+        return [text for texts in results for text in texts]
+
+
+def _extract_pdf_range(path: str, start: int, stop: int) -> list[str]:
+    """Extrai o texto não vazio das páginas [start, stop) (executa no worker)."""
+    import pymupdf
+
+    texts = []
+    with pymupdf.open(path) as doc:
+        for i in range(start, stop):
+            text = doc[i].get_text()
             if text.strip():
-                pages.append(text)
+                texts.append(text)
+    return texts
 
-    if not pages:
-        raise ParseError(f"PDF {path.name} não contém texto extraível (pode requerer OCR)")
 
-    return "\n\n".join(pages)
+def _iter_pdf(path: Path) -> Iterator[str]:
+    """Extrai texto de PDF página a página, sem acumular o documento."""
+    import pymupdf
+
+    with pymupdf.open(str(path)) as doc:
+        yield from _iter_pdf_doc(doc, path.name)
+
+
+def _iter_pdf_doc(doc, name: str) -> Iterator[str]:
+    """Gera o texto não vazio de cada página de um documento já aberto."""
+    found = False
+    for page in doc:
+        text = page.get_text()
+        if text.strip():
+            found = True
+            yield text
+
+    if not found:
+        raise ParseError(f"PDF {name} não contém texto extraível (pode requerer OCR)")
 
 
 def _parse_docx(path: Path) -> str:
     """Extrai texto de DOCX usando python-docx."""
+    return "\n\n".join(_iter_docx(path))
+
+
+def _iter_docx(source: Path | BinaryIO) -> Iterator[str]:
+    """Extrai parágrafos não vazios de DOCX (caminho ou stream), um a um."""
     import docx
 
-    doc = docx.Document(str(path))
-    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-    return "\n\n".join(paragraphs)
+    doc = docx.Document(str(source) if isinstance(source, Path) else source)
+    for p in doc.paragraphs:
+        if p.text.strip():
+            yield p.text
 
 
-def _parse_csv(path: Path) -> str:
+class CsvRow(BaseModel):
+    """Linha de dados de um CSV, com sua posição no arquivo."""
+
+    number: int = Field(
+        ..., description="Número da linha de dados (1 = primeira após o cabeçalho)"
+    )
+    values: dict[str, str] = Field(
+        ..., description="Células por nome de coluna (ou '1', '2', ... sem cabeçalho)"
+    )
+
+    @property
+    def text(self) -> str:
+        """Células não vazias unidas por " | "."""
+        return " | ".join(v.strip() for v in self.values.values() if v.strip())
+
+
+def iter_csv_rows(path: Path) -> Iterator[CsvRow]:
     """
-    Extrai texto de CSV concatenando todas as células.
+    Lê um CSV linha a linha, sem carregar o arquivo em memória.
 
-    Trata o CSV como fonte de conteúdo jurídico tabular,
-    concatenando cada linha como um bloco de texto.
+    O delimitador é detectado nos primeiros 2 KB; a primeira linha é tratada
+    como cabeçalho quando todas as células parecem nomes de coluna e há ao
+    menos uma linha de dados depois dela.
+
+    Args:
+        path: Caminho do arquivo CSV (UTF-8)
+
+    Yields:
+        CsvRow para cada linha com alguma célula não vazia
+
+    Raises:
+        ParseError: Se o CSV estiver vazio
     """
-    raw = path.read_text(encoding="utf-8")
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        yield from _iter_csv_stream(f, path.name)
 
-    # Detectar delimitador (;, , ou \t)
-    sniffer = csv.Sniffer()
+
+def _iter_csv_stream(f: TextIO, name: str) -> Iterator[CsvRow]:
+    """Lê linhas de CSV de um stream de texto posicionável (ver ``iter_csv_rows``)."""
+    sample = f.read(_CSV_SNIFF_CHARS)
+    f.seek(0)
     try:
-        dialect = sniffer.sniff(raw[:2048])
+        dialect = csv.Sniffer().sniff(sample)
     except csv.Error:
         dialect = csv.excel  # fallback para vírgula
 
-    reader = csv.reader(StringIO(raw), dialect)
-    rows = list(reader)
+    reader = csv.reader(f, dialect)
+    first = next(reader, None)
+    if first is None:
+        raise ParseError(f"CSV {name} está vazio")
+    second = next(reader, None)
+
+    if second is not None and _looks_like_header(first):
+        columns = _unique_columns(first)
+        rows = itertools.chain([second], reader)
+    else:
+        columns = []
+        rows = itertools.chain([first], [second] if second is not None else [], reader)
+
+    for number, row in enumerate(rows, start=1):
+        if not any(cell.strip() for cell in row):
+            continue
+        names = columns or [str(i) for i in range(1, len(row) + 1)]
+        yield CsvRow(
+            number=number,
+            values={
+                names[i] if i < len(names) else str(i + 1): cell
+                for i, cell in enumerate(row)
+            },
+        )
+
+
+def _unique_columns(header: list[str]) -> list[str]:
+    """
+    Nomes de coluna sem repetição, para que nenhuma célula se perca no dict.
+
+    Colunas sem nome recebem a posição ('3'); nomes repetidos recebem o
+    sufixo da ocorrência ('nome_2', 'nome_3', ...).
+    """
+    names: list[str] = []
+    seen: set[str] = set()
+    for position, cell in enumerate(header, start=1):
+        base = cell.strip() or str(position)
+        name, n = base, 1
+        while name in seen:
+            n += 1
+            name = f"{base}_{n}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _looks_like_header(row: list[str]) -> bool:
+    """Heurística: todas as células não vazias parecem nomes de coluna."""
+    return all(
+        cell.strip().isidentifier() or cell.strip().replace(" ", "_").isidentifier()
+        for cell in row
+        if cell.strip()
+    )
+
 
-    if not rows:
-        raise ParseError(f"CSV {path.name} está vazio")
+def _parse_csv(path: Path) -> str:
+    """
+    Extrai texto de CSV concatenando todas as células.
 
-    # Se a primeira linha parecer cabeçalho, pula
-    header = rows[0]
-    has_header = all(cell.strip().isidentifier() or cell.strip().replace(" ", "_").isidentifier() for cell in header if cell.strip())
+    Trata o CSV como fonte de conteúdo jurídico tabular,
+    concatenando cada linha como um bloco de texto.
+    """
+    return "\n".join(row.text for row in iter_csv_rows(path) if row.text)
 
-    start = 1 if has_header and len(rows) > 1 else 0
-    lines = []
-    for row in rows[start:]:
-        # Junta células não-vazias com " | "
-        cells = [cell.strip() for cell in row if cell.strip()]
-        if cells:
-            lines.append(" | ".join(cells))
 
-    return "\n".join(lines)
+def _iter_csv(path: Path) -> Iterator[str]:
+    """Lê o CSV linha a linha; cada linha vira um segmento próprio."""
+    for row in iter_csv_rows(path):
+        if row.text:
+            yield row.text
 
 
 # Mapa de extensão -> função parser
@@ -134,3 +531,11 @@ _PARSERS = {
     "docx": _parse_docx,
     "csv": _parse_csv,
 }
+
+# Mapa de extensão -> parser incremental (segmentos)
+_SEGMENT_PARSERS = {
+    "txt": _iter_txt,
+    "pdf": _iter_pdf,
+    "docx": _iter_docx,
+    "csv": _iter_csv,
+}
@@ -0,0 +1,180 @@
+"""Deduplicação de passagens entre documentos, antes da geração.
+
+O mesmo artigo ou súmula costuma aparecer na lei, em vários PDFs de aula e
+em informativos; cada cópia custaria uma chamada ao LLM, e
+``deduplicate_cards`` só pega fronts idênticos depois do gasto. Este módulo
+divide cada documento em passagens (parágrafos; artigos, em texto
+normativo), calcula assinaturas MinHash e agrupa passagens quase idênticas
+entre todos os documentos de uma execução. Cada grupo é enviado ao LLM uma
+única vez e seus cards são atribuídos a todas as fontes que o contêm.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Iterable, Iterator
+
+from pydantic import BaseModel, Field
+
+from .minhash import LSHIndex, MinHasher
+from .structure import build_index
+
+logger = logging.getLogger(__name__)
+
+# Parágrafos curtos (títulos, rubricas) são anexados ao seguinte: sozinhos
+# não rendem cards e mudariam de grupo conforme o documento.
+_MIN_PASSAGE_CHARS = 200
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+
+
+class Passage(BaseModel):
+    """Passagem única e os documentos em que ela aparece."""
+
+    passage_id: str = Field(..., description="Identificador local: 'p1', 'p2', ...")
+    text: str = Field(..., description="Texto da primeira ocorrência")
+    sources: list[str] = Field(
+        default_factory=list, description="Documentos que contêm a passagem, na ordem vista"
+    )
+
+
+class PassageIndex:
+    """
+    Agrupa passagens quase idênticas de vários documentos, incrementalmente.
+
+    Documentos podem ser adicionados à medida que são extraídos; cada
+    passagem é comparada (via LSH) apenas com as já vistas.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        shingle_size: int = 3,
+        min_chars: int = _MIN_PASSAGE_CHARS,
+    ):
+        self.shingle_size = shingle_size
+        self.min_chars = min_chars
+        self._hasher = MinHasher(num_perm=num_perm)
+        self._lsh = LSHIndex(num_perm=num_perm, threshold=threshold)
+        self._passages: dict[str, Passage] = {}
+        self._by_source: dict[str, list[str]] = {}
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self._passages)
+
+    @property
+    def passages(self) -> list[Passage]:
+        """Passagens únicas, na ordem em que foram vistas."""
+        return list(self._passages.values())
+
+    def add_document(self, source: str, text: str) -> Iterator[tuple[Passage, bool]]:
+        """
+        Registra as passagens de um documento.
+
+        Args:
+            source: Identificador do documento (ex.: caminho do arquivo)
+            text: Texto extraído
+
+        Yields:
+            Tuplas (passagem, nova), em ordem do documento. ``nova`` é False
+            quando a passagem já tinha sido vista (neste ou em outro documento)
+            e portanto não precisa ser enviada ao LLM de novo.
+        """
+        ids = self._by_source.setdefault(source, [])
+        for chunk in split_passages(text, self.min_chars):
+            self.total += 1
+            signature = self._hasher.text_signature(chunk, self.shingle_size)
+            matches = self._lsh.query(signature)
+            if matches:
+                passage = self._passages[matches[0][0]]
+                is_new = False
+            else:
+                passage = Passage(passage_id=f"p{len(self._passages) + 1}", text=chunk)
+                self._passages[passage.passage_id] = passage
+                self._lsh.insert(passage.passage_id, signature)
+                is_new = True
+
+            if source not in passage.sources:
+                passage.sources.append(source)
+            if passage.passage_id not in ids:
+                ids.append(passage.passage_id)
+            yield passage, is_new
+
+    def passages_of(self, source: str) -> list[str]:
+        """IDs das passagens de um documento, em ordem, sem repetição."""
+        return list(self._by_source.get(source, []))
+
+
+def dedupe_passages(
+    documents: Iterable[tuple[str, str]], threshold: float = 0.8
+) -> list[Passage]:
+    """
+    Agrupa passagens quase idênticas de vários documentos.
+
+    Args:
+        documents: Pares (identificador, texto)
+        threshold: Similaridade de Jaccard mínima para considerar duplicata
+
+    Returns:
+        Passagens únicas, cada uma com a lista de documentos que a contêm
+    """
+    index = PassageIndex(threshold=threshold)
+    for source, text in documents:
+        for _ in index.add_document(source, text):
+            pass
+    logger.info("Passagens: %d no total, %d únicas", index.total, len(index))
+    return index.passages
+
+
+def split_passages(text: str, min_chars: int = _MIN_PASSAGE_CHARS) -> list[str]:
+    """
+    Divide um texto em passagens: parágrafos e, em texto normativo, artigos.
+
+    Unidades com menos de ``min_chars`` caracteres são unidas à seguinte
+    (a última, à anterior).
+
+    Args:
+        text: Texto extraído
+        min_chars: Tamanho mínimo de uma passagem
+
+    Returns:
+        Passagens não vazias, na ordem do texto
+    """
+    passages: list[str] = []
+    pending = ""
+    for unit in _iter_units(text):
+        pending = f"{pending}\n\n{unit}" if pending else unit
+        if len(pending) >= min_chars:
+            passages.append(pending)
+            pending = ""
+    if pending:
+        if passages:
+            passages[-1] = f"{passages[-1]}\n\n{pending}"
+        else:
+            passages.append(pending)
+    return passages
+
+
+def _iter_units(text: str) -> Iterator[str]:
+    """Parágrafos do texto; parágrafos com vários artigos são quebrados por artigo."""
+    for para in _PARAGRAPH_RE.split(text):
+        para = para.strip()
+        if not para:
+            continue
+        index = build_index(para)
+        if len(index) < 2:
+            yield para
+            continue
+
+        pos = 0
+        for article in index:
+            gap = para[pos : article.start].strip()
+            if gap:
+                yield gap
+            yield para[article.start : article.end].strip()
+            pos = article.end
+        tail = para[pos:].strip()
+        if tail:
+            yield tail
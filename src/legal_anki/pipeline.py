@@ -0,0 +1,423 @@
+"""Processamento em lote de diretórios: extração, geração e exportação.
+
+Rodar a CLI uma vez por arquivo repete o custo de importação e de criação do
+cliente LLM, e não sobrepõe extração com geração. Este módulo processa uma
+pasta (ou glob) inteira numa só execução: os arquivos são extraídos num pool
+de processos e, à medida que ficam prontos, seus chunks entram num único pool
+de threads de geração compartilhado entre todos os arquivos. Ao final, os
+cards são exportados por arquivo ou num arquivo único, e o tempo de cada
+etapa é resumido.
+
+Opcionalmente, passagens repetidas entre os arquivos (o mesmo artigo na lei
+e em vários PDFs de aula) são agrupadas antes da geração (``passages``) e
+enviadas ao LLM uma única vez.
+"""
+
+from __future__ import annotations
+
+import glob
+import logging
+import os
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from .batching import SourceItem, generate_cards_batched_iter
+from .exporters import export_cards
+from .generator import (
+    chunk_text,
+    deduplicate_cards,
+    generate_chunk,
+    resolve_llm_client,
+)
+from .identity import with_source
+from .near_duplicates import KeepPolicy, deduplicate_near
+from .parsers import SUPPORTED_EXTENSIONS, parse_file
+from .passages import PassageIndex
+
+if TYPE_CHECKING:
+    from .cache import TextCache
+    from .card_index import CardIndex
+    from .llm.protocol import LLMClient
+    from .models import AnkiCard
+
+logger = logging.getLogger(__name__)
+
+_GLOB_CHARS = set("*?[")
+
+
+class StageStats(BaseModel):
+    """Tempo e volume processado por uma etapa do pipeline."""
+
+    name: str
+    items: int = 0
+    unit: str = "itens"
+    seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Itens por segundo (0 se a etapa não rodou)."""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+
+class BatchSummary(BaseModel):
+    """Resultado de uma execução em lote."""
+
+    files: int = 0
+    cards: int = 0
+    outputs: list[str] = Field(default_factory=list)
+    failed: dict[str, str] = Field(
+        default_factory=dict, description="Arquivo -> mensagem de erro"
+    )
+    stages: list[StageStats] = Field(default_factory=list)
+    passages: int = Field(default=0, description="Passagens lidas (com deduplicação)")
+    unique_passages: int = Field(default=0, description="Passagens enviadas ao LLM")
+
+    def format(self) -> str:
+        """Resumo legível, uma linha por etapa."""
+        lines = [
+            f"{self.files} arquivos, {self.cards} cards, {len(self.failed)} falhas"
+        ]
+        if self.passages:
+            lines.append(
+                f"  passagens: {self.passages} lidas, {self.unique_passages} únicas "
+                f"({self.passages - self.unique_passages} duplicadas)"
+            )
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.name}: {stage.items} {stage.unit} em {stage.seconds:.2f}s "
+                f"({stage.throughput:.1f} {stage.unit}/s)"
+            )
+        return "\n".join(lines)
+
+
+def collect_inputs(target: str | Path) -> list[Path]:
+    """
+    Lista os arquivos suportados de um diretório (recursivo) ou glob.
+
+    Args:
+        target: Diretório, padrão glob (ex.: "leis/**/*.pdf") ou arquivo
+
+    Returns:
+        Caminhos ordenados de arquivos com extensão suportada
+    """
+    target = str(target)
+    if os.path.isdir(target):
+        candidates = Path(target).rglob("*")
+    elif _GLOB_CHARS & set(target):
+        candidates = (Path(p) for p in glob.glob(target, recursive=True))
+    else:
+        candidates = [Path(target)]
+
+    return sorted(
+        p
+        for p in candidates
+        if p.is_file() and p.suffix.lower().lstrip(".") in SUPPORTED_EXTENSIONS
+    )
+
+
+def batch_root(target: str | Path) -> Path:
+    """
+    Diretório base de um alvo de lote, para nomear as entradas de forma estável.
+
+    Args:
+        target: Diretório, padrão glob ou arquivo (como em ``collect_inputs``)
+
+    Returns:
+        O próprio diretório; num glob, o prefixo sem curingas; num arquivo, a pasta dele
+    """
+    target = str(target)
+    if os.path.isdir(target):
+        return Path(target)
+    if _GLOB_CHARS & set(target):
+        parts = []
+        for part in Path(target).parts:
+            if _GLOB_CHARS & set(part):
+                break
+            parts.append(part)
+        return Path(*parts) if parts else Path(".")
+    return Path(target).parent
+
+
+def is_batch_target(target: str) -> bool:
+    """
+    Retorna True se o alvo deve ser processado em lote.
+
+    Um glob só conta se casar com algum caminho: texto livre com "?" (uma
+    pergunta passada direto na CLI) continua sendo tratado como texto.
+    """
+    if os.path.isdir(target):
+        return True
+    return bool(_GLOB_CHARS & set(target)) and next(
+        glob.iglob(target, recursive=True), None
+    ) is not None
+
+
+def run_batch(
+    paths: list[Path],
+    topic: str,
+    output_format: str = "csv",
+    output_dir: Path | str | None = None,
+    merged_output: Path | str | None = None,
+    difficulty: str = "medio",
+    include_legal_basis: bool = True,
+    card_type: str = "auto",
+    cards_per_chunk: int = 5,
+    max_cards_per_file: int | None = None,
+    llm_client: "LLMClient | None" = None,
+    parse_workers: int | None = None,
+    max_workers: int = 4,
+    cache: "TextCache | None" = None,
+    clean: bool = True,
+    route_by_type: bool = True,
+    use_citations: bool = True,
+    dedupe_passages: bool = False,
+    passage_threshold: float = 0.8,
+    cards_per_passage: int = 2,
+    near_duplicate_threshold: float | None = None,
+    near_duplicate_policy: KeepPolicy = "keep_first",
+    card_index: "CardIndex | None" = None,
+    root: Path | str | None = None,
+) -> BatchSummary:
+    """
+    Extrai, gera e exporta cards para vários arquivos numa só execução.
+
+    A extração roda num pool de processos (um arquivo por tarefa); cada
+    arquivo extraído tem seus chunks enviados imediatamente ao pool de
+    geração compartilhado, de modo que extração e chamadas ao LLM se
+    sobrepõem. Falhas de um arquivo são registradas no resumo sem
+    interromper os demais.
+
+    Com ``dedupe_passages``, os textos são divididos em passagens e as quase
+    duplicatas entre arquivos são agrupadas (``PassageIndex``); cada passagem
+    única é gerada uma vez, em lotes (``generate_cards_batched_iter``), e
+    seus cards entram na saída de todos os arquivos que a contêm.
+
+    Cada arquivo é identificado pelo caminho relativo a ``root`` (ex.:
+    "a/lei.txt"): ele entra no GUID das notas e no nome do deck, de modo que
+    arquivos homônimos em pastas diferentes não se misturam no Anki.
+
+    Args:
+        paths: Arquivos de entrada (ver ``collect_inputs``)
+        topic: Tópico principal dos cards
+        output_format: Formato de exportação ("csv", "tsv", "json", "jsonl", "apkg")
+        output_dir: Diretório para um arquivo de saída por entrada
+        merged_output: Arquivo único com os cards de todas as entradas
+        difficulty: Nível de dificuldade ("facil", "medio", "dificil")
+        include_legal_basis: Se True, instrui o LLM a sempre incluir fundamento legal
+        card_type: Tipo de card a gerar ("auto" para deixar o LLM decidir)
+        cards_per_chunk: Número máximo de cards por chunk (1-100)
+        max_cards_per_file: Limite opcional de cards por arquivo
+        llm_client: Cliente LLM opcional. Se None, usa OpenAI padrão com retry.
+        parse_workers: Processos de extração (None = todos os núcleos)
+        max_workers: Chamadas simultâneas ao LLM, somando todos os arquivos
+        cache: Cache opcional de texto extraído
+        clean: Se True, remove ruído de página de PDFs
+        route_by_type: Se True, usa prompt específico por tipo de chunk
+        use_citations: Se True, envia citações extraídas como dicas ao LLM
+        dedupe_passages: Se True, gera uma única vez passagens repetidas entre arquivos
+        passage_threshold: Similaridade mínima para considerar passagens duplicadas
+        cards_per_passage: Número máximo de cards por passagem única (1-10)
+        near_duplicate_threshold: Se informado, remove também cards quase
+                                  duplicados, por arquivo e na saída mesclada
+        near_duplicate_policy: Card mantido de cada grupo ("keep_first" ou "keep_best")
+        card_index: Índice persistente de cards já exportados: cards conhecidos
+                    são descartados e os exportados são registrados nele
+        root: Diretório base dos nomes das entradas (ver ``batch_root``);
+              None usa o diretório comum a todas as entradas
+
+    Returns:
+        BatchSummary com contagens, arquivos gerados, falhas e tempos por etapa
+
+    Raises:
+        ValueError: Se os parâmetros de entrada forem inválidos
+        CardGenerationError: Se não houver cliente LLM configurado
+    """
+    if not topic or not topic.strip():
+        raise ValueError("Parâmetro 'topic' não pode ser vazio")
+    if (output_dir is None) == (merged_output is None):
+        raise ValueError("Informe exatamente um de 'output_dir' ou 'merged_output'")
+    if cards_per_chunk < 1 or cards_per_chunk > 100:
+        raise ValueError("Parâmetro 'cards_per_chunk' deve estar entre 1 e 100")
+    if max_workers < 1:
+        raise ValueError("Parâmetro 'max_workers' deve ser maior que zero")
+    if dedupe_passages and not 1 <= cards_per_passage <= 10:
+        raise ValueError("Parâmetro 'cards_per_passage' deve estar entre 1 e 10")
+    if near_duplicate_threshold is not None and not 0 < near_duplicate_threshold <= 1:
+        raise ValueError("Parâmetro 'near_duplicate_threshold' deve estar entre 0 e 1")
+
+    topic = topic.strip()
+    llm_client = resolve_llm_client(llm_client)
+    if root is None and paths:
+        root = os.path.commonpath([p.parent for p in paths])
+    sources = {path: _source_name(path, root) for path in paths}
+    summary = BatchSummary(files=len(paths))
+    parse_stats = StageStats(name="extração", unit="arquivos")
+    gen_stats = StageStats(name="geração", unit="chunks")
+    export_stats = StageStats(name="exportação", unit="cards")
+
+    gen_start: float | None = None
+
+    def dedupe(cards: list[AnkiCard]) -> list[AnkiCard]:
+        cards = deduplicate_cards(cards)
+        if near_duplicate_threshold is not None:
+            cards = deduplicate_near(
+                cards, threshold=near_duplicate_threshold, policy=near_duplicate_policy
+            )
+        if card_index is not None:
+            cards = card_index.filter_new(cards)
+        return cards
+
+    def generate(chunk: str) -> list[AnkiCard]:
+        return generate_chunk(
+            llm_client,
+            chunk,
+            topic,
+            difficulty,
+            include_legal_basis,
+            card_type,
+            route_by_type,
+            cards_per_chunk,
+            use_citations,
+        )
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=parse_workers) as parse_pool:
+        parse_futures = {
+            parse_pool.submit(parse_file, path, 1, cache, clean): path for path in paths
+        }
+
+        def extracted() -> Iterator[tuple[Path, str]]:
+            nonlocal gen_start
+            for future in as_completed(parse_futures):
+                path = parse_futures[future]
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.error("Falha ao extrair %s: %s", path, e)
+                    summary.failed[str(path)] = str(e)
+                    continue
+                parse_stats.items += 1
+                if gen_start is None:
+                    gen_start = time.perf_counter()
+                yield path, text
+            parse_stats.seconds = time.perf_counter() - t0
+
+        results: dict[Path, list[AnkiCard]] = {}
+        if dedupe_passages:
+            gen_stats.unit = "passagens"
+            passages = PassageIndex(threshold=passage_threshold)
+            parsed: set[Path] = set()
+
+            def items() -> Iterator[SourceItem]:
+                for path, text in extracted():
+                    parsed.add(path)
+                    for passage, is_new in passages.add_document(str(path), text):
+                        if is_new:
+                            yield SourceItem(item_id=passage.passage_id, text=passage.text)
+
+            by_passage = dict(
+                generate_cards_batched_iter(
+                    items(),
+                    topic=topic,
+                    difficulty=difficulty,
+                    include_legal_basis=include_legal_basis,
+                    card_type=card_type,
+                    cards_per_item=cards_per_passage,
+                    llm_client=llm_client,
+                    max_workers=max_workers,
+                    route_by_type=route_by_type,
+                    use_citations=use_citations,
+                )
+            )
+            for path in paths:
+                if path not in parsed:
+                    continue
+                cards = [
+                    card
+                    for passage_id in passages.passages_of(str(path))
+                    for card in by_passage.get(passage_id, [])
+                ]
+                results[path] = _tag_source(dedupe(cards)[:max_cards_per_file], sources[path])
+            summary.passages = passages.total
+            summary.unique_passages = gen_stats.items = len(passages)
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as gen_pool:
+                chunk_futures: dict[Path, list[Future[list[AnkiCard]]]] = {}
+                for path, text in extracted():
+                    chunks = [c for c in chunk_text(text) if c.strip()]
+                    chunk_futures[path] = [gen_pool.submit(generate, c) for c in chunks]
+                    gen_stats.items += len(chunks)
+
+                for path in paths:
+                    if path not in chunk_futures:
+                        continue
+                    cards = []
+                    for future in chunk_futures[path]:
+                        try:
+                            cards.extend(future.result())
+                        except Exception as e:
+                            logger.warning("Erro ao gerar chunk de %s: %s", path.name, e)
+                    results[path] = _tag_source(dedupe(cards)[:max_cards_per_file], sources[path])
+        gen_stats.seconds = time.perf_counter() - (gen_start or t0)
+
+    t1 = time.perf_counter()
+    if merged_output is not None:
+        merged = dedupe([c for cards in results.values() for c in cards])
+        if merged:
+            summary.outputs.append(
+                str(export_cards(merged, merged_output, format=output_format))
+            )
+            if card_index is not None:
+                card_index.add(merged)
+        summary.cards = export_stats.items = len(merged)
+    else:
+        out_dir = Path(output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        used: set[str] = set()
+        for path, cards in results.items():
+            if not cards:
+                logger.warning("Nenhum card gerado para %s", path.name)
+                continue
+            # "lei.pdf" e "outra/lei.txt" não podem sobrescrever um ao outro
+            name = path.stem
+            n = 1
+            while name in used:
+                n += 1
+                name = f"{path.stem}_{n}"
+            used.add(name)
+            target = out_dir / f"{name}.{output_format}"
+            deck_name = sources[path].rsplit(".", 1)[0]
+            try:
+                output = export_cards(cards, target, format=output_format, deck_name=deck_name)
+            except Exception as e:
+                logger.error("Falha ao exportar %s: %s", path, e)
+                summary.failed[str(path)] = str(e)
+                continue
+            summary.outputs.append(str(output))
+            if card_index is not None:
+                card_index.add(cards)
+            summary.cards += len(cards)
+        export_stats.items = summary.cards
+    export_stats.seconds = time.perf_counter() - t1
+
+    summary.stages = [parse_stats, gen_stats, export_stats]
+    logger.info("Lote concluído: %s", summary.format())
+    return summary
+
+
+def _source_name(path: Path, root: Path | str | None) -> str:
+    """Caminho da entrada relativo à raiz do lote, com "/" (ou o nome, se fora dela)."""
+    try:
+        return path.relative_to(root).as_posix() if root is not None else path.name
+    except ValueError:
+        return path.name
+
+
+def _tag_source(cards: list[AnkiCard], source: str) -> list[AnkiCard]:
+    """Registra o arquivo de origem nos cards (entra no GUID das notas)."""
+    return [with_source(card, source) for card in cards]
@@ -1,6 +1,8 @@
 """System prompts para geração de cards Anki."""
 
+import hashlib
 import json
+from functools import lru_cache
 
 LEGAL_BASIS_INSTRUCTION = """
 - **Fundamento legal**: SEMPRE inclua o fundamento legal (artigo, inciso, súmula, ADI, ADC, RE, etc.)
@@ -47,6 +49,33 @@ TAGS_VOCABULARY = """
 - `jurisprudencia_stj`
 """
 
+# Descrição de cada tipo de card. Mantidas fora do template principal para
+# que prompts de tipo fixo incluam apenas a seção relevante.
+CARD_TYPE_SECTIONS = {
+    "basic": """### basic
+- Pergunta direta no front, resposta no back
+- Use para conceitos, definições, distinções""",
+    "cloze": """### cloze
+- Use {{c1::texto}} para criar lacunas
+- Ideal para memorização de textos legais, requisitos, elementos
+- Máximo de 2-3 clozes por card""",
+    "questao": """### questao
+- Para questões no estilo de concurso (CESPE, FCC, FGV, etc.)
+- OBRIGATÓRIO: preencher extra.banca e extra.ano
+- Inclua o cargo quando disponível""",
+    "jurisprudencia": """### jurisprudencia
+- Para súmulas, teses de repercussão geral, julgados importantes
+- OBRIGATÓRIO: preencher extra.tribunal e extra.tema
+- Inclua extra.data_julgamento quando disponível""",
+}
+
+EXTRA_FIELDS_BY_TYPE = {
+    "basic": '- basic: { "fundamento": "..." } (opcional)',
+    "cloze": '- cloze: { "fundamento": "..." } (opcional)',
+    "questao": '- questao: { "banca": "...", "ano": "...", "cargo": "...", "fundamento": "..." }',
+    "jurisprudencia": '- jurisprudencia: { "tribunal": "...", "data_julgamento": "...", "tema": "...", "fundamento_legal": "..." }',
+}
+
 SYSTEM_PROMPT_BASE = """
 Você é um especialista em Direito Constitucional brasileiro, professor experiente focado em
 preparação para concursos públicos de alto nível (Magistratura, MP, Defensoria, Advocacia Pública).
@@ -80,24 +109,7 @@ Sua tarefa é gerar flashcards Anki de alta qualidade seguindo estas regras:
 
 ## TIPOS DE CARD
 
-### basic
-- Pergunta direta no front, resposta no back
-- Use para conceitos, definições, distinções
-
-### cloze
-- Use {{{{c1::texto}}}} para criar lacunas
-- Ideal para memorização de textos legais, requisitos, elementos
-- Máximo de 2-3 clozes por card
-
-### questao
-- Para questões no estilo de concurso (CESPE, FCC, FGV, etc.)
-- OBRIGATÓRIO: preencher extra.banca e extra.ano
-- Inclua o cargo quando disponível
-
-### jurisprudencia
-- Para súmulas, teses de repercussão geral, julgados importantes
-- OBRIGATÓRIO: preencher extra.tribunal e extra.tema
-- Inclua extra.data_julgamento quando disponível
+{card_type_sections}
 
 {auto_type_heuristics}
 
@@ -106,15 +118,12 @@ Sua tarefa é gerar flashcards Anki de alta qualidade seguindo estas regras:
 Cada card deve ter:
 - front: texto da pergunta ou cloze
 - back: texto da resposta
-- card_type: "basic", "cloze", "questao" ou "jurisprudencia"
+- card_type: {card_type_values}
 - tags: lista de tags descritivas (topic será adicionado automaticamente)
 - extra: objeto com campos adicionais conforme o tipo
 
 ### Campos extra por tipo:
-- basic: {{ "fundamento": "..." }} (opcional)
-- cloze: {{ "fundamento": "..." }} (opcional)
-- questao: {{ "banca": "...", "ano": "...", "cargo": "...", "fundamento": "..." }}
-- jurisprudencia: {{ "tribunal": "...", "data_julgamento": "...", "tema": "...", "fundamento_legal": "..." }}
+{extra_fields}
 
 ## TAGS
 
@@ -194,10 +203,15 @@ EXAMPLE_CARDS = [
 ]
 
 
-def _format_examples() -> str:
-    """Formata os exemplos para inclusão no prompt."""
-    lines = ["Abaixo estão exemplos de cards bem formatados para cada tipo:\n"]
-    for card in EXAMPLE_CARDS:
+def _format_examples(card_type: str | None = None) -> str:
+    """Formata os exemplos para inclusão no prompt (opcionalmente de um só tipo)."""
+    if card_type is None:
+        lines = ["Abaixo estão exemplos de cards bem formatados para cada tipo:\n"]
+        examples = EXAMPLE_CARDS
+    else:
+        lines = [f"Abaixo está um exemplo de card bem formatado do tipo {card_type}:\n"]
+        examples = [c for c in EXAMPLE_CARDS if c["card_type"] == card_type]
+    for card in examples:
         lines.append(f"### Exemplo ({card['card_type']})")
         lines.append("```json")
         lines.append(json.dumps(card, ensure_ascii=False, indent=2))
@@ -205,11 +219,22 @@ def _format_examples() -> str:
     return "\n".join(lines)
 
 
+def _format_type_values(types: list[str]) -> str:
+    """Formata a lista de tipos aceitos (ex: '"basic", "cloze" ou "questao"')."""
+    quoted = [f'"{t}"' for t in types]
+    if len(quoted) == 1:
+        return quoted[0]
+    return f"{', '.join(quoted[:-1])} ou {quoted[-1]}"
+
+
 _VALID_DIFFICULTIES = {"facil", "medio", "dificil"}
 
 
 def build_system_prompt(
-    *, include_legal_basis: bool = True, difficulty: str = "medio"
+    *,
+    include_legal_basis: bool = True,
+    difficulty: str = "medio",
+    card_type: str | None = None,
 ) -> str:
     """
     Constrói o system prompt para o LLM.
@@ -217,12 +242,15 @@ def build_system_prompt(
     Args:
         include_legal_basis: Se True, inclui instrução para sempre citar fundamento legal
         difficulty: Nível de dificuldade dos cards (facil, medio, dificil)
+        card_type: Se informado (ex: "cloze"), gera um prompt específico para o
+                   tipo, sem heurísticas de seleção automática e com apenas a
+                   seção e o exemplo desse tipo. None ou "auto" mantém todos.
 
     Returns:
         System prompt formatado
 
     Raises:
-        ValueError: Se difficulty não for um valor válido
+        ValueError: Se difficulty ou card_type não forem valores válidos
     """
     if difficulty not in _VALID_DIFFICULTIES:
         raise ValueError(
@@ -230,13 +258,43 @@ def build_system_prompt(
             f"recebido: '{difficulty}'"
         )
 
+    if card_type == "auto":
+        card_type = None
+    if card_type == "basic_reversed":
+        card_type = "basic"
+    if card_type is not None and card_type not in CARD_TYPE_SECTIONS:
+        raise ValueError(
+            f"card_type deve ser um de {sorted(CARD_TYPE_SECTIONS)}, "
+            f"recebido: '{card_type}'"
+        )
+
     legal_instruction = LEGAL_BASIS_INSTRUCTION if include_legal_basis else ""
+    types = list(CARD_TYPE_SECTIONS) if card_type is None else [card_type]
 
     return SYSTEM_PROMPT_BASE.format(
         legal_basis_instruction=legal_instruction,
         anti_hallucination_instruction=ANTI_HALLUCINATION_INSTRUCTION,
-        auto_type_heuristics=AUTO_TYPE_HEURISTICS,
+        card_type_sections="\n\n".join(CARD_TYPE_SECTIONS[t] for t in types),
+        auto_type_heuristics=AUTO_TYPE_HEURISTICS if card_type is None else "",
+        card_type_values=_format_type_values(types),
+        extra_fields="\n".join(EXTRA_FIELDS_BY_TYPE[t] for t in types),
         tags_vocabulary=TAGS_VOCABULARY,
         dificuldade=difficulty,
-        examples=_format_examples(),
+        examples=_format_examples(card_type),
     )
+
+
+@lru_cache(maxsize=1)
+def prompt_version() -> str:
+    """
+    Identificador curto da versão dos prompts.
+
+    Hash do system prompt completo (todos os tipos e exemplos): muda sempre
+    que instruções, vocabulário de tags ou exemplos mudam, permitindo saber
+    com que prompt uma exportação foi gerada.
+
+    Returns:
+        12 dígitos hexadecimais
+    """
+    prompt = build_system_prompt()
+    return hashlib.blake2b(prompt.encode(), digest_size=6).hexdigest()
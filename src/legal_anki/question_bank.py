@@ -0,0 +1,248 @@
+"""Conversão direta de bancos de questões em CSV para cards, sem LLM.
+
+CSVs exportados de bancos de questões já trazem colunas como enunciado,
+gabarito, banca, ano, cargo e fundamento. Passá-los pelo LLM como texto
+corrido é lento e caro quando um mapeamento direto para cards
+``CardType.QUESTAO`` resolve. Este módulo detecta as colunas pelo cabeçalho,
+converte cada linha em um card validado e, opcionalmente, envia ao LLM apenas
+as linhas sem fundamento, para enriquecimento.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .batching import SourceItem, generate_cards_batched_iter
+from .citations import extract_citations, fill_extra
+from .config import CardType
+from .generator import postprocess_cards
+from .models import AnkiCard
+from .parsers import CsvRow, ParseError, iter_csv_rows
+from .utils import slugify_tag
+from .validators import CardValidationError, validate_card
+
+if TYPE_CHECKING:
+    from .llm.protocol import LLMClient
+
+logger = logging.getLogger(__name__)
+
+# Nomes aceitos para cada campo (comparados após slugify: sem acento, minúsculo)
+COLUMN_ALIASES: dict[str, tuple[str, ...]] = {
+    "enunciado": ("enunciado", "questao", "pergunta", "front"),
+    "gabarito": ("gabarito", "resposta", "back"),
+    "banca": ("banca", "organizadora"),
+    "ano": ("ano",),
+    "cargo": ("cargo", "orgao_cargo"),
+    "fundamento": ("fundamento", "fundamentacao", "fundamento_legal", "comentario"),
+    "tags": ("tags", "assunto", "tema"),
+}
+
+_REQUIRED_COLUMNS = ("enunciado", "gabarito")
+_TAG_SPLIT_RE = re.compile(r"[,;]")
+
+
+def detect_columns(fieldnames: Iterable[str]) -> dict[str, str]:
+    """
+    Mapeia os campos do card para as colunas do CSV.
+
+    Args:
+        fieldnames: Nomes das colunas do cabeçalho
+
+    Returns:
+        Dicionário campo -> nome da coluna no CSV (apenas campos encontrados)
+
+    Raises:
+        ParseError: Se faltar a coluna de enunciado ou de gabarito
+    """
+    by_slug = {slugify_tag(name): name for name in fieldnames}
+    columns: dict[str, str] = {}
+    # Com mais de um alias presente, vale o primeiro da lista
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in by_slug:
+                columns[field] = by_slug[alias]
+                break
+
+    missing = [field for field in _REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        raise ParseError(
+            f"CSV sem coluna(s) obrigatória(s): {', '.join(missing)}. "
+            f"Aceitas: {', '.join(a for f in missing for a in COLUMN_ALIASES[f])}"
+        )
+    return columns
+
+
+def row_to_card(
+    values: dict[str, str],
+    columns: dict[str, str],
+    topic: str,
+    difficulty: str = "medio",
+    fundamento: str | None = None,
+) -> AnkiCard:
+    """
+    Converte uma linha do banco de questões em um card de questão validado.
+
+    Banca, ano e cargo ausentes nas colunas são buscados no próprio
+    enunciado (ex.: "(CESPE/2022 - Juiz Federal)").
+
+    Args:
+        values: Células da linha, por nome de coluna
+        columns: Mapeamento retornado por ``detect_columns``
+        topic: Tópico principal (vira tag)
+        difficulty: Nível de dificuldade (vira tag)
+        fundamento: Fundamento a usar no lugar da coluna (enriquecimento)
+
+    Returns:
+        AnkiCard do tipo questão
+
+    Raises:
+        CardValidationError: Se a linha não formar um card válido
+    """
+
+    def cell(field: str) -> str:
+        column = columns.get(field)
+        return values.get(column, "").strip() if column else ""
+
+    fundamento = fundamento or cell("fundamento")
+    back = f"Gabarito: {cell('gabarito')}"
+    if fundamento:
+        back += f"\n\nFundamento: {fundamento}"
+
+    extra = {
+        key: value
+        for key in ("banca", "ano", "cargo")
+        if (value := cell(key))
+    }
+    if fundamento:
+        extra["fundamento"] = fundamento
+
+    enunciado = cell("enunciado")
+    try:
+        card = AnkiCard(
+            front=enunciado,
+            back=back,
+            card_type=CardType.QUESTAO,
+            tags=[t for t in _TAG_SPLIT_RE.split(cell("tags")) if t.strip()],
+            extra=extra,
+        )
+    except ValueError as e:
+        raise CardValidationError([str(e)]) from e
+
+    card = fill_extra(card, extract_citations(enunciado))
+    card = postprocess_cards([card], topic, difficulty)[0]
+    # Gabaritos curtos ("C", "Errado") são legítimos: o tamanho mínimo do
+    # verso não se aplica; o fundamento só é exigido quando informado.
+    validate_card(card, require_legal_basis=bool(fundamento), min_back_length=1)
+    return card
+
+
+def iter_question_bank(
+    path: Path,
+    topic: str,
+    difficulty: str = "medio",
+    columns: dict[str, str] | None = None,
+    enrich_missing: bool = False,
+    llm_client: "LLMClient | None" = None,
+    max_workers: int = 4,
+) -> Iterator[tuple[str, AnkiCard]]:
+    """
+    Converte um banco de questões em CSV em cards, linha a linha.
+
+    Sem ``enrich_missing``, nenhuma chamada ao LLM é feita. Com ele, as linhas
+    sem fundamento são relidas numa segunda passada e enviadas em lotes ao LLM
+    (``generate_cards_batched_iter``), que só fornece o fundamento: enunciado,
+    gabarito e metadados continuam vindo do CSV. Linhas inválidas são
+    registradas em log e ignoradas.
+
+    Args:
+        path: Caminho do CSV (com cabeçalho)
+        topic: Tópico principal dos cards
+        difficulty: Nível de dificuldade ("facil", "medio", "dificil")
+        columns: Mapeamento campo -> coluna. Default detecta pelo cabeçalho.
+        enrich_missing: Se True, envia ao LLM as linhas sem fundamento
+        llm_client: Cliente LLM para o enriquecimento (default OpenAI)
+        max_workers: Lotes de enriquecimento processados em paralelo
+
+    Yields:
+        Tuplas (item_id, card), com item_id no formato "<arquivo>:<linha>"
+
+    Raises:
+        ValueError: Se o tópico for vazio
+        ParseError: Se o CSV estiver vazio ou sem as colunas obrigatórias
+    """
+    if not topic or not topic.strip():
+        raise ValueError("Parâmetro 'topic' não pode ser vazio")
+    topic = topic.strip()
+
+    converted = skipped = pending = 0
+    for row in iter_csv_rows(path):
+        if columns is None:
+            columns = detect_columns(row.values)
+        if enrich_missing and _needs_enrichment(row, columns):
+            pending += 1
+            continue
+
+        item_id = _item_id(path, row)
+        try:
+            yield item_id, row_to_card(row.values, columns, topic, difficulty)
+            converted += 1
+        except CardValidationError as e:
+            skipped += 1
+            logger.warning("Linha %s ignorada: %s", item_id, e)
+
+    logger.info(
+        "Banco de questões %s: %d cards convertidos, %d linhas ignoradas",
+        path.name,
+        converted,
+        skipped,
+    )
+    if not pending or columns is None:
+        return
+
+    logger.info("Enriquecendo %d linhas sem fundamento via LLM", pending)
+    rows_by_id: dict[str, dict[str, str]] = {}
+
+    def items() -> Iterator[SourceItem]:
+        for row in iter_csv_rows(path):
+            if _needs_enrichment(row, columns):
+                item_id = _item_id(path, row)
+                rows_by_id[item_id] = row.values
+                yield SourceItem(item_id=item_id, text=row.text)
+
+    for item_id, cards in generate_cards_batched_iter(
+        items(),
+        topic=topic,
+        difficulty=difficulty,
+        card_type=CardType.QUESTAO.value,
+        cards_per_item=1,
+        llm_client=llm_client,
+        max_workers=max_workers,
+    ):
+        values = rows_by_id.pop(item_id)
+        fundamento = _fundamento_from(cards[0]) if cards else None
+        if not fundamento:
+            logger.warning("LLM não forneceu fundamento para %s", item_id)
+        try:
+            yield item_id, row_to_card(values, columns, topic, difficulty, fundamento)
+        except CardValidationError as e:
+            logger.warning("Linha %s ignorada: %s", item_id, e)
+
+
+def _needs_enrichment(row: CsvRow, columns: dict[str, str]) -> bool:
+    column = columns.get("fundamento")
+    return not (column and row.values.get(column, "").strip())
+
+
+def _item_id(path: Path, row: CsvRow) -> str:
+    return f"{path.name}:{row.number}"
+
+
+def _fundamento_from(card: AnkiCard) -> str | None:
+    """Extrai o fundamento de um card gerado pelo LLM."""
+    extra = card.extra or {}
+    fundamento = extra.get("fundamento") or extra.get("fundamento_legal")
+    return str(fundamento).strip() if fundamento else None
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from typing import TYPE_CHECKING
 
 from .config import CardType
@@ -10,6 +11,12 @@ if TYPE_CHECKING:
     from .models import AnkiCard
 
 
+class ExportError(Exception):
+    """Erro durante exportação."""
+
+    pass
+
+
 def map_card_to_fields(card: "AnkiCard") -> list[str]:
     """
     Mapeia um AnkiCard para os campos do modelo Anki correspondente.
@@ -50,3 +57,72 @@ def map_card_to_fields(card: "AnkiCard") -> list[str]:
 
     # basic e basic_reversed
     return [card.front, card.back]
+
+
+def sanitize_text(text: str | None, separator_char: str = ";") -> str:
+    """
+    Remove quebras de linha e caracteres problemáticos para CSV/TSV.
+
+    Args:
+        text: Texto original (None vira string vazia)
+        separator_char: Separador de colunas do formato, trocado por espaço
+
+    Returns:
+        Texto numa única linha, sem o separador e sem espaços nas pontas
+    """
+    if not text:
+        return ""
+    # Remove tabs (se for o separador), newlines e carriage returns
+    return (
+        text.replace("\n", " ").replace("\r", "").replace(separator_char, " ").strip()
+    )
+
+
+class SerializedCard:
+    """
+    Valores de exportação de um card, calculados uma única vez.
+
+    Na exportação para vários formatos (``exporters.export_multi``) cada card
+    vira um só ``SerializedCard``, compartilhado pelos escritores: o que mais
+    de um formato usa (tags sanitizadas, front/verso sem quebras de linha) é
+    calculado uma vez. Só as partes pedidas em ``parts`` (a união do ``uses``
+    dos escritores) são calculadas; as demais ficam ausentes.
+    """
+
+    __slots__ = (
+        "card",
+        "front_line",
+        "back_line",
+        "tags_text",
+        "extra_text",
+        "json_text",
+        "json_line",
+        "fields",
+    )
+
+    def __init__(self, card: AnkiCard, parts: frozenset[str] | set[str]):
+        """
+        Args:
+            card: Card a serializar
+            parts: Atributos a calcular (ex.: {"tags_text", "fields"})
+        """
+        self.card = card
+        # Front/verso sem quebras de linha; cada formato troca depois o seu
+        # separador e remove os espaços das pontas (ver sanitize_text)
+        if "front_line" in parts:
+            self.front_line = card.front.replace("\n", " ").replace("\r", "")
+        if "back_line" in parts:
+            self.back_line = card.back.replace("\n", " ").replace("\r", "")
+        if "tags_text" in parts:
+            self.tags_text = sanitize_text(" ".join(card.tags))
+        if "extra_text" in parts:
+            extra = card.extra
+            self.extra_text = (
+                sanitize_text(json.dumps(extra, ensure_ascii=False)) if extra else ""
+            )
+        if "json_text" in parts:
+            self.json_text = card.model_dump_json(indent=2)
+        if "json_line" in parts:
+            self.json_line = card.model_dump_json()
+        if "fields" in parts:
+            self.fields = map_card_to_fields(card)
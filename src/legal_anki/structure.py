@@ -0,0 +1,278 @@
+"""Índice estrutural de textos normativos (artigo, parágrafo, inciso, alínea).
+
+Os parsers devolvem texto corrido: nada adiante sabe onde termina o Art. 5º
+ou a qual inciso pertence uma frase. Este módulo percorre o texto uma única
+vez com uma expressão regular combinada e monta a hierarquia de dispositivos
+com offsets, permitindo consultas como ``index["art5"]["LXIII"]``, localizar o
+dispositivo de um offset (atribuição de fonte), resolver citações como
+"art. 5º, § 1º" e gerar segmentos alinhados a artigos para o chunking.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+from collections.abc import Iterator
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+DispositivoKind = Literal["artigo", "paragrafo", "inciso", "alinea"]
+
+_LEVELS: dict[str, int] = {"artigo": 0, "paragrafo": 1, "inciso": 2, "alinea": 3}
+
+# Marcadores reconhecidos apenas no início da linha; títulos e capítulos
+# encerram todos os dispositivos abertos.
+_MARKER_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"(?P<artigo>Art\.?\s*(?P<art_num>\d{1,3}(?:\.\d{3})*)\s*(?:[º°o]\.?)?"
+    r"(?:\s*-\s*(?P<art_suf>[A-Z])\b)?)"
+    r"|(?P<paragrafo>§\s*(?P<par_num>\d+)\s*(?:[º°o]\.?)?(?:\s*-\s*(?P<par_suf>[A-Z])\b)?)"
+    r"|(?P<unico>Par[áa]grafo\s+[úu]nico)"
+    r"|(?P<inciso>(?P<inc_num>[IVXLCDM]+)(?:\s*-\s*(?P<inc_suf>[A-Z])\b)?\s*[-–—])"
+    r"|(?P<alinea>(?P<ali_num>[a-z])\))"
+    r"|(?P<adct>ATO\s+DAS\s+DISPOSI[ÇC][ÕO]ES\s+CONSTITUCIONAIS\s+TRANSIT[ÓO]RIAS)"
+    r"|(?P<heading>(?:T[ÍI]TULO|CAP[ÍI]TULO|LIVRO|PARTE|SE[ÇC][ÃA]O|Se[çc][ãa]o|"
+    r"SUBSE[ÇC][ÃA]O|Subse[çc][ãa]o)\s+[IVXLCDM]+\b)"
+    r")",
+    re.MULTILINE,
+)
+
+# Citações no formato usual: "art. 5º, § 1º, inciso LXIII, alínea a"
+_REF_ART_RE = re.compile(
+    r"\bart(?:igo)?\.?\s*(?P<num>\d{1,3}(?:\.\d{3})*)\s*(?:[º°o]\.?)?(?:\s*-\s*(?P<suf>[A-Z])\b)?",
+    re.IGNORECASE,
+)
+_REF_PAR_RE = re.compile(
+    r"§\s*(?P<num>\d+)\s*(?:[º°o])?|(?P<unico>par[áa]grafo\s+[úu]nico)", re.IGNORECASE
+)
+_REF_INC_RE = re.compile(r"(?:\binciso\s+|,\s*)(?P<num>[IVXLCDM]+)\b")
+_REF_ALI_RE = re.compile(r"(?:\bal[íi]nea\s+|,\s*)[\"“]?(?P<num>[a-z])[\"”]?(?:\)|\b)")
+_ADCT_RE = re.compile(r"\bADCT\b|Disposi[çc][õo]es\s+Constitucionais\s+Transit[óo]rias", re.I)
+
+_ADCT_PREFIX = "adct."
+
+
+class Dispositivo(BaseModel):
+    """Um dispositivo do texto normativo e seus filhos diretos."""
+
+    kind: DispositivoKind
+    label: str = Field(..., description="Numeração normalizada: '5', '103-A', 'LXIII', 'a'")
+    key: str = Field(..., description="Chave no nível do pai: 'art5', 'par1', 'LXIII', 'a'")
+    ref: str = Field(..., description="Citação completa, ex.: 'art. 5º, LXIII'")
+    start: int
+    end: int
+    children: dict[str, Dispositivo] = Field(default_factory=dict)
+
+    def __getitem__(self, key: str) -> Dispositivo:
+        return self.children[_normalize_key(key)]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and _normalize_key(key) in self.children
+
+    def get(self, key: str) -> Dispositivo | None:
+        """Retorna o filho com a chave informada, ou None."""
+        return self.children.get(_normalize_key(key))
+
+
+class LegalIndex:
+    """Índice dos dispositivos de um texto normativo, com offsets no texto."""
+
+    def __init__(self, text: str, articles: dict[str, Dispositivo], nodes: list[Dispositivo]):
+        self.text = text
+        self.articles = articles
+        self._nodes = nodes
+        self._starts = [node.start for node in nodes]
+
+    def __getitem__(self, key: str) -> Dispositivo:
+        return self.articles[_normalize_key(key)]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and _normalize_key(key) in self.articles
+
+    def __iter__(self) -> Iterator[Dispositivo]:
+        return iter(self.articles.values())
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def get(self, key: str) -> Dispositivo | None:
+        """Retorna o artigo com a chave informada, ou None."""
+        return self.articles.get(_normalize_key(key))
+
+    def text_of(self, node: Dispositivo) -> str:
+        """Retorna o texto do dispositivo (incluindo os filhos)."""
+        return self.text[node.start : node.end].strip()
+
+    def locate(self, offset: int) -> Dispositivo | None:
+        """
+        Retorna o dispositivo mais específico que contém o offset.
+
+        Args:
+            offset: Posição no texto indexado
+
+        Returns:
+            Dispositivo mais profundo que contém a posição, ou None se ela
+            estiver fora de qualquer artigo (preâmbulo, títulos, capítulos)
+        """
+        i = bisect.bisect_right(self._starts, offset) - 1
+        if i < 0:
+            return None
+        node = self._nodes[i]
+        return node if offset < node.end else None
+
+    def resolve(self, citation: str) -> Dispositivo | None:
+        """
+        Resolve uma citação textual para o dispositivo correspondente.
+
+        Aceita formatos como "art. 5º, LXIII", "Art. 5º, § 1º",
+        "art. 14, § 3º, inciso VI, alínea a" e "art. 2º do ADCT".
+
+        Args:
+            citation: Citação a resolver
+
+        Returns:
+            Dispositivo citado, ou None se ele não existir no texto indexado
+        """
+        art = _REF_ART_RE.search(citation)
+        if not art:
+            return None
+        label = _article_label(art["num"], art["suf"])
+        prefix = _ADCT_PREFIX if _ADCT_RE.search(citation) else ""
+        node = self.articles.get(f"{prefix}art{label}")
+        rest = citation[art.end() :]
+
+        par = _REF_PAR_RE.search(rest)
+        if node is not None and par:
+            node = node.children.get("parunico" if par["unico"] else f"par{par['num']}")
+            rest = rest[par.end() :]
+
+        inc = _REF_INC_RE.search(rest)
+        if node is not None and inc:
+            node = node.children.get(inc["num"])
+            rest = rest[inc.end() :]
+
+        ali = _REF_ALI_RE.search(rest)
+        if node is not None and ali:
+            node = node.children.get(ali["num"])
+
+        return node
+
+    def segments(self) -> Iterator[str]:
+        """
+        Gera o texto de cada artigo, na ordem do documento.
+
+        Pensado para alimentar ``generate_cards_iter``: os chunks passam a
+        terminar em fronteiras de artigo em vez de no meio de um inciso.
+        """
+        for article in self.articles.values():
+            yield self.text_of(article)
+
+
+def build_index(text: str) -> LegalIndex:
+    """
+    Constrói o índice estrutural de um texto normativo em uma única passada.
+
+    Cada dispositivo termina onde começa o próximo de nível igual ou superior,
+    ou em um título/capítulo/seção. A partir do "Ato das Disposições
+    Constitucionais Transitórias" os artigos recebem o prefixo ``adct.``
+    (``index["adct.art2"]``). Numerações repetidas mantêm a primeira ocorrência.
+
+    Args:
+        text: Texto extraído (lei seca, CF/88, código)
+
+    Returns:
+        LegalIndex com os artigos e seus dispositivos
+    """
+    articles: dict[str, Dispositivo] = {}
+    nodes: list[Dispositivo] = []
+    stack: list[Dispositivo] = []
+    prefix = ""
+
+    def close(level: int, pos: int) -> None:
+        while stack and _LEVELS[stack[-1].kind] >= level:
+            stack.pop().end = pos
+
+    for m in _MARKER_RE.finditer(text):
+        pos = m.start()
+        group = m.lastgroup
+
+        if group in ("adct", "heading"):
+            close(0, pos)
+            if group == "adct":
+                prefix = _ADCT_PREFIX
+            continue
+
+        if group == "artigo":
+            kind: DispositivoKind = "artigo"
+            label = _article_label(m["art_num"], m["art_suf"])
+            key = f"{prefix}art{label}"
+        elif group == "paragrafo":
+            kind = "paragrafo"
+            label = m["par_num"] + (f"-{m['par_suf']}" if m["par_suf"] else "")
+            key = f"par{label.lower()}"
+        elif group == "unico":
+            kind, label, key = "paragrafo", "único", "parunico"
+        elif group == "inciso":
+            kind = "inciso"
+            label = m["inc_num"] + (f"-{m['inc_suf']}" if m["inc_suf"] else "")
+            key = label
+        else:
+            kind, label = "alinea", m["ali_num"]
+            key = label
+
+        close(_LEVELS[kind], pos)
+        siblings = articles if kind == "artigo" else stack[-1].children if stack else None
+        if siblings is None or key in siblings:
+            # Dispositivo fora de artigo ou numeração repetida: não indexa
+            continue
+
+        parent_ref = stack[-1].ref if stack else ""
+        node = Dispositivo(
+            kind=kind,
+            label=label,
+            key=key,
+            ref=_format_ref(kind, label, parent_ref, adct=bool(prefix)),
+            start=pos,
+            end=len(text),
+        )
+        siblings[key] = node
+        nodes.append(node)
+        stack.append(node)
+
+    close(0, len(text))
+    return LegalIndex(text, articles, nodes)
+
+
+def _article_label(num: str, suffix: str | None) -> str:
+    """Normaliza a numeração do artigo: '1.228' → '1228', ('103', 'A') → '103-a'."""
+    label = num.replace(".", "")
+    return f"{label}-{suffix.lower()}" if suffix else label
+
+
+def _ordinal(label: str) -> str:
+    """Aplica o ordinal usado na legislação (1º a 9º) ao número do dispositivo."""
+    base, _, suffix = label.partition("-")
+    text = f"{base}º" if base.isdigit() and int(base) < 10 else base
+    return f"{text}-{suffix.upper()}" if suffix else text
+
+
+def _format_ref(kind: str, label: str, parent_ref: str, adct: bool) -> str:
+    if kind == "artigo":
+        return f"art. {_ordinal(label)}" + (" do ADCT" if adct else "")
+    if kind == "paragrafo":
+        part = "parágrafo único" if label == "único" else f"§ {_ordinal(label)}"
+    else:
+        part = label
+    base, sep, tail = parent_ref.partition(" do ADCT")
+    return f"{base}, {part}{sep}{tail}"
+
+
+def _normalize_key(key: str) -> str:
+    """Normaliza chaves de consulta: '§ 1º' → 'par1', 'Art. 5º' → 'art5'."""
+    raw = key.strip()
+    if re.fullmatch(r"[IVXLCDM]+(?:-[A-Z])?", raw) or re.fullmatch(r"[a-z]", raw):
+        return raw
+    norm = re.sub(r"[\sº°]|(?<=\d)\.(?=\d)|(?<=art)\.(?!$)|\.$", "", raw.lower())
+    norm = norm.replace("§", "par").replace("parágrafo", "par").replace("artigo", "art")
+    return norm.replace("único", "unico")
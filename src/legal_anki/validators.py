@@ -84,7 +84,7 @@ def validate_card(
 
     # Validação de fundamento legal
     if require_legal_basis:
-        has_fundamento = _check_legal_basis(card)
+        has_fundamento = has_legal_basis(card)
         if not has_fundamento:
             errors.append("Card sem fundamento legal (art., súmula, ADI, etc.)")
 
@@ -94,11 +94,17 @@ def validate_card(
     return True
 
 
-def _check_legal_basis(card: "AnkiCard") -> bool:
+def has_legal_basis(card: "AnkiCard") -> bool:
     """
     Verifica se o card contém fundamento legal.
 
     Procura em extra.fundamento, extra.fundamento_legal ou no próprio back.
+
+    Args:
+        card: Card a verificar
+
+    Returns:
+        True se houver fundamento no ``extra`` ou referência legal no verso
     """
     # Verifica em extra
     if card.extra:
@@ -183,3 +183,37 @@ class TestAnkiConnectNotes:
         client.sync()  # Não deve levantar exceção
         payload = mock_post.call_args.kwargs.get("json") or mock_post.call_args[1].get("json")
         assert payload["action"] == "sync"
+
+    @patch("legal_anki.anki_connect.httpx.post")
+    def test_add_cards_batch_skips_known_cards(self, mock_post, sample_cards):
+        """Cards já presentes no índice não são enviados ao addNotes."""
+        from legal_anki.card_index import CardIndex
+
+        index = CardIndex(":memory:")
+        index.add([sample_cards[1]])
+        mock_post.return_value = _mock_response(result=[10, 11, 12])
+        client = AnkiConnectClient()
+
+        result = client.add_cards_batch(sample_cards, deck_name="Test", card_index=index)
+
+        assert result == [10, None, 11, 12]
+        payload = mock_post.call_args.kwargs.get("json") or mock_post.call_args[1].get("json")
+        assert len(payload["params"]["notes"]) == 3
+        assert all(index.is_anki_duplicate(card) for card in sample_cards)
+
+    @patch("legal_anki.anki_connect.httpx.post")
+    def test_iter_notes_info_pages(self, mock_post):
+        """findNotes uma vez, notesInfo em páginas."""
+        mock_post.side_effect = [
+            _mock_response(result=[1, 2, 3]),
+            _mock_response(result=[{"noteId": 1}, {"noteId": 2}]),
+            _mock_response(result=[{"noteId": 3}]),
+        ]
+        client = AnkiConnectClient()
+
+        infos = list(client.iter_notes_info("deck:CF", page_size=2))
+
+        assert [i["noteId"] for i in infos] == [1, 2, 3]
+        actions = [c.kwargs["json"]["action"] for c in mock_post.call_args_list]
+        assert actions == ["findNotes", "notesInfo", "notesInfo"]
+        assert mock_post.call_args_list[2].kwargs["json"]["params"] == {"notes": [3]}
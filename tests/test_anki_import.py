@@ -0,0 +1,120 @@
+"""Testes para a leitura de notas de coleções Anki existentes."""
+
+import hashlib
+import zipfile
+
+import genanki
+import pytest
+
+from legal_anki.anki_import import (
+    ApkgImportError,
+    anki_checksum,
+    iter_anki_connect_notes,
+    iter_apkg_notes,
+    strip_html_media,
+)
+
+
+def _write_apkg(path, notes):
+    model = genanki.Model(
+        1607392319,
+        "Basico Antigo",
+        fields=[{"name": "Frente"}, {"name": "Verso"}],
+        templates=[{"name": "Card 1", "qfmt": "{{Frente}}", "afmt": "{{Verso}}"}],
+    )
+    deck = genanki.Deck(2059400110, "Constitucional")
+    for fields, tags in notes:
+        deck.add_note(genanki.Note(model=model, fields=fields, tags=tags))
+    genanki.Package(deck).write_to_file(str(path))
+    return path
+
+
+class TestChecksum:
+    """Testes para o checksum do primeiro campo."""
+
+    def test_strip_html_media_keeps_image_names(self):
+        """Tags somem, nomes de imagem e entidades ficam como texto."""
+        text = '<b>ADI</b>&nbsp;&amp; ADC <img src="stf.png"><!-- nota -->'
+        assert strip_html_media(text) == "ADI & ADC  stf.png "
+
+    def test_checksum_matches_anki(self):
+        """SHA-1 do campo sem HTML, primeiros 8 dígitos hexadecimais."""
+        expected = int(hashlib.sha1("O que é ADI?".encode()).hexdigest()[:8], 16)
+        assert anki_checksum("<div>O que é ADI?</div>") == expected
+
+
+class TestIterApkgNotes:
+    """Testes para iter_apkg_notes."""
+
+    def test_reads_notes_with_model_and_tags(self, tmp_path):
+        """Lê campos, tags e nome do note type da coleção do pacote."""
+        path = _write_apkg(
+            tmp_path / "antigo.apkg",
+            [
+                (["O que é <b>ADI</b>?", "Ação direta."], ["stf", "controle"]),
+                (["O que é ADC?", "Ação declaratória."], []),
+            ],
+        )
+
+        notes = list(iter_apkg_notes(path))
+
+        assert [n.fields for n in notes] == [
+            ["O que é <b>ADI</b>?", "Ação direta."],
+            ["O que é ADC?", "Ação declaratória."],
+        ]
+        assert notes[0].model == "Basico Antigo"
+        assert notes[0].tags == ["stf", "controle"]
+        assert notes[0].checksum == anki_checksum("O que é ADI?")
+
+    def test_rejects_invalid_packages(self, tmp_path):
+        """Arquivos que não são zip ou não têm coleção levantam ApkgImportError."""
+        not_zip = tmp_path / "x.apkg"
+        not_zip.write_text("texto")
+        with pytest.raises(ApkgImportError):
+            list(iter_apkg_notes(not_zip))
+
+        empty = tmp_path / "vazio.apkg"
+        with zipfile.ZipFile(empty, "w") as zf:
+            zf.writestr("media", "{}")
+        with pytest.raises(ApkgImportError, match="não contém"):
+            list(iter_apkg_notes(empty))
+
+    def test_rejects_compressed_collection(self, tmp_path):
+        """Pacotes só com collection.anki21b pedem reexportação."""
+        path = tmp_path / "novo.apkg"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("collection.anki2", b"")
+            zf.writestr("collection.anki21b", b"")
+        with pytest.raises(ApkgImportError, match="versões antigas"):
+            list(iter_apkg_notes(path))
+
+
+class TestIterAnkiConnectNotes:
+    """Testes para iter_anki_connect_notes."""
+
+    def test_pages_notes_info(self):
+        """Pede notesInfo em páginas e ordena os campos pela ordem do modelo."""
+
+        class FakeClient:
+            def __init__(self):
+                self.pages = []
+
+            def iter_notes_info(self, query, page_size):
+                self.pages.append((query, page_size))
+                yield {
+                    "noteId": 7,
+                    "modelName": "Basic",
+                    "tags": ["stf"],
+                    "fields": {
+                        "Back": {"value": "Verso", "order": 1},
+                        "Front": {"value": "Frente", "order": 0},
+                    },
+                }
+
+        client = FakeClient()
+        notes = list(iter_anki_connect_notes(client, "deck:CF", page_size=2))
+
+        assert client.pages == [("deck:CF", 2)]
+        assert notes[0].note_id == 7
+        assert notes[0].fields == ["Frente", "Verso"]
+        assert notes[0].first_field == "Frente"
@@ -0,0 +1,127 @@
+"""Testes para o escritor em lote de .apkg."""
+
+import json
+import sqlite3
+import zipfile
+
+import genanki
+import pytest
+
+from legal_anki.anki_import import anki_checksum, iter_apkg_notes
+from legal_anki.apkg import ApkgWriter
+from legal_anki.exporters import ExportError
+from legal_anki.identity import card_guid
+from legal_anki.models import get_model_for_card_type
+from legal_anki.serializers import map_card_to_fields
+
+
+def _collection(path, tmp_path):
+    """Extrai a coleção do pacote e abre com sqlite3."""
+    with zipfile.ZipFile(path) as zf:
+        assert set(zf.namelist()) == {"collection.anki2", "media"}
+        zf.extract("collection.anki2", tmp_path)
+    return sqlite3.connect(tmp_path / "collection.anki2")
+
+
+def _genanki_package(cards, path, deck_id, timestamp):
+    deck = genanki.Deck(deck_id, "Deck")
+    for card in cards:
+        model = get_model_for_card_type(card.card_type)
+        deck.add_note(genanki.Note(model=model, fields=map_card_to_fields(card), tags=card.tags))
+    genanki.Package(deck).write_to_file(str(path), timestamp=timestamp)
+
+
+class TestApkgWriter:
+    """Testes para ApkgWriter."""
+
+    def test_same_collection_as_genanki(self, sample_cards, tmp_path):
+        """Notas, cards, modelos e deck iguais aos do genanki, exceto o GUID."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        ours = tmp_path / "a" / "ours.apkg"
+        theirs = tmp_path / "b" / "theirs.apkg"
+        with ApkgWriter(ours, deck_name="Deck", deck_id=42, timestamp=1_700_000_000) as writer:
+            writer.write_cards(sample_cards)
+        _genanki_package(sample_cards, theirs, 42, 1_700_000_000)
+
+        a = _collection(ours, tmp_path / "a")
+        b = _collection(theirs, tmp_path / "b")
+        notes_sql = "SELECT id, mid, tags, flds FROM notes ORDER BY id"
+        cards_sql = "SELECT id, nid, did, ord, type, queue FROM cards ORDER BY id"
+        assert a.execute(notes_sql).fetchall() == b.execute(notes_sql).fetchall()
+        guids = [r[0] for r in a.execute("SELECT guid FROM notes ORDER BY id")]
+        assert guids == [card_guid(c) for c in sample_cards]
+        assert a.execute(cards_sql).fetchall() == b.execute(cards_sql).fetchall()
+
+        models_a, decks_a = a.execute("SELECT models, decks FROM col").fetchone()
+        models_b, decks_b = b.execute("SELECT models, decks FROM col").fetchone()
+        assert json.loads(models_a) == json.loads(models_b)
+        assert json.loads(decks_a) == json.loads(decks_b)
+        indexes = {r[0] for r in a.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert "ix_notes_csum" in indexes
+
+    def test_checksum_and_sort_field(self, sample_cards, tmp_path):
+        """csum e sfld preenchidos como o Anki faz (genanki deixa csum = 0)."""
+        path = tmp_path / "deck.apkg"
+        with ApkgWriter(path) as writer:
+            writer.write_cards(sample_cards)
+
+        conn = _collection(path, tmp_path)
+        rows = conn.execute("SELECT sfld, csum FROM notes ORDER BY id").fetchall()
+        assert rows[0] == (sample_cards[0].front, anki_checksum(sample_cards[0].front))
+        assert [n.fields[0] for n in iter_apkg_notes(path)] == [c.front for c in sample_cards]
+
+    def test_cloze_generates_one_card_per_deletion(self, sample_cards, tmp_path):
+        """A nota cloze com c1 e c2 gera dois cards."""
+        path = tmp_path / "deck.apkg"
+        with ApkgWriter(path, batch_size=1) as writer:
+            writer.write_cards(sample_cards)
+
+        assert writer.count == len(sample_cards)
+        assert writer.card_count == len(sample_cards) + 1
+
+    def test_error_discards_package(self, sample_cards, tmp_path):
+        """Exceção dentro do with não gera pacote."""
+        path = tmp_path / "deck.apkg"
+        with pytest.raises(RuntimeError):
+            with ApkgWriter(path) as writer:
+                writer.write_cards(sample_cards)
+                raise RuntimeError("falha")
+        assert not path.exists()
+
+    def test_write_before_open_raises(self, sample_card_basic):
+        """Escrever sem abrir levanta ExportError, como nos escritores de texto."""
+        with pytest.raises(ExportError, match="não está aberto"):
+            ApkgWriter("deck.apkg").write_card(sample_card_basic)
+
+    def test_iter_package_streams_valid_zip(self, sample_cards, tmp_path):
+        """Os blocos concatenados formam o mesmo pacote, legível pelo Anki."""
+        with ApkgWriter(tmp_path / "a.apkg", deck_id=42, timestamp=1_700_000_000) as writer:
+            writer.write_cards(sample_cards)
+        writer = ApkgWriter(None, deck_id=42, timestamp=1_700_000_000).open()
+        writer.write_cards(sample_cards)
+        chunks = list(writer.iter_package(chunk_size=4096))
+
+        assert len(chunks) > 1
+        path = tmp_path / "b.apkg"
+        path.write_bytes(b"".join(chunks))
+        assert [n.fields for n in iter_apkg_notes(path)] == [
+            n.fields for n in iter_apkg_notes(tmp_path / "a.apkg")
+        ]
+        assert writer._tmpdir is None
+
+    def test_compresslevel_deflates(self, sample_cards, tmp_path):
+        """Com compresslevel o zip usa deflate; sem ele, grava sem compressão."""
+        sizes = {}
+        for level in (None, 6):
+            path = tmp_path / f"{level}.apkg"
+            with ApkgWriter(path, compresslevel=level) as writer:
+                writer.write_cards(sample_cards)
+            with zipfile.ZipFile(path) as zf:
+                info = zf.getinfo("collection.anki2")
+            sizes[level] = info.compress_size
+            expected = zipfile.ZIP_STORED if level is None else zipfile.ZIP_DEFLATED
+            assert info.compress_type == expected
+        assert sizes[6] < sizes[None]
+        with pytest.raises(ValueError, match="compresslevel"):
+            ApkgWriter(tmp_path / "x.apkg", compresslevel=10)
@@ -0,0 +1,201 @@
+"""Testes para o micro-batching de itens curtos."""
+
+import pytest
+
+from legal_anki.batching import (
+    SourceItem,
+    generate_cards_batched,
+    generate_cards_batched_iter,
+    iter_csv_items,
+    pack_items,
+)
+from legal_anki.models import AnkiCard, BatchCardResponse, ItemCards
+
+
+def _card(front: str) -> AnkiCard:
+    return AnkiCard(
+        front=front,
+        back="Resposta com fundamento no art. 5º da CF/88.",
+        card_type="basic",
+        tags=["teste"],
+    )
+
+
+class BatchMockClient:
+    """Mock que responde um card por item, ecoando os IDs locais."""
+
+    def __init__(self, skip_ids: set[str] | None = None):
+        self.skip_ids = skip_ids or set()
+        self.calls: list[str] = []
+
+    def generate_structured(self, system_prompt, user_message, response_model):
+        assert response_model is BatchCardResponse
+        self.calls.append(user_message)
+        n = user_message.count("[/ITEM ")
+        return BatchCardResponse(
+            items=[
+                ItemCards(item_id=str(i), cards=[_card(f"Pergunta do item {i}?")])
+                for i in range(1, n + 1)
+                if str(i) not in self.skip_ids
+            ]
+        )
+
+
+class TestPackItems:
+    """Testes para pack_items."""
+
+    def test_respects_max_items(self):
+        """Lotes não excedem max_items."""
+        items = [SourceItem(item_id=str(i), text="Súmula curta") for i in range(7)]
+        batches = pack_items(items, max_items=3)
+
+        assert [len(b) for b in batches] == [3, 3, 1]
+
+    def test_respects_max_chars(self):
+        """Lotes não excedem max_chars (item grande fica sozinho)."""
+        items = [
+            SourceItem(item_id="a", text="x" * 60),
+            SourceItem(item_id="b", text="x" * 60),
+            SourceItem(item_id="c", text="x" * 500),
+        ]
+        batches = pack_items(items, max_items=10, max_chars=100)
+
+        assert [[i.item_id for i in b] for b in batches] == [["a"], ["b"], ["c"]]
+
+    def test_empty(self):
+        """Sem itens, sem lotes."""
+        assert pack_items([]) == []
+
+
+class TestGenerateCardsBatched:
+    """Testes para generate_cards_batched."""
+
+    def test_maps_cards_back_to_source_items(self):
+        """Cards são associados ao item de origem correto."""
+        items = [
+            SourceItem(item_id=f"linha-{i}", text=f"Súmula {i}") for i in range(5)
+        ]
+        mock = BatchMockClient()
+
+        result = generate_cards_batched(
+            items, topic="sumulas", max_items_per_batch=2, llm_client=mock
+        )
+
+        assert len(mock.calls) == 3
+        assert list(result) == [f"linha-{i}" for i in range(5)]
+        # O item 1 do segundo lote é "linha-2"
+        assert result["linha-2"][0].front == "Pergunta do item 1?"
+        assert "sumulas" in result["linha-2"][0].tags
+
+    def test_missing_items_map_to_empty_list(self):
+        """Itens omitidos pelo LLM ficam com lista vazia."""
+        items = [SourceItem(item_id=k, text="Texto") for k in ("a", "b")]
+        mock = BatchMockClient(skip_ids={"2"})
+
+        result = generate_cards_batched(items, topic="t", llm_client=mock)
+
+        assert len(result["a"]) == 1
+        assert result["b"] == []
+
+    def test_duplicate_ids_raise(self):
+        """IDs repetidos levantam ValueError."""
+        items = [SourceItem(item_id="a", text="x"), SourceItem(item_id="a", text="y")]
+
+        with pytest.raises(ValueError, match="únicos"):
+            generate_cards_batched(items, topic="t", llm_client=BatchMockClient())
+
+
+class TestIterCsvItems:
+    """Testes para iter_csv_items."""
+
+    def test_items_carry_row_identity(self, tmp_path):
+        """Cada linha vira um item com ID arquivo:linha."""
+        csv_path = tmp_path / "banco.csv"
+        csv_path.write_text(
+            "enunciado;gabarito\nQuestão A;Certo\n;\nQuestão B;Errado\n",
+            encoding="utf-8",
+        )
+
+        items = list(iter_csv_items(csv_path))
+
+        assert [(i.item_id, i.text) for i in items] == [
+            ("banco.csv:1", "Questão A | Certo"),
+            ("banco.csv:3", "Questão B | Errado"),
+        ]
+
+
+class TestGenerateCardsBatchedIter:
+    """Testes para generate_cards_batched_iter."""
+
+    def test_yields_in_input_order(self):
+        """Resultados saem na ordem dos itens, lote a lote."""
+        items = (SourceItem(item_id=f"linha-{i}", text=f"Súmula {i}") for i in range(5))
+        mock = BatchMockClient(skip_ids={"2"})
+
+        result = list(
+            generate_cards_batched_iter(
+                items, topic="sumulas", max_items_per_batch=2, llm_client=mock
+            )
+        )
+
+        assert len(mock.calls) == 3
+        assert [item_id for item_id, _ in result] == [f"linha-{i}" for i in range(5)]
+        # O item local "2" de cada lote completo ficou sem cards
+        assert [len(cards) for _, cards in result] == [1, 0, 1, 0, 1]
+
+    def test_consumes_items_lazily(self):
+        """Só os lotes em voo são lidos da entrada."""
+        consumed = []
+
+        def items():
+            for i in range(1000):
+                consumed.append(i)
+                yield SourceItem(item_id=str(i), text=f"Súmula {i}")
+
+        results = generate_cards_batched_iter(
+            items(),
+            topic="sumulas",
+            max_items_per_batch=10,
+            llm_client=BatchMockClient(),
+            max_workers=2,
+        )
+        first = next(results)
+        results.close()
+
+        assert first[0] == "0"
+        assert len(consumed) < 100
+
+    def test_routes_items_and_sends_citation_hints(self):
+        """Cada item recebe o tipo pré-classificado e as citações extraídas."""
+        items = [
+            SourceItem(item_id="sv", text="Súmula Vinculante 11 do STF: uso de algemas"),
+            SourceItem(item_id="doutrina", text="Conceito de poder constituinte derivado"),
+        ]
+        mock = BatchMockClient()
+
+        list(generate_cards_batched_iter(items, topic="t", llm_client=mock))
+
+        sv_block, doutrina_block = mock.calls[0].split("[/ITEM ")[:2]
+        assert "apenas cards do tipo 'jurisprudencia'" in sv_block
+        assert "Súmulas: Súmula Vinculante 11" in sv_block
+        assert "Gere para este item" not in doutrina_block
+
+    def test_routing_and_citations_can_be_disabled(self):
+        """Sem roteamento nem citações, os itens vão como estão."""
+        items = [SourceItem(item_id="sv", text="Súmula Vinculante 11 do STF: algemas")]
+        mock = BatchMockClient()
+
+        list(
+            generate_cards_batched_iter(
+                items, topic="t", llm_client=mock, route_by_type=False, use_citations=False
+            )
+        )
+
+        assert "[ITEM 1]\nSúmula Vinculante 11 do STF: algemas\n[/ITEM 1]" in mock.calls[0]
+
+    def test_duplicate_ids_in_batch_raise(self):
+        """IDs repetidos dentro de um lote levantam ValueError."""
+        items = [SourceItem(item_id="x", text="A"), SourceItem(item_id="x", text="B")]
+
+        with pytest.raises(ValueError, match="únicos"):
+            list(generate_cards_batched_iter(items, topic="t", llm_client=BatchMockClient()))
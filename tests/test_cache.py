@@ -0,0 +1,101 @@
+"""Testes para o cache de texto extraído."""
+
+import logging
+
+from legal_anki.cache import TextCache, file_digest
+from legal_anki.parsers import parse_file
+
+
+class TestTextCache:
+    """Testes para TextCache."""
+
+    def test_miss_then_hit(self, tmp_path):
+        """Entrada ausente retorna None; após set, retorna o texto."""
+        cache = TextCache(tmp_path)
+
+        assert cache.get("abc.txt.v1.text") is None
+        cache.set("abc.txt.v1.text", "Art. 5º")
+        assert cache.get("abc.txt.v1.text") == "Art. 5º"
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Ao exceder o limite, remove as entradas menos usadas."""
+        import os
+
+        cache = TextCache(tmp_path, max_bytes=250)
+        cache.set("a", "x" * 100)
+        cache.set("b", "y" * 100)
+        os.utime(tmp_path / "a.txt", (1, 1))  # "a" é a mais antiga
+        os.utime(tmp_path / "b.txt", (2, 2))
+        cache.get("a")  # ... mas passa a ser a mais recente
+        cache.set("c", "z" * 100)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_failed_write_leaves_no_temp_file(self, tmp_path, monkeypatch):
+        """Falha na escrita não deixa o arquivo temporário no diretório."""
+        import os
+
+        def fail(*args):
+            raise OSError("disco cheio")
+
+        monkeypatch.setattr(os, "replace", fail)
+        cache = TextCache(tmp_path)
+        cache.set("a", "Art. 5º")
+
+        assert list(tmp_path.iterdir()) == []
+        assert cache.get("a") is None
+
+    def test_invalid_key(self, tmp_path):
+        """Chaves com separadores de caminho são rejeitadas."""
+        import pytest
+
+        with pytest.raises(ValueError):
+            TextCache(tmp_path).get("../fora")
+
+    def test_file_digest_depends_on_content(self, tmp_path):
+        """Hash muda com o conteúdo, não com o nome."""
+        a = tmp_path / "a.txt"
+        b = tmp_path / "b.txt"
+        a.write_text("mesmo", encoding="utf-8")
+        b.write_text("mesmo", encoding="utf-8")
+
+        assert file_digest(a) == file_digest(b)
+        b.write_text("outro", encoding="utf-8")
+        assert file_digest(a) != file_digest(b)
+
+
+class TestParseFileWithCache:
+    """Testes da integração do cache com parse_file."""
+
+    def test_second_parse_skips_extraction(self, tmp_path, monkeypatch, caplog):
+        """Segunda leitura do mesmo conteúdo vem do cache."""
+        from legal_anki import parsers
+
+        f = tmp_path / "input.txt"
+        f.write_text("Art. 5º da CF/88.", encoding="utf-8")
+        cache = TextCache(tmp_path / "cache")
+
+        assert parse_file(f, cache=cache) == "Art. 5º da CF/88."
+
+        def fail(path):
+            raise AssertionError("não deveria extrair novamente")
+
+        monkeypatch.setitem(parsers._PARSERS, "txt", fail)
+        with caplog.at_level(logging.INFO, logger="legal_anki.parsers"):
+            assert parse_file(f, cache=cache) == "Art. 5º da CF/88."
+        assert "Cache hit" in caplog.text
+
+    def test_parser_version_invalidates(self, tmp_path, monkeypatch):
+        """Mudança de PARSER_VERSION invalida o cache."""
+        from legal_anki import parsers
+
+        f = tmp_path / "input.txt"
+        f.write_text("Texto original.", encoding="utf-8")
+        cache = TextCache(tmp_path / "cache")
+        parse_file(f, cache=cache)
+
+        monkeypatch.setattr(parsers, "PARSER_VERSION", parsers.PARSER_VERSION + 1)
+        monkeypatch.setitem(parsers._PARSERS, "txt", lambda path: "Texto novo.")
+        assert parse_file(f, cache=cache) == "Texto novo."
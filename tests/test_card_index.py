@@ -0,0 +1,110 @@
+"""Testes para o índice persistente de cards."""
+
+from legal_anki.card_index import CardIndex, format_covered_hints, front_hash
+from legal_anki.models import AnkiCard
+
+
+def _card(front: str, tags: list[str] | None = None) -> AnkiCard:
+    return AnkiCard(
+        front=front,
+        back="Resposta com fundamento no art. 5º da CF/88.",
+        card_type="basic",
+        tags=tags or ["direitos_fundamentais"],
+    )
+
+
+class TestCardIndex:
+    """Testes para CardIndex."""
+
+    def test_front_hash_ignores_case_accents_and_punctuation(self):
+        """O hash usa o front normalizado."""
+        assert front_hash("O que é ADI?") == front_hash("o que e adi")
+        assert front_hash("O que é ADI?") != front_hash("O que é ADC?")
+
+    def test_filters_known_and_near_duplicate_cards(self):
+        """Cards iguais ou quase iguais aos registrados são descartados."""
+        index = CardIndex(":memory:")
+        index.add([_card("Qual o fundamento constitucional do direito ao silêncio do preso?")])
+
+        new = index.filter_new(
+            [
+                _card("qual o fundamento constitucional do direito ao silencio do preso"),
+                _card("Qual é o fundamento constitucional do direito ao silêncio do preso?"),
+                _card("Qual o prazo decadencial do mandado de segurança?"),
+            ]
+        )
+
+        assert [c.front for c in new] == ["Qual o prazo decadencial do mandado de segurança?"]
+
+    def test_add_ignores_repeated_fronts(self):
+        """Fronts já registrados não são gravados de novo."""
+        index = CardIndex(":memory:")
+
+        assert index.add([_card("O que é ADI?"), _card("o que é adi")]) == 1
+        assert index.add([_card("O que é ADI?")]) == 0
+        assert len(index) == 1
+        assert _card("O que é ADI?") in index
+
+    def test_persists_across_instances(self, tmp_path):
+        """O índice sobrevive entre execuções, com os parâmetros da criação."""
+        path = tmp_path / "sub" / "cards.sqlite3"
+        with CardIndex(path, threshold=0.9) as index:
+            index.add([_card("Qual o quórum de aprovação de emenda constitucional?")])
+
+        with CardIndex(path, threshold=0.5) as index:
+            assert index.threshold == 0.9
+            assert _card("Qual o quórum de aprovação de emenda constitucional?") in index
+
+    def test_covered_fronts_by_topic(self):
+        """Os fronts cobertos são filtrados pela tag do tópico, mais recentes primeiro."""
+        index = CardIndex(":memory:")
+        index.add([_card("O que é ADI?"), _card("O que é ADC?")])
+        index.add([_card("O que é IPTU progressivo?", tags=["tributario"])])
+
+        assert index.covered_fronts("direitos_fundamentais") == ["O que é ADC?", "O que é ADI?"]
+        assert index.covered_fronts(limit=1) == ["O que é IPTU progressivo?"]
+
+    def test_covered_fronts_underscore_is_literal(self):
+        """'_' no slug do tópico não funciona como curinga."""
+        index = CardIndex(":memory:")
+        index.add([_card("O que é usucapião?", tags=["direito_civil"])])
+        index.add([_card("O que é dolo eventual?", tags=["direitoxcivil"])])
+
+        assert index.covered_fronts("direito_civil") == ["O que é usucapião?"]
+
+    def test_format_covered_hints(self):
+        """Dicas listam os fronts existentes; lista vazia não gera texto."""
+        assert format_covered_hints([]) == ""
+        assert "- O que é ADI?" in format_covered_hints(["O que é ADI?"])
+
+    def test_seeded_notes_detect_anki_duplicates(self):
+        """Notas importadas valem para a geração e para o addNotes."""
+        from legal_anki.anki_import import AnkiNote
+
+        index = CardIndex(":memory:")
+        notes = [
+            AnkiNote(
+                note_id=1,
+                model="LegalAnki Basic",
+                fields=["<b>Qual o prazo decadencial do mandado de segurança?</b>", "120 dias"],
+            ),
+            AnkiNote(note_id=2, model="Basic", fields=["O que é ADI?", "Ação direta"]),
+        ]
+
+        assert index.add_notes(notes) == 2
+        assert index.add_notes(notes) == 0
+
+        card = _card("Qual o prazo decadencial do mandado de segurança?")
+        assert index.is_anki_duplicate(card)
+        assert card in index
+        # Mesmo primeiro campo em outro note type não é duplicata para o Anki
+        assert not index.is_anki_duplicate(_card("O que é ADI?"))
+        assert _card("O que é ADI?") in index
+
+    def test_added_cards_are_anki_duplicates(self):
+        """Cards registrados após exportação também são pulados no addNotes."""
+        index = CardIndex(":memory:")
+        card = _card("Qual o quórum das emendas constitucionais?")
+        assert not index.is_anki_duplicate(card)
+        index.add([card])
+        assert index.is_anki_duplicate(card)
@@ -0,0 +1,129 @@
+"""Testes para a extração offline de citações."""
+
+from legal_anki.citations import extract_citations, fill_extra, format_citation_hints
+from legal_anki.generator import generate_cards
+from legal_anki.models import AnkiCard, CardResponse
+
+
+class TestExtractCitations:
+    """Testes para extract_citations."""
+
+    def test_questao_header(self):
+        """Extrai banca, ano e cargo do cabeçalho da questão."""
+        c = extract_citations("(CESPE/2022 - Juiz Federal) O direito ao silêncio...")
+
+        assert c.bancas == ["CESPE"]
+        assert c.anos == ["2022"]
+        assert c.cargos == ["Juiz Federal"]
+
+    def test_sumula_vinculante_implies_stf(self):
+        """Súmula Vinculante (ou SV) implica STF."""
+        c = extract_citations("Conforme a Súmula Vinculante 11 e a SV 56.")
+
+        assert c.sumulas == ["Súmula Vinculante 11", "Súmula Vinculante 56"]
+        assert c.tribunais == ["STF"]
+
+    def test_sumula_with_tribunal(self):
+        """Súmula comum com tribunal explícito."""
+        c = extract_citations("Nos termos da Súmula nº 473 do STF.")
+        assert c.sumulas == ["Súmula 473 - STF"]
+
+    def test_processos(self):
+        """Extrai classe e número de processos, com UF opcional."""
+        c = extract_citations("Na ADI 4277 e no RE 635.659/SP; ver REsp 1.234.")
+
+        assert c.processos == ["ADI 4277", "RE 635.659/SP", "REsp 1.234"]
+        assert c.tribunais == ["STF", "STJ"]
+
+    def test_no_citations(self):
+        """Texto sem citações retorna vazio."""
+        c = extract_citations("O poder constituinte originário é ilimitado.")
+        assert c.is_empty()
+        assert format_citation_hints(c) == ""
+
+
+class TestFillExtra:
+    """Testes para fill_extra."""
+
+    def test_fills_questao_from_chunk(self):
+        """Preenche banca/ano/cargo ausentes a partir do chunk."""
+        card = AnkiCard(
+            front="O direito ao silêncio é absoluto?",
+            back="ERRADO. Art. 5º, LXIII, CF/88.",
+            card_type="questao",
+            tags=["t"],
+        )
+        chunk = extract_citations("(FGV/2019 - Delegado) O direito ao silêncio...")
+
+        filled = fill_extra(card, chunk)
+        assert filled.extra == {"banca": "FGV", "ano": "2019", "cargo": "Delegado"}
+
+    def test_card_text_takes_precedence(self):
+        """Citação no próprio card vence a do chunk."""
+        card = AnkiCard(
+            front="(FCC/2018) Pergunta?",
+            back="Resposta com art. 5º.",
+            card_type="questao",
+            tags=["t"],
+        )
+        chunk = extract_citations("(CESPE/2022) ...")
+
+        assert fill_extra(card, chunk).extra["banca"] == "FCC"
+
+    def test_does_not_overwrite(self):
+        """Campos já preenchidos pelo LLM são mantidos."""
+        card = AnkiCard(
+            front="Qual o entendimento do STJ?",
+            back="Resposta.",
+            card_type="jurisprudencia",
+            tags=["t"],
+            extra={"tribunal": "STF", "tema": "x"},
+        )
+        assert fill_extra(card, extract_citations("STJ")).extra["tribunal"] == "STF"
+
+    def test_ambiguous_values_are_not_used(self):
+        """Mais de um tribunal no chunk: nada é preenchido."""
+        card = AnkiCard(
+            front="Qual o entendimento?", back="Resposta.", card_type="jurisprudencia"
+        )
+        filled = fill_extra(card, extract_citations("STF e STJ divergem."))
+        assert not (filled.extra or {}).get("tribunal")
+
+    def test_basic_untouched(self):
+        """Cards basic não são alterados."""
+        card = AnkiCard(front="Pergunta?", back="Resposta.", card_type="basic")
+        assert fill_extra(card, extract_citations("(CESPE/2022)")) is card
+
+
+class TestGeneratorCitations:
+    """Testes da integração com o generator."""
+
+    def test_hints_sent_and_extra_filled(self):
+        """Dicas vão na mensagem e o extra é completado após a geração."""
+
+        class Client:
+            user_message = ""
+
+            def generate_structured(self, system_prompt, user_message, response_model):
+                Client.user_message = user_message
+                return CardResponse(
+                    cards=[
+                        AnkiCard(
+                            front="O uso de algemas é sempre lícito?",
+                            back="Não. Só em casos excepcionais, justificados por escrito.",
+                            card_type="jurisprudencia",
+                            tags=["t"],
+                            extra={"tema": "Uso de algemas"},
+                        )
+                    ]
+                )
+
+        cards = generate_cards(
+            text="Súmula Vinculante 11: só é lícito o uso de algemas em casos...",
+            topic="sumulas",
+            llm_client=Client(),
+        )
+
+        assert "Súmula Vinculante 11" in Client.user_message
+        assert "extra.tribunal" in Client.user_message
+        assert cards[0].extra["tribunal"] == "STF"
@@ -0,0 +1,151 @@
+"""Testes para a pré-classificação local de chunks."""
+
+from legal_anki.classifier import classify_chunk
+from legal_anki.config import CardType
+from legal_anki.generator import generate_cards
+from legal_anki.models import AnkiCard, CardResponse
+from legal_anki.prompts.system import AUTO_TYPE_HEURISTICS, build_system_prompt
+
+QUESTAO_TEXT = """Acerca dos direitos fundamentais, assinale a opção correta.
+A) O direito ao silêncio é absoluto.
+B) A casa é asilo inviolável do indivíduo.
+C) É livre a manifestação do pensamento, sendo permitido o anonimato.
+D) Não há pena de morte em nenhuma hipótese.
+E) Todas as anteriores."""
+
+LEI_SECA_TEXT = """Art. 5º Todos são iguais perante a lei, sem distinção de qualquer natureza.
+I - homens e mulheres são iguais em direitos e obrigações;
+II - ninguém será obrigado a fazer ou deixar de fazer alguma coisa senão em virtude de lei;
+III - ninguém será submetido a tortura nem a tratamento desumano ou degradante;
+XXVIII - são assegurados, nos termos da lei:
+a) a proteção às participações individuais em obras coletivas;
+b) o direito de fiscalização do aproveitamento econômico das obras;
+c) o direito dos criadores de obras."""
+
+JURIS_TEXT = """Súmula Vinculante 11: Só é lícito o uso de algemas em casos de resistência
+e de fundado receio de fuga ou de perigo à integridade física própria ou alheia."""
+
+
+class TestClassifyChunk:
+    """Testes para classify_chunk."""
+
+    def test_alternatives_are_questao(self):
+        """Alternativas A–E indicam questão."""
+        assert classify_chunk(QUESTAO_TEXT) == CardType.QUESTAO
+
+    def test_certo_errado_is_questao(self):
+        """Formato Certo/Errado indica questão."""
+        text = "Julgue o item a seguir (certo ou errado): o HC é gratuito."
+        assert classify_chunk(text) == CardType.QUESTAO
+
+    def test_banca_header_is_questao(self):
+        """Cabeçalho de banca/ano indica questão."""
+        text = "(CESPE/2022 - Juiz Federal) O direito ao silêncio é absoluto."
+        assert classify_chunk(text) == CardType.QUESTAO
+
+    def test_question_quoted_in_doctrine_is_not_questao(self):
+        """Um item de prova citado num texto doutrinário longo não o torna questão."""
+        doctrine = (
+            "O direito ao silêncio decorre do art. 5º, LXIII, da Constituição e da "
+            "garantia contra a autoincriminação, que a doutrina estende a qualquer "
+            "pessoa investigada, e não apenas ao preso. "
+        ) * 25
+        quoted = (
+            "\n(CESPE/2022 - Juiz Federal) O direito ao silêncio é absoluto. "
+            "Certo ou errado? Gabarito: Errado.\n"
+        )
+        text = doctrine + quoted + doctrine
+
+        assert classify_chunk(text) != CardType.QUESTAO
+        assert classify_chunk(quoted * 4) == CardType.QUESTAO
+
+    def test_certo_e_errado_prose_is_not_questao(self):
+        """"Certo e errado" em prosa não é marcador de questão."""
+        text = "A ética discute o que é certo e errado na atuação do advogado."
+        assert classify_chunk(text) is None
+
+    def test_statute_text_is_cloze(self):
+        """Texto literal de artigo (com alíneas) indica cloze, não questão."""
+        assert classify_chunk(LEI_SECA_TEXT) == CardType.CLOZE
+
+    def test_sumula_is_jurisprudencia(self):
+        """Menção a súmula indica jurisprudência."""
+        assert classify_chunk(JURIS_TEXT) == CardType.JURISPRUDENCIA
+
+    def test_julgado_is_jurisprudencia(self):
+        """Julgado com classe processual indica jurisprudência."""
+        text = "No julgamento da ADI 4277, o STF reconheceu a união homoafetiva."
+        assert classify_chunk(text) == CardType.JURISPRUDENCIA
+
+    def test_doctrine_is_undecided(self):
+        """Texto doutrinário fica a critério do LLM."""
+        text = "O poder constituinte originário é inicial, ilimitado e incondicionado."
+        assert classify_chunk(text) is None
+
+    def test_empty_text(self):
+        """Texto vazio retorna None."""
+        assert classify_chunk("   ") is None
+
+
+class TestTypeSpecificPrompt:
+    """Testes para prompts específicos por tipo."""
+
+    def test_auto_prompt_has_heuristics(self):
+        """Prompt automático inclui heurísticas e todos os tipos."""
+        prompt = build_system_prompt()
+        assert AUTO_TYPE_HEURISTICS in prompt
+        assert "### jurisprudencia" in prompt
+
+    def test_typed_prompt_is_smaller(self):
+        """Prompt de tipo fixo omite heurísticas e outros tipos."""
+        auto = build_system_prompt()
+        cloze = build_system_prompt(card_type="cloze")
+
+        assert len(cloze) < len(auto)
+        assert AUTO_TYPE_HEURISTICS not in cloze
+        assert "### cloze" in cloze
+        assert "### questao" not in cloze
+        assert "{{c1::texto}}" in cloze
+
+
+class RecordingClient:
+    """Mock que registra os prompts recebidos."""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_structured(self, system_prompt, user_message, response_model):
+        self.calls.append((system_prompt, user_message))
+        return CardResponse(
+            cards=[
+                AnkiCard(
+                    front="Pergunta sobre o conteúdo?",
+                    back="Resposta com art. 5º da CF/88.",
+                    card_type="cloze",
+                    tags=["t"],
+                )
+            ]
+        )
+
+
+class TestGeneratorRouting:
+    """Testes para o roteamento de chunks no generator."""
+
+    def test_routes_statute_to_cloze_prompt(self):
+        """Chunk de lei seca recebe prompt e instrução de cloze."""
+        client = RecordingClient()
+        generate_cards(text=LEI_SECA_TEXT, topic="cf88", llm_client=client)
+
+        system_prompt, user_message = client.calls[0]
+        assert AUTO_TYPE_HEURISTICS not in system_prompt
+        assert "Gere apenas cards do tipo 'cloze'" in user_message
+
+    def test_routing_can_be_disabled(self):
+        """route_by_type=False mantém o prompt automático."""
+        client = RecordingClient()
+        generate_cards(
+            text=LEI_SECA_TEXT, topic="cf88", llm_client=client, route_by_type=False
+        )
+
+        system_prompt, _ = client.calls[0]
+        assert AUTO_TYPE_HEURISTICS in system_prompt
@@ -0,0 +1,92 @@
+"""Testes para a limpeza de ruído de página."""
+
+from legal_anki.cleaning import clean_pages
+from legal_anki.parsers import parse_file
+
+
+def _page(n: int, body: str) -> str:
+    return (
+        "DIÁRIO OFICIAL DA UNIÃO - Seção 1\n"
+        f"Brasília, {n} de maio de 2024\n"
+        f"{body}\n"
+        "Este documento pode ser verificado no endereço eletrônico\n"
+        f"{n}\n"
+    )
+
+
+class TestCleanPages:
+    """Testes para clean_pages."""
+
+    def test_removes_repeated_headers_and_footers(self):
+        """Linhas repetidas no topo/rodapé (com dígitos variáveis) são removidas."""
+        pages = [_page(i, f"Art. {i}º Conteúdo normativo {i}.") for i in range(1, 6)]
+
+        cleaned, stats = clean_pages(pages)
+
+        for i, page in enumerate(cleaned, start=1):
+            assert "DIÁRIO OFICIAL" not in page
+            assert "Brasília" not in page
+            assert "verificado" not in page
+            assert f"Art. {i}º Conteúdo normativo {i}." in page
+        assert stats.repeated_lines_removed == 15
+        assert stats.page_numbers_removed == 5
+        assert stats.tokens_saved > 0
+
+    def test_keeps_body_lines_that_repeat(self):
+        """Repetições fora das zonas de topo/rodapé são preservadas."""
+        body = "A\nB\nC\nParágrafo único. Texto repetido.\nD\nE\nF"
+        cleaned, _ = clean_pages([body] * 4)
+
+        assert all("Parágrafo único. Texto repetido." in p for p in cleaned)
+
+    def test_few_pages_only_strip_page_numbers(self):
+        """Com poucas páginas, não infere repetição, mas remove numeração."""
+        cleaned, stats = clean_pages(["Cabeçalho\nTexto.\n1", "Cabeçalho\nTexto.\n2"])
+
+        assert cleaned == ["Cabeçalho\nTexto.", "Cabeçalho\nTexto."]
+        assert stats.repeated_lines_removed == 0
+        assert stats.page_numbers_removed == 2
+
+    def test_joins_hyphenation_and_wraps(self):
+        """Desfaz hifenização e quebras no meio da frase."""
+        page = (
+            "Art. 5º Todos são iguais perante a lei, sem distin-\n"
+            "ção de qualquer natureza, garantindo-se aos brasileiros\n"
+            "e aos estrangeiros residentes no País:\n"
+            "a) a inviolabilidade do direito à vida;\n"
+            "I - homens e mulheres são iguais."
+        )
+        cleaned, stats = clean_pages([page])
+
+        assert cleaned[0] == (
+            "Art. 5º Todos são iguais perante a lei, sem distinção de qualquer "
+            "natureza, garantindo-se aos brasileiros e aos estrangeiros "
+            "residentes no País:\n"
+            "a) a inviolabilidade do direito à vida;\n"
+            "I - homens e mulheres são iguais."
+        )
+        assert stats.hyphenations_joined == 1
+        assert stats.lines_joined == 1
+
+
+class TestParseFileClean:
+    """Testes da integração com parse_file."""
+
+    def test_pdf_clean(self, tmp_path):
+        """parse_file(clean=True) remove cabeçalhos repetidos de PDFs."""
+        import pymupdf
+
+        pdf_path = tmp_path / "dou.pdf"
+        doc = pymupdf.open()
+        for i in range(1, 5):
+            page = doc.new_page()
+            page.insert_text((72, 72), _page(i, f"Art. {i}º Texto do artigo."))
+        doc.save(str(pdf_path))
+        doc.close()
+
+        raw = parse_file(pdf_path, workers=1)
+        clean = parse_file(pdf_path, workers=1, clean=True)
+
+        assert raw.count("DIÁRIO OFICIAL") == 4
+        assert "DIÁRIO OFICIAL" not in clean
+        assert "Art. 4º Texto do artigo." in clean
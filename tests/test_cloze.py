@@ -0,0 +1,97 @@
+"""Testes para o gerador offline de cards cloze."""
+
+import re
+
+import pytest
+
+from legal_anki.cloze import cloze_terms, generate_clozes
+from legal_anki.validators import validate_card
+
+LEI_SECA = """TÍTULO IV
+Art. 60. A Constituição poderá ser emendada mediante proposta:
+I - de um terço, no mínimo, dos membros da Câmara dos Deputados ou do Senado Federal;
+II - do Presidente da República;
+§ 2º A proposta será discutida e votada em cada Casa do Congresso Nacional, em dois turnos, considerando-se aprovada se obtiver, em ambos, três quintos dos votos dos respectivos membros.
+§ 5º (Revogado pela Emenda Constitucional nº 99, de 2030, com prazo de 10 dias)
+Art. 66. A Casa na qual tenha sido concluída a votação enviará o projeto de lei ao Presidente da República.
+§ 1º Se o Presidente da República considerar o projeto inconstitucional, vetá-lo-á no prazo de quinze dias úteis, contados da data do recebimento, e comunicará, dentro de quarenta e oito horas, ao Presidente do Senado Federal os motivos do veto.
+Art. 67. A matéria constante de projeto de lei rejeitado somente poderá constituir objeto de novo projeto.
+"""
+
+
+class TestClozeTerms:
+    """Testes para cloze_terms."""
+
+    def test_priority_and_order(self):
+        """Quóruns e prazos têm prioridade; lacunas numeradas na ordem de leitura."""
+        text = (
+            "O Presidente da República vetará no prazo de quinze dias úteis, "
+            "por maioria absoluta, comunicando ao Senado Federal em 48 horas."
+        )
+
+        assert cloze_terms(text) == (
+            "O Presidente da República vetará no prazo de {{c1::quinze dias úteis}}, "
+            "por {{c2::maioria absoluta}}, comunicando ao Senado Federal em {{c3::48 horas}}."
+        )
+
+    def test_max_deletions(self):
+        """Nunca passa de max_deletions lacunas."""
+        text = "um terço, dois terços, três quintos, metade e maioria absoluta"
+
+        result = cloze_terms(text, max_deletions=2)
+
+        assert len(re.findall(r"\{\{c\d+::", result)) == 2
+
+    def test_ignores_cross_references(self):
+        """Remissões a artigos, parágrafos e leis não viram lacunas."""
+        text = "Aplica-se o art. 84, o § 2º e a Lei nº 8.112, com alíquota de 10%."
+
+        assert cloze_terms(text) == (
+            "Aplica-se o art. 84, o § 2º e a Lei nº 8.112, com alíquota de {{c1::10%}}."
+        )
+
+    def test_no_terms(self):
+        """Sem termos reconhecidos, retorna None."""
+        assert cloze_terms("A lei disporá sobre a organização do órgão.") is None
+
+
+class TestGenerateClozes:
+    """Testes para generate_clozes."""
+
+    def test_cards_per_dispositivo(self):
+        """Gera um card por dispositivo com termos, com fundamento e tags."""
+        cards = generate_clozes(LEI_SECA, topic="processo legislativo")
+
+        fundamentos = [c.extra["fundamento"] for c in cards]
+        assert fundamentos == [
+            "Art. 60, I, CF/88",
+            "Art. 60, § 2º, CF/88",
+            "Art. 66, CF/88",
+            "Art. 66, § 1º, CF/88",
+        ]
+        assert cards[1].front.startswith("Art. 60, § 2º (CF/88): A proposta")
+        assert "{{c2::dois turnos}}" in cards[1].front
+        assert "{{c3::três quintos}}" in cards[1].front
+        assert cards[0].tags == ["processo_legislativo", "lei_seca", "dificuldade::medio"]
+        for card in cards:
+            assert card.card_type == "cloze"
+            assert validate_card(card)
+
+    def test_skips_revoked_and_short(self):
+        """Dispositivos revogados e curtos (sem termos) não geram cards."""
+        cards = generate_clozes(LEI_SECA, topic="t")
+
+        assert not any("§ 5º" in c.extra["fundamento"] for c in cards)
+        assert not any(c.extra["fundamento"].startswith("Art. 67") for c in cards)
+
+    def test_law_name_and_limit(self):
+        """Nome da norma e limite de cards são respeitados."""
+        cards = generate_clozes(LEI_SECA, topic="t", law="Lei 9.868/99", max_cards=2)
+
+        assert len(cards) == 2
+        assert cards[0].extra["fundamento"] == "Art. 60, I, Lei 9.868/99"
+
+    def test_empty_topic(self):
+        """Tópico vazio levanta ValueError."""
+        with pytest.raises(ValueError, match="topic"):
+            generate_clozes(LEI_SECA, topic=" ")
@@ -181,6 +181,21 @@ class TestExportToAPKG:
         decoded = base64.b64decode(result)
         assert len(decoded) > 0
 
+    def test_iter_apkg_base64_chunks(self, sample_cards, tmp_path):
+        """As partes em base64 concatenadas decodificam para o pacote inteiro."""
+        import base64
+
+        from legal_anki.anki_import import iter_apkg_notes
+        from legal_anki.exporters import iter_apkg_base64
+
+        parts = list(iter_apkg_base64(iter(sample_cards), chunk_size=1000))
+
+        assert len(parts) > 1
+        assert all(len(part) % 4 == 0 for part in parts)
+        path = tmp_path / "deck.apkg"
+        path.write_bytes(base64.b64decode("".join(parts)))
+        assert [n.fields[0] for n in iter_apkg_notes(path)] == [c.front for c in sample_cards]
+
 
 class TestExportCards:
     """Testes para função unificada de exportação."""
@@ -210,7 +225,7 @@ class TestMapCardToFields:
 
     def test_map_basic_card(self, sample_card_basic):
         """Mapeia card basic corretamente."""
-        from legal_anki.exporters import map_card_to_fields
+        from legal_anki.serializers import map_card_to_fields
 
         fields = map_card_to_fields(sample_card_basic)
 
@@ -220,7 +235,7 @@ class TestMapCardToFields:
 
     def test_map_questao_card(self, sample_cards):
         """Mapeia card questao com todos os campos."""
-        from legal_anki.exporters import map_card_to_fields
+        from legal_anki.serializers import map_card_to_fields
 
         questao_card = next(c for c in sample_cards if c.card_type == "questao")
         fields = map_card_to_fields(questao_card)
@@ -231,10 +246,199 @@ class TestMapCardToFields:
 
     def test_map_jurisprudencia_card(self, sample_cards):
         """Mapeia card jurisprudencia com todos os campos."""
-        from legal_anki.exporters import map_card_to_fields
+        from legal_anki.serializers import map_card_to_fields
 
         juris_card = next(c for c in sample_cards if c.card_type == "jurisprudencia")
         fields = map_card_to_fields(juris_card)
 
         assert len(fields) == 6  # Front, Back, Tribunal, Data, Tema, Fundamento
         assert fields[2] == "STF"  # Tribunal
+
+
+class TestCardWriters:
+    """Testes para os escritores incrementais."""
+
+    def test_writers_match_export_functions(self, sample_cards):
+        """Os exportadores são atalhos para os escritores."""
+        from io import StringIO
+
+        from legal_anki.exporters import export_to_csv, export_to_tsv, open_card_writer
+
+        for fmt, export in (("csv", export_to_csv), ("tsv", export_to_tsv)):
+            with open_card_writer(StringIO(), fmt) as writer:
+                writer.write_cards(iter(sample_cards))
+            assert writer.output.getvalue() == export(sample_cards)
+            assert writer.count == len(sample_cards)
+
+    def test_json_writer_streams_valid_document(self, sample_cards, tmp_path):
+        """JSON incremental é um documento válido, com total na metadata."""
+        from legal_anki.exporters import JsonCardWriter
+
+        path = tmp_path / "cards.json"
+        with JsonCardWriter(path) as writer:
+            for card in sample_cards:
+                writer.write_card(card)
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert [c["front"] for c in data["cards"]] == [c.front for c in sample_cards]
+        assert data["metadata"]["total_cards"] == len(sample_cards)
+
+    def test_flushes_in_chunks(self, sample_cards):
+        """O conteúdo é gravado a cada ``flush_every`` cards, antes do close."""
+        from io import StringIO
+
+        from legal_anki.exporters import TsvCardWriter
+
+        stream = StringIO()
+        writer = TsvCardWriter(stream, flush_every=2).open()
+        writer.write_card(sample_cards[0])
+        assert stream.getvalue() == ""
+        writer.write_card(sample_cards[1])
+        assert stream.getvalue().count("\t") == 4
+        writer.close()
+        assert stream.getvalue().count("\n") == 1
+        assert not stream.closed
+
+    @pytest.mark.parametrize("fmt", ["csv", "tsv", "json", "jsonl"])
+    def test_failure_discards_file(self, sample_cards, tmp_path, fmt):
+        """Se o bloco with falhar, o arquivo criado pelo escritor é removido."""
+        from legal_anki.exporters import open_card_writer
+
+        path = tmp_path / f"cards.{fmt}"
+        with pytest.raises(RuntimeError, match="falha"):
+            with open_card_writer(path, fmt, flush_every=1) as writer:
+                writer.write_cards(sample_cards)
+                raise RuntimeError("falha")
+        assert not path.exists()
+
+    def test_failure_skips_footer_on_open_stream(self, sample_cards):
+        """Num stream do chamador, a falha não fecha o documento nem o stream."""
+        from io import StringIO
+
+        from legal_anki.exporters import JsonCardWriter
+
+        stream = StringIO()
+        with pytest.raises(RuntimeError):
+            with JsonCardWriter(stream, flush_every=1) as writer:
+                writer.write_cards(sample_cards)
+                raise RuntimeError("falha")
+        assert "metadata" not in stream.getvalue()
+        assert not stream.closed
+
+    def test_write_before_open_raises(self, sample_card_basic):
+        """Escrever sem abrir levanta ExportError."""
+        from legal_anki.exporters import CsvCardWriter, ExportError
+
+        with pytest.raises(ExportError, match="não está aberto"):
+            CsvCardWriter("x.csv").write_card(sample_card_basic)
+
+    def test_card_writer_is_abstract(self):
+        """CardWriter só define a base; os formatos implementam _write_card/_write_item."""
+        from legal_anki.exporters import CardWriter
+
+        with pytest.raises(TypeError, match="abstract"):
+            CardWriter("x.txt")
+
+    def test_open_card_writer_rejects_apkg(self):
+        """APKG não tem escritor de texto incremental."""
+        from legal_anki.exporters import ExportError, open_card_writer
+
+        with pytest.raises(ExportError, match="apkg"):
+            open_card_writer("x.apkg", "apkg")
+
+
+class TestExportMulti:
+    """Testes para a exportação em vários formatos numa passada."""
+
+    @pytest.fixture
+    def cards(self, sample_cards):
+        from legal_anki.models import AnkiCard
+
+        tricky = AnkiCard(
+            front="Linha 1\nlinha 2; com\tseparadores ",
+            back="\r\nVerso;\t",
+            card_type="basic",
+            tags=["a;b", "c"],
+            extra={"fundamento": "Art. 1º;\nCF"},
+        )
+        return [*sample_cards, tricky]
+
+    @pytest.mark.parametrize("threads", [False, True])
+    def test_same_output_as_single_exporters(self, cards, tmp_path, threads):
+        """Cada arquivo é igual ao do exportador do formato."""
+        from legal_anki.anki_import import iter_apkg_notes
+        from legal_anki.exporters import (
+            export_multi,
+            export_to_csv,
+            export_to_jsonl,
+            export_to_tsv,
+        )
+
+        formats = ("csv", "tsv", "json", "jsonl", "apkg")
+        outputs = {fmt: tmp_path / f"cards.{fmt}" for fmt in formats}
+        result = export_multi(iter(cards), outputs, threads=threads, batch_size=2)
+
+        assert result == outputs
+        assert outputs["csv"].read_bytes().decode("utf-8") == export_to_csv(cards)
+        assert outputs["tsv"].read_bytes().decode("utf-8") == export_to_tsv(cards)
+        data = json.loads(outputs["json"].read_text(encoding="utf-8"))
+        assert data["cards"] == [c.model_dump(mode="json") for c in cards]
+        lines = outputs["jsonl"].read_text(encoding="utf-8").splitlines()
+        assert lines[1:] == export_to_jsonl(cards).splitlines()[1:]
+        assert [n.fields[0] for n in iter_apkg_notes(outputs["apkg"])] == [c.front for c in cards]
+
+    def test_empty_raises_before_writing(self, tmp_path):
+        """Sem cards, nenhum arquivo é criado."""
+        from legal_anki.exporters import ExportError, export_multi
+
+        with pytest.raises(ExportError, match="vazia"):
+            export_multi(iter([]), {"csv": tmp_path / "a.csv"})
+        assert not (tmp_path / "a.csv").exists()
+
+    @pytest.mark.parametrize("threads", [False, True])
+    def test_failing_source_discards_every_output(self, cards, tmp_path, threads):
+        """Erro na leitura dos cards interrompe todos os escritores, sem arquivos parciais."""
+        from legal_anki.exporters import export_multi
+
+        def source():
+            yield from cards
+            raise RuntimeError("falha na geração")
+
+        formats = ("csv", "tsv", "json", "jsonl", "apkg")
+        outputs = {fmt: tmp_path / f"a.{fmt}" for fmt in formats}
+        with pytest.raises(RuntimeError, match="falha"):
+            export_multi(source(), outputs, threads=threads, batch_size=1)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failing_close_discards_finished_outputs(self, cards, tmp_path, monkeypatch):
+        """Se um escritor falha ao fechar, os já fechados também são removidos."""
+        from legal_anki.exporters import ExportError, JsonCardWriter, export_multi
+
+        def failing_footer(self):
+            raise ExportError("falha no rodapé")
+
+        monkeypatch.setattr(JsonCardWriter, "_write_footer", failing_footer)
+        outputs = {"json": tmp_path / "a.json", "csv": tmp_path / "a.csv"}
+        with pytest.raises(ExportError, match="rodapé"):
+            export_multi(cards, outputs)
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.parametrize("fmt", ["json", "apkg"])
+    def test_failure_keeps_files_not_written_by_the_call(self, cards, tmp_path, fmt):
+        """Arquivos que a chamada não gravou (de uma execução anterior) ficam."""
+        from legal_anki.exporters import ExportError, export_multi
+
+        previous = tmp_path / f"a.{fmt}"
+        previous.write_text("execução anterior", encoding="utf-8")
+        outputs = {"csv": tmp_path / "nao_existe" / "a.csv", fmt: previous}
+        with pytest.raises(ExportError, match="CSV"):
+            export_multi(cards, outputs)
+        assert previous.read_text(encoding="utf-8") == "execução anterior"
+
+    def test_failing_writer_reports_its_error(self, cards, tmp_path):
+        """O erro do escritor que falhou é o levantado, não a interrupção."""
+        from legal_anki.exporters import ExportError, export_multi
+
+        outputs = {"csv": tmp_path / "a.csv", "tsv": tmp_path / "nao_existe" / "a.tsv"}
+        with pytest.raises(ExportError, match="TSV"):
+            export_multi(cards * 50, outputs, threads=True, batch_size=1)
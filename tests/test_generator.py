@@ -1,16 +1,27 @@
 """Testes para funções auxiliares do generator."""
 
-from legal_anki.generator import _chunk_text, _deduplicate_cards
-from legal_anki.models import AnkiCard
+import threading
+
+from legal_anki.generator import (
+    chunk_text,
+    deduplicate_cards,
+    _fan_out,
+    _iter_chunks,
+    _split_into_parts,
+    generate_cards,
+    generate_cards_iter,
+)
+from legal_anki.card_index import CardIndex
+from legal_anki.models import AnkiCard, CardResponse
 
 
 class TestChunkText:
-    """Testes para _chunk_text."""
+    """Testes para chunk_text."""
 
     def test_short_text_single_chunk(self):
         """Texto curto retorna chunk único."""
         text = "Texto curto sobre direito constitucional."
-        chunks = _chunk_text(text, max_chars=1000)
+        chunks = chunk_text(text, max_chars=1000)
 
         assert len(chunks) == 1
         assert chunks[0] == text
@@ -22,7 +33,7 @@ class TestChunkText:
         para3 = "C" * 500
         text = f"{para1}\n\n{para2}\n\n{para3}"
 
-        chunks = _chunk_text(text, max_chars=600)
+        chunks = chunk_text(text, max_chars=600)
 
         assert len(chunks) >= 2
         # Cada chunk deve conter pelo menos um parágrafo
@@ -34,7 +45,7 @@ class TestChunkText:
         paragraphs = [f"Parágrafo {i} com conteúdo jurídico." for i in range(20)]
         text = "\n\n".join(paragraphs)
 
-        chunks = _chunk_text(text, max_chars=200)
+        chunks = chunk_text(text, max_chars=200)
 
         reconstructed = "\n\n".join(chunks)
         assert reconstructed == text
@@ -42,7 +53,7 @@ class TestChunkText:
     def test_single_huge_paragraph(self):
         """Parágrafo único maior que max_chars fica em chunk próprio."""
         text = "X" * 2000
-        chunks = _chunk_text(text, max_chars=500)
+        chunks = chunk_text(text, max_chars=500)
 
         # Sem \n\n para dividir, cai em chunk único mesmo excedendo
         assert len(chunks) == 1
@@ -50,12 +61,12 @@ class TestChunkText:
 
     def test_empty_text(self):
         """Texto vazio retorna chunk único vazio."""
-        chunks = _chunk_text("", max_chars=100)
+        chunks = chunk_text("", max_chars=100)
         assert len(chunks) == 1
 
 
 class TestDeduplicateCards:
-    """Testes para _deduplicate_cards."""
+    """Testes para deduplicate_cards."""
 
     def test_no_duplicates(self):
         """Sem duplicatas retorna todos os cards."""
@@ -64,7 +75,7 @@ class TestDeduplicateCards:
             AnkiCard(front="Pergunta 2?", back="Resposta 2.", card_type="basic", tags=["t"]),
         ]
 
-        result = _deduplicate_cards(cards)
+        result = deduplicate_cards(cards)
         assert len(result) == 2
 
     def test_removes_exact_duplicates(self):
@@ -74,7 +85,7 @@ class TestDeduplicateCards:
             AnkiCard(front="Pergunta 1?", back="Resposta B.", card_type="basic", tags=["t"]),
         ]
 
-        result = _deduplicate_cards(cards)
+        result = deduplicate_cards(cards)
         assert len(result) == 1
         assert result[0].back == "Resposta A."  # Mantém o primeiro
 
@@ -85,9 +96,279 @@ class TestDeduplicateCards:
             AnkiCard(front="pergunta?", back="Outra.", card_type="basic", tags=["t"]),
         ]
 
-        result = _deduplicate_cards(cards)
+        result = deduplicate_cards(cards)
         assert len(result) == 1
 
     def test_empty_list(self):
         """Lista vazia retorna lista vazia."""
-        assert _deduplicate_cards([]) == []
+        assert deduplicate_cards([]) == []
+
+
+class TestFanOut:
+    """Testes para a divisão de pedidos grandes em sub-requisições."""
+
+    def test_small_request_not_split(self):
+        """Pedido abaixo do limite vira uma única requisição."""
+        assert _fan_out("texto", "auto", 5, max_cards_per_call=10) == [
+            ("texto", "auto", 5)
+        ]
+
+    def test_disabled_by_default(self):
+        """Sem limite, não há fan-out."""
+        assert len(_fan_out("texto", "auto", 50, max_cards_per_call=None)) == 1
+
+    def test_splits_into_disjoint_ranges(self):
+        """Pedido grande é dividido em faixas disjuntas que cobrem o chunk."""
+        paragraphs = [f"Art. {i}º Texto do artigo {i}." for i in range(1, 13)]
+        chunk = "\n\n".join(paragraphs)
+
+        requests = _fan_out(chunk, "cloze", 30, max_cards_per_call=10)
+
+        assert len(requests) == 3
+        assert sum(n for _, _, n in requests) == 30
+        assert all(t == "cloze" for _, t, _ in requests)
+        assert "\n\n".join(text for text, _, _ in requests) == chunk
+
+    def test_split_falls_back_to_lines(self):
+        """Sem parágrafos suficientes, divide por linhas."""
+        text = "linha 1\nlinha 2\nlinha 3\nlinha 4"
+        parts = _split_into_parts(text, 2)
+
+        assert parts == ["linha 1\nlinha 2", "linha 3\nlinha 4"]
+
+    def test_short_text_yields_fewer_parts(self):
+        """Texto curto demais gera menos faixas que o pedido."""
+        assert _split_into_parts("Frase única", 4) == ["Frase única"]
+
+
+class TestGenerateCardsFanOut:
+    """Testes de generate_cards com fan-out paralelo."""
+
+    def test_sub_requests_run_in_parallel_and_merge(self):
+        """Sub-requisições rodam em threads e os resultados são deduplicados."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        class Client:
+            def generate_structured(self, system_prompt, user_message, response_model):
+                barrier.wait()  # Falha se as 3 chamadas não forem simultâneas
+                marker = user_message.split("Artigo ")[1][:2]
+                return CardResponse(
+                    cards=[
+                        AnkiCard(
+                            front=f"Pergunta sobre o artigo {marker}?",
+                            back="Resposta com art. 5º da CF/88.",
+                            card_type="basic",
+                            tags=["t"],
+                        ),
+                        AnkiCard(
+                            front="Pergunta repetida em todas as faixas?",
+                            back="Resposta com art. 5º da CF/88.",
+                            card_type="basic",
+                            tags=["t"],
+                        ),
+                    ]
+                )
+
+        text = "\n\n".join(f"Artigo {i:02d} com conteúdo." for i in range(6))
+        cards = generate_cards(
+            text=text,
+            topic="t",
+            max_cards=30,
+            llm_client=Client(),
+            max_cards_per_call=10,
+            max_workers=3,
+        )
+
+        fronts = [c.front for c in cards]
+        assert len(fronts) == 4  # 3 únicos + 1 repetido deduplicado
+        assert fronts.count("Pergunta repetida em todas as faixas?") == 1
+
+
+class TestGenerateCardsNearDuplicates:
+    """Testes de generate_cards com quase duplicatas e índice persistente."""
+
+    class Client:
+        def generate_structured(self, system_prompt, user_message, response_model):
+            back = "O preso tem o direito de permanecer calado (art. 5º, LXIII, CF/88)."
+            return CardResponse(
+                cards=[
+                    AnkiCard(
+                        front="Qual o fundamento do direito ao silêncio do preso?",
+                        back=back,
+                        card_type="basic",
+                        tags=["t"],
+                    ),
+                    AnkiCard(
+                        front="Qual é o fundamento do direito ao silêncio do preso?",
+                        back=back,
+                        card_type="basic",
+                        tags=["t"],
+                    ),
+                ]
+            )
+
+    def test_disabled_by_default(self):
+        """Sem limiar, apenas fronts idênticos são removidos."""
+        cards = generate_cards(text="Texto", topic="t", llm_client=self.Client())
+        assert len(cards) == 2
+
+    def test_threshold_removes_reworded_cards(self):
+        """Com limiar, a pergunta reformulada é descartada."""
+        cards = generate_cards(
+            text="Texto", topic="t", llm_client=self.Client(), near_duplicate_threshold=0.7
+        )
+        assert [c.front for c in cards] == [
+            "Qual o fundamento do direito ao silêncio do preso?"
+        ]
+
+
+    def test_card_index_filters_and_hints(self):
+        """Com índice, cards conhecidos somem e os fronts cobertos viram dica."""
+        messages = []
+
+        class Client(self.Client):
+            def generate_structured(self, system_prompt, user_message, response_model):
+                messages.append(user_message)
+                return super().generate_structured(system_prompt, user_message, response_model)
+
+        index = CardIndex(":memory:")
+        index.add(
+            [
+                AnkiCard(
+                    front="Qual o fundamento do direito ao silêncio do preso?",
+                    back="Art. 5º, LXIII, CF/88.",
+                    card_type="basic",
+                    tags=["t"],
+                )
+            ]
+        )
+
+        cards = generate_cards(
+            text="Texto", topic="t", llm_client=Client(), card_index=index, covered_hints=True
+        )
+
+        assert cards == []
+        assert "- Qual o fundamento do direito ao silêncio do preso?" in messages[0]
+
+    def test_topic_without_tag_skips_topic_filter(self):
+        """Tópico que não vira tag ("!!!") usa os fronts de todos os tópicos."""
+        messages = []
+
+        class Client(self.Client):
+            def generate_structured(self, system_prompt, user_message, response_model):
+                messages.append(user_message)
+                return super().generate_structured(system_prompt, user_message, response_model)
+
+        index = CardIndex(":memory:")
+        index.add(
+            [
+                AnkiCard(
+                    front="Qual o prazo do mandado de segurança?",
+                    back="Cento e vinte dias, Lei 12.016/2009, art. 23.",
+                    card_type="basic",
+                    tags=["t"],
+                )
+            ]
+        )
+
+        cards = generate_cards(
+            text="Texto", topic="!!!", llm_client=Client(), card_index=index, covered_hints=True
+        )
+
+        assert cards
+        assert "- Qual o prazo do mandado de segurança?" in messages[0]
+        assert all("!!!" not in card.tags for card in cards)
+
+
+class TestIterChunks:
+    """Testes para o chunker incremental."""
+
+    def test_consumes_segments_lazily(self):
+        """Chunks são emitidos antes de todos os segmentos serem lidos."""
+        consumed = []
+
+        def pages():
+            for i in range(10):
+                consumed.append(i)
+                yield f"Página {i} " + "x" * 80
+
+        chunks = _iter_chunks(pages(), max_chars=200)
+        first = next(chunks)
+
+        assert first.startswith("Página 0")
+        assert len(consumed) < 10
+
+    def test_matches_chunk_text_on_joined_segments(self):
+        """Resultado equivale ao chunking do texto completo."""
+        pages = [f"Parágrafo {i} com conteúdo jurídico." for i in range(20)]
+
+        assert list(_iter_chunks(pages, max_chars=200)) == chunk_text(
+            "\n\n".join(pages), max_chars=200
+        )
+
+    def test_chunks_respect_max_chars(self):
+        """Nenhum chunk com vários parágrafos excede max_chars."""
+        pages = ["A" * 90, "B" * 90, "C" * 90]
+        chunks = list(_iter_chunks(pages, max_chars=200))
+
+        assert chunks == ["A" * 90 + "\n\n" + "B" * 90, "C" * 90]
+
+
+class TestGenerateCardsIter:
+    """Testes para a geração em modo streaming."""
+
+    class Client:
+        def __init__(self):
+            self.calls = 0
+
+        def generate_structured(self, system_prompt, user_message, response_model):
+            self.calls += 1
+            return CardResponse(
+                cards=[
+                    AnkiCard(
+                        front=f"Pergunta {self.calls}?",
+                        back="Resposta com art. 5º da CF/88.",
+                        card_type="basic",
+                        tags=["t"],
+                    ),
+                    AnkiCard(
+                        front="Pergunta repetida?",
+                        back="Resposta com art. 5º da CF/88.",
+                        card_type="basic",
+                        tags=["t"],
+                    ),
+                ]
+            )
+
+    def test_streams_cards_per_chunk(self):
+        """Gera cards por chunk, deduplicando entre chunks."""
+        client = self.Client()
+        pages = ["x" * 40_000 for _ in range(3)]
+
+        cards = list(
+            generate_cards_iter(pages, topic="t", llm_client=client, max_workers=1)
+        )
+
+        assert client.calls == 3
+        assert [c.front for c in cards].count("Pergunta repetida?") == 1
+        assert len(cards) == 4
+        assert "dificuldade::medio" in cards[0].tags
+
+    def test_stops_at_max_cards(self):
+        """Para de consumir a entrada ao atingir max_cards."""
+        client = self.Client()
+        consumed = []
+
+        def pages():
+            for i in range(50):
+                consumed.append(i)
+                yield "x" * 40_000
+
+        cards = list(
+            generate_cards_iter(
+                pages(), topic="t", max_cards=3, llm_client=client, max_workers=1
+            )
+        )
+
+        assert len(cards) == 3
+        assert len(consumed) < 50
@@ -0,0 +1,93 @@
+"""Testes para identidade estável de cards e IDs Anki."""
+
+from unittest.mock import patch
+
+from legal_anki.config import stable_anki_id
+from legal_anki.identity import (
+    SOURCE_KEY,
+    card_guid,
+    card_identity,
+    card_source,
+    deck_id_for,
+    with_source,
+)
+from legal_anki.models import AnkiCard, create_basic_model
+
+
+def _card(front="Qual o prazo do mandado de segurança?", back="120 dias", **kwargs):
+    kwargs.setdefault("card_type", "basic")
+    return AnkiCard(front=front, back=back, **kwargs)
+
+
+class TestStableAnkiId:
+    """Testes para stable_anki_id."""
+
+    def test_same_name_same_id(self):
+        """O ID depende só do nome."""
+        assert stable_anki_id("deck:LegalAnki") == stable_anki_id("deck:LegalAnki")
+        assert stable_anki_id("deck:LegalAnki") != stable_anki_id("deck:Outro")
+
+    def test_range(self):
+        """IDs ficam na faixa usada pelo Anki para modelos e decks."""
+        for name in ("a", "deck:LegalAnki", "model:LegalAnki Basic"):
+            assert (1 << 30) <= stable_anki_id(name) < (1 << 31)
+
+    def test_deck_id_from_name_or_settings(self):
+        """ANKI_DECK_ID tem prioridade sobre o ID derivado."""
+        with patch("legal_anki.identity.settings") as mock_settings:
+            mock_settings.anki_deck_id = None
+            assert deck_id_for("Penal") == stable_anki_id("deck:Penal")
+            mock_settings.anki_deck_id = 123
+            assert deck_id_for("Penal") == 123
+
+    def test_model_id_from_name(self):
+        """Sem configuração, o modelo recebe o ID derivado do nome."""
+        with patch("legal_anki.models.settings") as mock_settings:
+            mock_settings.anki_model_basic_id = None
+            model = create_basic_model()
+        assert model.model_id == stable_anki_id("model:LegalAnki Basic")
+
+
+class TestCardIdentity:
+    """Testes para card_identity e card_guid."""
+
+    def test_guid_ignores_back_and_extra(self):
+        """Revisar o verso mantém a mesma nota."""
+        a = _card(back="120 dias")
+        b = _card(back="120 dias, contados da ciência do ato", extra={"fundamento": "Lei 12.016"})
+        assert card_guid(a) == card_guid(b)
+
+    def test_guid_ignores_case_and_accents(self):
+        """Front normalizado: caixa, acentos e pontuação não mudam o GUID."""
+        a = _card(front="Qual é o prazo do mandado de segurança?")
+        b = _card(front="qual e o prazo do MANDADO de seguranca")
+        assert card_identity(a) == card_identity(b)
+
+    def test_guid_depends_on_source_and_type(self):
+        """O mesmo front em arquivos ou tipos diferentes gera notas diferentes."""
+        card = _card()
+        assert card_guid(with_source(card, "lei.pdf")) != card_guid(with_source(card, "aula.pdf"))
+        assert card_guid(card) != card_guid(_card(card_type="questao"))
+
+    def test_guid_format(self):
+        """GUID em base 91, como o do genanki."""
+        guid = card_guid(_card())
+        assert 0 < len(guid) <= 10
+        assert "\x1f" not in guid
+
+
+class TestWithSource:
+    """Testes para with_source."""
+
+    def test_adds_source(self):
+        """A origem vai para o extra, sem alterar o card original."""
+        card = _card(extra={"fundamento": "Lei 12.016"})
+        tagged = with_source(card, "lei.pdf")
+        assert card_source(tagged) == "lei.pdf"
+        assert tagged.extra["fundamento"] == "Lei 12.016"
+        assert card_source(card) == ""
+
+    def test_keeps_existing_source(self):
+        """Uma origem já registrada não é sobrescrita."""
+        card = _card(extra={SOURCE_KEY: "original.pdf"})
+        assert with_source(card, "outro.pdf") is card
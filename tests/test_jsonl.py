@@ -0,0 +1,138 @@
+"""Testes para o formato JSON Lines de cards."""
+
+import gzip
+import json
+
+import pytest
+
+from legal_anki.exporters import JsonlCardWriter, export_to_jsonl
+from legal_anki.jsonl import (
+    JSONL_FORMAT,
+    JsonlCardReader,
+    JsonlFormatError,
+    iter_jsonl_cards,
+)
+from legal_anki.prompts.system import prompt_version
+
+
+class TestJsonlRoundTrip:
+    """Escrita e leitura de JSON Lines."""
+
+    def test_header_and_one_card_per_line(self, sample_cards, tmp_path):
+        """Primeira linha é o cabeçalho; depois, um card por linha."""
+        path = export_to_jsonl(sample_cards, tmp_path / "cards.jsonl", metadata={"topic": "cf"})
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        header = json.loads(lines[0])
+        assert header["format"] == JSONL_FORMAT
+        assert header["prompt_version"] == prompt_version()
+        assert header["topic"] == "cf"
+        assert len(lines) == len(sample_cards) + 1
+
+    def test_reader_yields_validated_cards(self, sample_cards, tmp_path):
+        """O leitor devolve AnkiCards iguais aos exportados."""
+        path = export_to_jsonl(sample_cards, tmp_path / "cards.jsonl")
+
+        with JsonlCardReader(path) as reader:
+            cards = list(reader)
+            assert reader.header["model"]
+
+        assert cards == sample_cards
+
+    @pytest.mark.parametrize("name", ["cards.jsonl", "cards.jsonl.gz"])
+    def test_resume_from_offset(self, sample_cards, tmp_path, name):
+        """A posição de um card retoma a leitura nele, comprimido ou não."""
+        path = export_to_jsonl(sample_cards, tmp_path / name)
+
+        with JsonlCardReader(path) as reader:
+            offsets = [offset for offset, _ in reader.iter_with_offsets()]
+            resumed = [card for _, card in reader.iter_with_offsets(offsets[2])]
+
+        assert resumed == sample_cards[2:]
+        assert list(iter_jsonl_cards(path, offset=offsets[1])) == sample_cards[1:]
+
+    def test_gzip_by_extension(self, sample_cards, tmp_path):
+        """Extensão .gz comprime com gzip."""
+        path = export_to_jsonl(sample_cards, tmp_path / "cards.jsonl.gz")
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            assert json.loads(f.readline())["format"] == JSONL_FORMAT
+        assert list(iter_jsonl_cards(path)) == sample_cards
+
+    def test_zstd_by_extension(self, sample_cards, tmp_path):
+        """Extensão .zst comprime com zstd (dependência opcional)."""
+        pytest.importorskip("zstandard")
+        path = export_to_jsonl(sample_cards, tmp_path / "cards.jsonl.zst")
+
+        assert path.read_bytes()[:4] == b"\x28\xb5\x2f\xfd"
+        assert list(iter_jsonl_cards(path)) == sample_cards
+
+    def test_zstd_resume_from_offset(self, sample_cards, tmp_path):
+        """O descompressor zstd não volta atrás: a retomada reabre e avança."""
+        pytest.importorskip("zstandard")
+        path = export_to_jsonl(sample_cards, tmp_path / "cards.jsonl.zst")
+
+        with JsonlCardReader(path) as reader:
+            offsets = [offset for offset, _ in reader.iter_with_offsets()]
+            resumed = [card for _, card in reader.iter_with_offsets(offsets[2])]
+            again = [card for _, card in reader.iter_with_offsets(offsets[1])]
+
+        assert resumed == sample_cards[2:]
+        assert again == sample_cards[1:]
+        assert list(iter_jsonl_cards(path, offset=offsets[1])) == sample_cards[1:]
+
+    def test_zstd_headerless_file(self, sample_card_basic, tmp_path):
+        """Arquivo zstd sem cabeçalho é lido desde a primeira linha."""
+        zstandard = pytest.importorskip("zstandard")
+        path = tmp_path / "cards.jsonl.zst"
+        line = sample_card_basic.model_dump_json() + "\n"
+        path.write_bytes(zstandard.ZstdCompressor().compress(line.encode("utf-8")))
+
+        assert list(iter_jsonl_cards(path)) == [sample_card_basic]
+
+    def test_streams_from_generator(self, sample_cards, tmp_path):
+        """O escritor aceita geradores."""
+        path = tmp_path / "cards.jsonl"
+        with JsonlCardWriter(path) as writer:
+            writer.write_cards(card for card in sample_cards)
+
+        assert writer.count == len(sample_cards)
+        assert len(list(iter_jsonl_cards(path))) == len(sample_cards)
+
+
+class TestJsonlReaderErrors:
+    """Linhas inválidas e cabeçalhos incompatíveis."""
+
+    def test_headerless_file(self, sample_card_basic, tmp_path):
+        """Arquivos sem cabeçalho são lidos desde a primeira linha."""
+        path = tmp_path / "cards.jsonl"
+        path.write_text(sample_card_basic.model_dump_json() + "\n", encoding="utf-8")
+
+        with JsonlCardReader(path) as reader:
+            assert list(reader) == [sample_card_basic]
+            assert reader.header == {}
+
+    def test_invalid_card(self, sample_card_basic, tmp_path):
+        """Card inválido levanta erro, ou é pulado com skip_invalid."""
+        path = tmp_path / "cards.jsonl"
+        path.write_text(
+            '{"front": "", "back": "x", "card_type": "basic"}\n'
+            + sample_card_basic.model_dump_json()
+            + "\n",
+            encoding="utf-8",
+        )
+
+        with pytest.raises(JsonlFormatError, match="posição 0"):
+            list(iter_jsonl_cards(path))
+
+        with JsonlCardReader(path, skip_invalid=True) as reader:
+            assert list(reader) == [sample_card_basic]
+            assert reader.skipped == 1
+
+    def test_newer_version_rejected(self, tmp_path):
+        """Cabeçalho de versão futura levanta JsonlFormatError."""
+        path = tmp_path / "cards.jsonl"
+        path.write_text(json.dumps({"format": JSONL_FORMAT, "version": 99}) + "\n")
+
+        with pytest.raises(JsonlFormatError, match="versão 99"):
+            JsonlCardReader(path).open()
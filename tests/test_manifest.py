@@ -0,0 +1,104 @@
+"""Testes para o manifesto de exportação incremental."""
+
+import json
+
+import pytest
+
+from legal_anki.anki_import import iter_apkg_notes
+from legal_anki.exporters import export_cards
+from legal_anki.identity import card_identity
+from legal_anki.manifest import (
+    ExportManifest,
+    ManifestError,
+    content_hash,
+    file_sha256,
+    load_manifest,
+    select_changed,
+    write_manifest,
+)
+
+
+class TestSelectChanged:
+    """Testes para select_changed."""
+
+    def test_first_export_takes_everything(self, sample_cards):
+        """Sem manifesto anterior, todos os cards são novos."""
+        delta, entries = select_changed(sample_cards, ExportManifest())
+        assert delta == sample_cards
+        assert entries == {card_identity(c): content_hash(c) for c in sample_cards}
+
+    def test_only_new_and_changed(self, sample_cards):
+        """Cards inalterados ficam fora do delta; alterados e novos entram."""
+        _, entries = select_changed(sample_cards[:2], ExportManifest())
+        changed = sample_cards[0].model_copy(update={"back": "Verso revisado"})
+        current = [changed, sample_cards[1], sample_cards[2]]
+
+        delta, updated = select_changed(current, ExportManifest(cards=entries))
+        assert delta == [changed, sample_cards[2]]
+        assert len(updated) == 3
+
+    def test_removed_cards_leave_manifest(self, sample_cards):
+        """O manifesto atualizado reflete só o deck atual."""
+        _, entries = select_changed(sample_cards, ExportManifest())
+        delta, updated = select_changed(sample_cards[:1], ExportManifest(cards=entries))
+        assert delta == []
+        assert list(updated) == [card_identity(sample_cards[0])]
+
+
+class TestManifestFile:
+    """Testes para leitura e gravação do manifesto."""
+
+    def test_missing_file_is_empty(self, tmp_path):
+        """Primeira exportação: manifesto inexistente equivale a vazio."""
+        assert load_manifest(tmp_path / "manifest.json").cards == {}
+
+    def test_roundtrip(self, tmp_path):
+        """O que é gravado é lido de volta."""
+        path = tmp_path / "sub" / "manifest.json"
+        write_manifest(ExportManifest(cards={"a": "1"}, deck_name="Deck"), path)
+        manifest = load_manifest(path)
+        assert manifest.cards == {"a": "1"}
+        assert manifest.deck_name == "Deck"
+        assert [p.name for p in path.parent.iterdir()] == ["manifest.json"]
+
+    def test_invalid_and_newer_version(self, tmp_path):
+        """JSON inválido ou de versão futura levanta ManifestError."""
+        path = tmp_path / "manifest.json"
+        path.write_text("{not json", encoding="utf-8")
+        with pytest.raises(ManifestError):
+            load_manifest(path)
+        path.write_text(json.dumps({"version": 99}), encoding="utf-8")
+        with pytest.raises(ManifestError, match="versão"):
+            load_manifest(path)
+
+
+class TestDeltaExport:
+    """Testes para export_cards com manifesto."""
+
+    def test_delta_apkg(self, sample_cards, tmp_path):
+        """A segunda exportação contém só o card alterado."""
+        manifest_path = tmp_path / "deck.manifest.json"
+        first = export_cards(
+            sample_cards, tmp_path / "v1.apkg", format="apkg", manifest=manifest_path
+        )
+        manifest = load_manifest(manifest_path)
+        assert manifest.delta_cards == len(sample_cards)
+        assert manifest.artifact == "v1.apkg"
+        assert manifest.artifact_sha256 == file_sha256(first)
+
+        changed = sample_cards[1].model_copy(update={"back": "SV 11 - Algemas"})
+        current = [sample_cards[0], changed, *sample_cards[2:]]
+        second = export_cards(current, tmp_path / "v2.apkg", format="apkg", manifest=manifest_path)
+        assert [n.fields[0] for n in iter_apkg_notes(second)] == [changed.front]
+        assert load_manifest(manifest_path).delta_cards == 1
+
+    def test_no_changes_writes_nothing(self, sample_cards, tmp_path):
+        """Sem cards novos ou alterados, nenhum arquivo é gerado."""
+        manifest_path = tmp_path / "manifest.json"
+        export_cards(sample_cards, tmp_path / "v1.csv", manifest=manifest_path)
+
+        assert export_cards(sample_cards, tmp_path / "v2.csv", manifest=manifest_path) is None
+        assert not (tmp_path / "v2.csv").exists()
+        manifest = load_manifest(manifest_path)
+        assert manifest.delta_cards == 0
+        assert len(manifest.cards) == len(sample_cards)
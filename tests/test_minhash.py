@@ -0,0 +1,156 @@
+"""Testes para assinaturas MinHash e o índice LSH."""
+
+import pytest
+
+from legal_anki.minhash import (
+    LSHIndex,
+    MinHasher,
+    containment,
+    jaccard,
+    normalize_text,
+    optimal_bands,
+    shingles,
+    similarity,
+)
+
+_ART = (
+    "Art. 5º Todos são iguais perante a lei, sem distinção de qualquer natureza, "
+    "garantindo-se aos brasileiros e aos estrangeiros residentes no País a "
+    "inviolabilidade do direito à vida, à liberdade, à igualdade, à segurança e "
+    "à propriedade, nos termos seguintes"
+)
+
+
+class TestShingles:
+    """Testes para normalize_text e shingles."""
+
+    def test_normalize_ignores_accents_case_and_punctuation(self):
+        """Acentos, caixa e pontuação não afetam a comparação."""
+        assert normalize_text("Direito ao SILÊNCIO, do preso!") == "direito ao silencio do preso"
+
+    def test_shingles_are_stable_word_ngrams(self):
+        """Shingles são n-gramas de palavras com hash determinístico."""
+        assert len(shingles("a b c d", size=2)) == 3
+        assert shingles("Art. 5º", size=3) == shingles("art 5º", size=3)
+        assert shingles("...") == set()
+
+    def test_jaccard(self):
+        """Jaccard exato entre conjuntos de shingles."""
+        a = shingles("qual o prazo do mandado", size=1)
+        b = shingles("qual o prazo do recurso", size=1)
+
+        assert jaccard(a, b) == pytest.approx(4 / 6)
+        assert jaccard(a, set()) == 0.0
+
+    def test_containment(self):
+        """Contenção mede o menor conjunto dentro do maior."""
+        a = shingles("prazo do mandado", size=1)
+        b = shingles("qual o prazo do mandado de segurança", size=1)
+
+        assert containment(a, b) == 1.0
+        assert jaccard(a, b) == pytest.approx(3 / 7)
+        assert containment(a, set()) == 0.0
+
+    def test_invalid_size(self):
+        """Tamanho de shingle deve ser positivo."""
+        with pytest.raises(ValueError):
+            shingles("texto", size=0)
+
+
+class TestMinHasher:
+    """Testes para MinHasher e similarity."""
+
+    def test_identical_and_unrelated_texts(self):
+        """Textos idênticos têm similaridade 1; textos diferentes, baixa."""
+        hasher = MinHasher()
+        a = hasher.text_signature(_ART)
+        b = hasher.text_signature(_ART.upper())
+        c = hasher.text_signature(
+            "Súmula vinculante sobre nepotismo na administração pública direta"
+        )
+
+        assert similarity(a, b) == 1.0
+        assert similarity(a, c) < 0.2
+
+    def test_near_duplicate_scores_high(self):
+        """Uma pequena variação mantém a similaridade alta."""
+        hasher = MinHasher(num_perm=128)
+        a = hasher.text_signature(_ART)
+        b = hasher.text_signature(_ART + ":")
+        c = hasher.text_signature(_ART.replace("segurança", "seguranca pública"))
+
+        assert similarity(a, b) == 1.0
+        assert similarity(a, c) > 0.7
+
+    def test_empty_text_has_empty_signature(self):
+        """Texto sem palavras não é similar a nada."""
+        hasher = MinHasher()
+        assert hasher.text_signature("") == ()
+        assert similarity((), ()) == 0.0
+
+    def test_signatures_are_deterministic(self):
+        """Instâncias com os mesmos parâmetros geram a mesma assinatura."""
+        assert MinHasher(seed=3).text_signature(_ART) == MinHasher(seed=3).text_signature(_ART)
+
+    def test_hash_scheme_is_frozen(self):
+        """Shingles, assinaturas e chaves de faixa não mudam entre versões.
+
+        As chaves de faixa ficam gravadas no ``CardIndex``; mudar o esquema
+        invalidaria os índices já existentes.
+        """
+        sig = MinHasher().text_signature(_ART)
+
+        assert sorted(shingles("prazo de cento e vinte dias"))[:2] == [
+            5372731319425359526,
+            8998181653986682369,
+        ]
+        assert sig[:4] == (13748486, 23937652, 630344366, 307879)
+        assert LSHIndex().band_keys(sig)[:2] == [1876515759, 5616595676]
+
+    def test_single_shingle_signature_is_tuple(self):
+        """Com um único shingle, a assinatura também é uma tupla de ints."""
+        sig = MinHasher().text_signature("prazo", size=1)
+        assert isinstance(sig, tuple)
+        assert len(sig) == 64
+
+
+class TestLSHIndex:
+    """Testes para LSHIndex."""
+
+    def test_query_finds_near_duplicates_only(self):
+        """A consulta devolve apenas assinaturas acima do limiar."""
+        hasher = MinHasher()
+        index = LSHIndex(threshold=0.8)
+        index.insert("art5", hasher.text_signature(_ART))
+        index.insert("outro", hasher.text_signature("Compete privativamente à União legislar"))
+
+        matches = index.query(hasher.text_signature(_ART + " e seguintes"))
+
+        assert [key for key, _ in matches] == ["art5"]
+        assert matches[0][1] >= 0.8
+        assert len(index) == 2
+
+    def test_remove(self):
+        """Chaves removidas deixam de ser encontradas."""
+        hasher = MinHasher()
+        index = LSHIndex()
+        sig = hasher.text_signature(_ART)
+        index.insert("a", sig)
+        index.remove("a")
+
+        assert "a" not in index
+        assert index.query(sig) == []
+
+    def test_band_keys_are_stable_signed_ints(self):
+        """Chaves de faixa cabem em INTEGER do SQLite e não variam."""
+        sig = MinHasher().text_signature(_ART)
+        keys = LSHIndex().band_keys(sig)
+
+        assert keys == LSHIndex().band_keys(sig)
+        assert all(-(2**63) <= k < 2**63 for k in keys)
+
+    def test_optimal_bands(self):
+        """O limiar efetivo escolhido não passa do pedido."""
+        bands, rows = optimal_bands(64, 0.8)
+        assert bands * rows == 64
+        assert (1 / bands) ** (1 / rows) <= 0.8
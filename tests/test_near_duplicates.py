@@ -0,0 +1,105 @@
+"""Testes para a detecção de cards quase duplicados."""
+
+import pytest
+
+from legal_anki.models import AnkiCard
+from legal_anki.near_duplicates import (
+    NearDuplicateIndex,
+    deduplicate_near,
+    group_near_duplicates,
+)
+
+_BACK = (
+    "Art. 5º, LXIII, CF/88: o preso será informado de seus direitos, entre os "
+    "quais o de permanecer calado."
+)
+
+
+def _card(front: str, back: str = _BACK, **extra) -> AnkiCard:
+    return AnkiCard(front=front, back=back, card_type="basic", tags=["teste"], extra=extra or None)
+
+
+class TestGroupNearDuplicates:
+    """Testes para group_near_duplicates."""
+
+    def test_reworded_fronts_are_grouped(self):
+        """Perguntas reformuladas com o mesmo verso formam um grupo."""
+        cards = [
+            _card("Qual o fundamento constitucional do direito ao silêncio?"),
+            _card("Qual é o fundamento constitucional do direito ao silêncio do preso?"),
+            _card(
+                "Qual o quórum de aprovação de emenda constitucional?",
+                "Três quintos dos votos, em dois turnos, em cada Casa (art. 60, § 2º).",
+            ),
+        ]
+
+        assert group_near_duplicates(cards) == [[0, 1], [2]]
+
+    def test_request_pair_with_reworded_backs(self):
+        """O par do pedido é agrupado nos defaults, com versos redigidos de outra forma."""
+        cards = [
+            _card("Qual o fundamento do direito ao silêncio?"),
+            _card(
+                "Qual é o fundamento constitucional do direito ao silêncio do preso?",
+                "Decorre do art. 5º, LXIII, da Constituição Federal, que assegura ao "
+                "preso o direito de permanecer calado e a assistência da família e de "
+                "advogado.",
+            ),
+        ]
+
+        assert group_near_duplicates(cards) == [[0, 1]]
+
+    def test_back_must_also_match(self):
+        """Fronts iguais com versos diferentes não são duplicatas."""
+        cards = [
+            _card("Qual o prazo para impetrar mandado de segurança?"),
+            _card(
+                "Qual o prazo para impetrar mandado de segurança?",
+                "Cento e vinte dias da ciência do ato impugnado, Lei 12.016/2009, art. 23.",
+            ),
+        ]
+
+        assert group_near_duplicates(cards) == [[0], [1]]
+        assert group_near_duplicates(cards, back_threshold=0) == [[0, 1]]
+
+    def test_index_is_incremental(self):
+        """O índice aceita cards aos poucos e retorna a chave do similar."""
+        index = NearDuplicateIndex()
+        index.add("a", _card("Qual o fundamento do direito ao silêncio do preso?"))
+
+        assert index.find(_card("Qual o fundamento do direito ao silêncio do preso")) == "a"
+        assert index.find(_card("O que é mandado de injunção coletivo?")) is None
+        assert len(index) == 1
+
+
+class TestDeduplicateNear:
+    """Testes para deduplicate_near."""
+
+    def test_keep_first(self):
+        """keep_first mantém o primeiro card de cada grupo."""
+        cards = [
+            _card("Qual o fundamento do direito ao silêncio do preso?"),
+            _card("Qual é o fundamento do direito ao silêncio do preso?"),
+        ]
+
+        assert deduplicate_near(cards) == [cards[0]]
+
+    def test_keep_best(self):
+        """keep_best prefere o card com fundamento e verso mais completo."""
+        weak = _card(
+            "Qual o fundamento do direito ao silêncio do preso?",
+            "O preso tem o direito de permanecer calado.",
+        )
+        strong = _card(
+            "Qual é o fundamento do direito ao silêncio do preso?",
+            "O preso tem o direito de permanecer calado, art. 5º.",
+            fundamento="Art. 5º, LXIII, CF/88",
+        )
+
+        assert deduplicate_near([weak, strong], policy="keep_best") == [strong]
+        assert deduplicate_near([weak, strong], policy="keep_first") == [weak]
+
+    def test_unknown_policy(self):
+        """Políticas desconhecidas são rejeitadas."""
+        with pytest.raises(ValueError, match="Política"):
+            deduplicate_near([], policy="keep_last")
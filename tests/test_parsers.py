@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import csv
+import io
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from legal_anki.parsers import ParseError, parse_file
+from legal_anki.parsers import ParseError, iter_csv_rows, iter_file, parse_bytes, parse_file
 
 
 class TestParseTxt:
@@ -31,6 +32,16 @@ class TestParseTxt:
         assert "§" in result
         assert "º" in result
 
+    @pytest.mark.parametrize("mmap_min_bytes", [0, 1 << 30])
+    def test_parse_txt_strips_bom(self, tmp_path, monkeypatch, mmap_min_bytes):
+        """O BOM do UTF-8 é removido com ou sem mmap, e também em iter_file."""
+        monkeypatch.setattr("legal_anki.parsers._MMAP_MIN_BYTES", mmap_min_bytes)
+        f = tmp_path / "input.txt"
+        f.write_text("\ufeffArt. 5º da CF/88", encoding="utf-8")
+
+        assert parse_file(f) == "Art. 5º da CF/88"
+        assert list(iter_file(f)) == ["Art. 5º da CF/88"]
+
     def test_parse_txt_empty_raises_error(self, tmp_path):
         """Arquivo vazio levanta ParseError."""
         f = tmp_path / "empty.txt"
@@ -162,6 +173,147 @@ class TestParseCsv:
             parse_file(csv_path)
 
 
+class TestIterCsvRows:
+    """Testes para a leitura de CSV linha a linha."""
+
+    def test_rows_keyed_by_header(self, tmp_path):
+        """Com cabeçalho, células são indexadas pelo nome da coluna."""
+        csv_path = tmp_path / "test.csv"
+        csv_path.write_text(
+            "enunciado;gabarito\n\"Questão com\nquebra\";Certo\nOutra;Errado\n",
+            encoding="utf-8",
+        )
+
+        rows = list(iter_csv_rows(csv_path))
+
+        assert [r.number for r in rows] == [1, 2]
+        assert rows[0].values == {"enunciado": "Questão com\nquebra", "gabarito": "Certo"}
+        assert rows[1].text == "Outra | Errado"
+
+    def test_duplicate_and_blank_headers_keep_all_cells(self, tmp_path):
+        """Colunas repetidas ou sem nome são renomeadas, sem perder células."""
+        csv_path = tmp_path / "test.csv"
+        csv_path.write_text("nota;;nota\nA;B;C\nD;E;F\n", encoding="utf-8")
+
+        rows = list(iter_csv_rows(csv_path))
+
+        assert rows[0].values == {"nota": "A", "2": "B", "nota_2": "C"}
+        assert rows[1].text == "D | E | F"
+
+    def test_bom_does_not_change_first_column(self, tmp_path):
+        """O BOM do UTF-8 não entra no nome da primeira coluna."""
+        csv_path = tmp_path / "test.csv"
+        csv_path.write_text("\ufeffenunciado;gabarito\nQuestão;Certo\n", encoding="utf-8")
+
+        rows = list(iter_csv_rows(csv_path))
+
+        assert rows[0].values == {"enunciado": "Questão", "gabarito": "Certo"}
+
+    def test_rows_without_header(self, tmp_path):
+        """Sem cabeçalho, colunas são numeradas a partir de 1."""
+        csv_path = tmp_path / "test.csv"
+        csv_path.write_text("Art. 5º;Direitos\nArt. 6º;Sociais\n", encoding="utf-8")
+
+        rows = list(iter_csv_rows(csv_path))
+
+        assert rows[0].values == {"1": "Art. 5º", "2": "Direitos"}
+
+    def test_single_header_like_row_is_data(self, tmp_path):
+        """Uma única linha nunca é tratada como cabeçalho."""
+        csv_path = tmp_path / "test.csv"
+        csv_path.write_text("sumula;vinculante\n", encoding="utf-8")
+
+        rows = list(iter_csv_rows(csv_path))
+
+        assert [r.text for r in rows] == ["sumula | vinculante"]
+
+    def test_empty_raises(self, tmp_path):
+        """CSV vazio levanta ParseError."""
+        csv_path = tmp_path / "empty.csv"
+        csv_path.write_text("", encoding="utf-8")
+
+        with pytest.raises(ParseError, match="vazio"):
+            list(iter_csv_rows(csv_path))
+
+    def test_iter_file_yields_rows(self, tmp_path):
+        """iter_file em CSV gera um segmento por linha."""
+        csv_path = tmp_path / "test.csv"
+        csv_path.write_text("a;b\n1;2\n3;4\n", encoding="utf-8")
+
+        assert list(iter_file(csv_path)) == ["1 | 2", "3 | 4"]
+
+
+class TestParseBytes:
+    """Testes para extração a partir de conteúdo em memória."""
+
+    def _pdf_bytes(self, text: str) -> bytes:
+        import pymupdf
+
+        doc = pymupdf.open()
+        doc.new_page().insert_text((72, 72), text)
+        data = doc.tobytes()
+        doc.close()
+        return data
+
+    @pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, io.BytesIO])
+    def test_pdf_from_buffer(self, wrap):
+        """PDF em bytes, memoryview ou BytesIO é extraído sem arquivo."""
+        data = self._pdf_bytes("Art. 5º Todos são iguais perante a lei.")
+
+        assert parse_bytes(wrap(data), "pdf") == "Art. 5º Todos são iguais perante a lei."
+
+    def test_pdf_from_mmap(self, tmp_path):
+        """PDF mapeado em memória é extraído, e o mapeamento pode ser fechado."""
+        import mmap
+
+        path = tmp_path / "lei.pdf"
+        path.write_bytes(self._pdf_bytes("Art. 6º São direitos sociais."))
+
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            assert parse_bytes(mm, "pdf") == "Art. 6º São direitos sociais."
+
+    def test_docx_from_stream(self):
+        """DOCX é lido direto de um stream."""
+        import docx
+
+        buf = io.BytesIO()
+        doc = docx.Document()
+        doc.add_paragraph("Súmula Vinculante 11 - STF.")
+        doc.save(buf)
+
+        assert parse_bytes(buf.getvalue(), "docx") == "Súmula Vinculante 11 - STF."
+        buf.seek(0)
+        assert parse_bytes(buf, ".DOCX") == "Súmula Vinculante 11 - STF."
+
+    def test_txt_and_csv(self):
+        """TXT (com BOM e CRLF) e CSV são decodificados do buffer."""
+        assert parse_bytes("\ufeffLinha 1\r\nLinha 2".encode(), "txt") == "Linha 1\nLinha 2"
+        csv_data = "enunciado;gabarito\nQuestão A;Certo\n".encode()
+        assert parse_bytes(memoryview(csv_data), "csv") == "Questão A | Certo"
+
+    def test_unsupported_and_empty(self):
+        """Formato não suportado e conteúdo vazio levantam ParseError."""
+        with pytest.raises(ParseError, match="não suportado"):
+            parse_bytes(b"x", "xlsx")
+        with pytest.raises(ParseError, match="vazio"):
+            parse_bytes(b"   ", "txt", name="upload.txt")
+
+    def test_invalid_pdf(self):
+        """Bytes que não são PDF levantam ParseError."""
+        with pytest.raises(ParseError, match="upload.pdf"):
+            parse_bytes(b"nao sou pdf", "pdf", name="upload.pdf")
+
+    def test_large_txt_uses_mmap(self, tmp_path, monkeypatch):
+        """TXT acima do limite é lido via mmap, com o mesmo resultado."""
+        import legal_anki.parsers as parsers
+
+        monkeypatch.setattr(parsers, "_MMAP_MIN_BYTES", 1)
+        txt_path = tmp_path / "lei.txt"
+        txt_path.write_bytes("Art. 1º Texto.\r\nArt. 2º Outro.".encode())
+
+        assert parse_file(txt_path) == "Art. 1º Texto.\nArt. 2º Outro."
+
+
 class TestParseFileGeneral:
     """Testes gerais para parse_file."""
 
@@ -185,3 +337,101 @@ class TestParseFileGeneral:
 
         with pytest.raises(ParseError, match="vazio"):
             parse_file(f)
+
+
+class TestIterFile:
+    """Testes para a extração incremental (streaming)."""
+
+    def test_pdf_yields_one_segment_per_page(self, tmp_path):
+        """PDF é lido página a página."""
+        import pymupdf
+
+        pdf_path = tmp_path / "multi.pdf"
+        doc = pymupdf.open()
+        for i in range(3):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Página {i + 1}: conteúdo jurídico.")
+        doc.new_page()  # Página em branco é omitida
+        doc.save(str(pdf_path))
+        doc.close()
+
+        segments = list(iter_file(pdf_path))
+
+        assert len(segments) == 3
+        assert "Página 1" in segments[0]
+        assert "Página 3" in segments[2]
+
+    def test_iter_file_is_lazy(self, tmp_path):
+        """Nada é lido até o iterador ser consumido."""
+        f = tmp_path / "input.txt"
+        f.write_text("Art. 1º Texto.", encoding="utf-8")
+
+        segments = iter_file(f)
+        f.write_text("Art. 2º Outro texto.", encoding="utf-8")
+
+        assert list(segments) == ["Art. 2º Outro texto."]
+
+    def test_txt_yields_paragraph_blocks(self, tmp_path):
+        """TXT é lido em blocos separados por linhas em branco."""
+        f = tmp_path / "input.txt"
+        f.write_text("Art. 1º\nTexto.\n\n\nArt. 2º\nOutro.\n", encoding="utf-8")
+
+        assert list(iter_file(f)) == ["Art. 1º\nTexto.\n", "Art. 2º\nOutro.\n"]
+
+    def test_empty_file_raises_on_consumption(self, tmp_path):
+        """Arquivo vazio levanta ParseError ao consumir o iterador."""
+        f = tmp_path / "empty.txt"
+        f.write_text("  \n\n", encoding="utf-8")
+
+        with pytest.raises(ParseError, match="vazio"):
+            list(iter_file(f))
+
+    def test_unsupported_extension(self, tmp_path):
+        """Extensão não suportada levanta ParseError."""
+        f = tmp_path / "test.xlsx"
+        f.write_text("data", encoding="utf-8")
+
+        with pytest.raises(ParseError, match="não suportado"):
+            list(iter_file(f))
+
+
+class TestParallelPdf:
+    """Testes para a extração de PDF multiprocesso."""
+
+    def _build_pdf(self, path, pages):
+        import pymupdf
+
+        doc = pymupdf.open()
+        for i in range(pages):
+            page = doc.new_page()
+            if i != 3:  # Uma página em branco no meio
+                page.insert_text((72, 72), f"Art. {i + 1}º Página {i + 1}.")
+        doc.save(str(path))
+        doc.close()
+
+    def test_parallel_matches_serial(self, tmp_path, monkeypatch):
+        """Extração paralela remonta as páginas na mesma ordem da serial."""
+        from legal_anki import parsers
+
+        monkeypatch.setattr(parsers, "_PARALLEL_PDF_MIN_PAGES", 2)
+        pdf_path = tmp_path / "big.pdf"
+        self._build_pdf(pdf_path, 12)
+
+        serial = parse_file(pdf_path, workers=1)
+        parallel = parse_file(pdf_path, workers=3)
+
+        assert parallel == serial
+        assert serial.index("Página 1.") < serial.index("Página 12.")
+
+    def test_small_pdf_stays_serial(self, tmp_path, monkeypatch):
+        """PDFs abaixo do limite não sobem processos."""
+        from legal_anki import parsers
+
+        def fail(*args, **kwargs):
+            raise AssertionError("não deveria paralelizar")
+
+        monkeypatch.setattr(parsers, "_extract_pdf_parallel", fail)
+        pdf_path = tmp_path / "small.pdf"
+        self._build_pdf(pdf_path, 5)
+
+        assert "Página 5" in parse_file(pdf_path, workers=4)
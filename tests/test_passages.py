@@ -0,0 +1,64 @@
+"""Testes para a deduplicação de passagens entre documentos."""
+
+from legal_anki.passages import PassageIndex, dedupe_passages, split_passages
+
+_ART1 = (
+    "Art. 1º A República Federativa do Brasil, formada pela união indissolúvel dos "
+    "Estados e Municípios e do Distrito Federal, constitui-se em Estado Democrático "
+    "de Direito e tem como fundamentos a soberania, a cidadania e a dignidade."
+)
+_ART2 = (
+    "Art. 2º São Poderes da União, independentes e harmônicos entre si, o "
+    "Legislativo, o Executivo e o Judiciário, cada qual com as funções que a "
+    "Constituição lhe atribui, vedada a delegação de atribuições entre eles."
+)
+_NOTES = (
+    "Na aula de hoje estudamos o controle concentrado de constitucionalidade, "
+    "com ênfase na legitimidade ativa para a ADI e na pertinência temática "
+    "exigida de confederações sindicais e entidades de classe de âmbito nacional."
+)
+
+
+class TestSplitPassages:
+    """Testes para split_passages."""
+
+    def test_splits_paragraphs(self):
+        """Parágrafos separados por linha em branco viram passagens."""
+        assert split_passages(f"{_NOTES}\n\n{_ART1}") == [_NOTES, _ART1]
+
+    def test_splits_articles_within_paragraph(self):
+        """Lei seca sem linhas em branco é quebrada por artigo."""
+        assert split_passages(f"{_ART1}\n{_ART2}") == [_ART1, _ART2]
+
+    def test_short_units_are_merged(self):
+        """Títulos curtos são anexados à passagem seguinte."""
+        passages = split_passages(f"TÍTULO I\n\n{_ART1}\n\nFim.")
+
+        assert passages == [f"TÍTULO I\n\n{_ART1}\n\nFim."]
+
+
+class TestPassageIndex:
+    """Testes para PassageIndex e dedupe_passages."""
+
+    def test_near_duplicates_across_documents(self):
+        """A mesma passagem em vários documentos é enviada uma vez."""
+        index = PassageIndex()
+        first = list(index.add_document("lei.txt", f"{_ART1}\n\n{_ART2}"))
+        second = list(index.add_document("aula.pdf", f"{_NOTES}\n\n{_ART1.upper()}"))
+
+        assert [new for _, new in first] == [True, True]
+        assert [new for _, new in second] == [True, False]
+        assert second[1][0].passage_id == first[0][0].passage_id
+        assert first[0][0].sources == ["lei.txt", "aula.pdf"]
+        assert index.passages_of("aula.pdf") == ["p3", "p1"]
+        assert index.total == 4
+        assert len(index) == 3
+
+    def test_dedupe_passages(self):
+        """Passagens repetidas dentro do mesmo documento também são agrupadas."""
+        passages = dedupe_passages(
+            [("a", f"{_ART1}\n\n{_ART1}"), ("b", _ART2), ("c", _ART2)]
+        )
+
+        assert [p.text for p in passages] == [_ART1, _ART2]
+        assert [p.sources for p in passages] == [["a"], ["b", "c"]]
@@ -0,0 +1,308 @@
+"""Testes para o processamento em lote de diretórios."""
+
+import json
+
+import pytest
+
+from legal_anki import pipeline
+from legal_anki.exporters import ExportError
+from legal_anki.models import AnkiCard, BatchCardResponse, CardResponse, ItemCards
+from legal_anki.identity import card_guid, card_source, deck_id_for
+from legal_anki.pipeline import batch_root, collect_inputs, is_batch_target, run_batch
+
+
+class EchoMockClient:
+    """Mock que gera um card por chamada, citando o início do chunk."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_structured(self, system_prompt, user_message, response_model):
+        assert response_model is CardResponse
+        self.calls += 1
+        marker = user_message.split("---")[1].strip().splitlines()[0]
+        return CardResponse(
+            cards=[
+                AnkiCard(
+                    front=f"Pergunta sobre: {marker}?",
+                    back="Resposta com fundamento no art. 5º da CF/88.",
+                    card_type="basic",
+                    tags=["teste"],
+                )
+            ]
+        )
+
+
+class SameFrontMockClient:
+    """Mock que gera sempre o mesmo card, qualquer que seja o arquivo."""
+
+    def generate_structured(self, system_prompt, user_message, response_model):
+        return CardResponse(
+            cards=[
+                AnkiCard(
+                    front="Qual o objeto da lei?",
+                    back="Resposta com fundamento no art. 5º da CF/88.",
+                    card_type="basic",
+                    tags=["teste"],
+                )
+            ]
+        )
+
+
+class PassageMockClient:
+    """Mock em lote que gera um card por item, citando o início do item."""
+
+    def __init__(self):
+        self.items: list[str] = []
+        self.messages: list[str] = []
+
+    def generate_structured(self, system_prompt, user_message, response_model):
+        assert response_model is BatchCardResponse
+        self.messages.append(user_message)
+        entries = []
+        for block in user_message.split("[ITEM ")[1:]:
+            local_id, _, body = block.partition("]\n")
+            marker = body.splitlines()[0][:60]
+            self.items.append(marker)
+            entries.append(
+                ItemCards(
+                    item_id=local_id,
+                    cards=[
+                        AnkiCard(
+                            front=f"Pergunta sobre: {marker}?",
+                            back="Resposta com fundamento no art. 5º da CF/88.",
+                            card_type="basic",
+                            tags=["teste"],
+                        )
+                    ],
+                )
+            )
+        return BatchCardResponse(items=entries)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    src = tmp_path / "entrada"
+    (src / "sub").mkdir(parents=True)
+    (src / "lei_a.txt").write_text("Art. 1º Texto da lei A.", encoding="utf-8")
+    (src / "sub" / "lei_b.txt").write_text("Art. 2º Texto da lei B.", encoding="utf-8")
+    (src / "sub" / "lei_a.txt").write_text("Art. 3º Outra lei A.", encoding="utf-8")
+    (src / "vazio.txt").write_text("   ", encoding="utf-8")
+    (src / "ignorar.xlsx").write_text("x", encoding="utf-8")
+    return src
+
+
+class TestCollectInputs:
+    """Testes para collect_inputs e is_batch_target."""
+
+    def test_directory_is_recursive(self, corpus):
+        """Diretórios são percorridos recursivamente, só extensões suportadas."""
+        names = [p.relative_to(corpus).as_posix() for p in collect_inputs(corpus)]
+
+        assert names == ["lei_a.txt", "sub/lei_a.txt", "sub/lei_b.txt", "vazio.txt"]
+
+    def test_glob(self, corpus):
+        """Padrões glob são expandidos."""
+        paths = collect_inputs(str(corpus / "**" / "lei_b.*"))
+
+        assert [p.name for p in paths] == ["lei_b.txt"]
+
+    def test_is_batch_target(self, corpus):
+        """Diretório e glob com resultados são lote; arquivo e texto, não."""
+        assert is_batch_target(str(corpus))
+        assert is_batch_target(str(corpus / "*.txt"))
+        assert not is_batch_target(str(corpus / "lei_a.txt"))
+        assert not is_batch_target("O que é ADI?")
+
+
+    def test_batch_root(self, corpus):
+        """Raiz do lote: o diretório, o prefixo sem curingas do glob ou a pasta do arquivo."""
+        assert batch_root(corpus) == corpus
+        assert batch_root(f"{corpus}/**/*.txt") == corpus
+        assert batch_root(corpus / "lei_a.txt") == corpus
+
+
+class TestRunBatch:
+    """Testes para run_batch."""
+
+    def test_per_file_outputs(self, corpus, tmp_path):
+        """Um arquivo de saída por entrada, sem colisão de nomes."""
+        out = tmp_path / "saida"
+        mock = EchoMockClient()
+
+        summary = run_batch(
+            collect_inputs(corpus),
+            topic="teste",
+            output_format="json",
+            output_dir=out,
+            llm_client=mock,
+            parse_workers=2,
+        )
+
+        assert sorted(p.name for p in out.iterdir()) == ["lei_a.json", "lei_a_2.json", "lei_b.json"]
+        assert mock.calls == 3
+        assert summary.cards == 3
+        assert list(summary.failed) == [str(corpus / "vazio.txt")]
+        assert [s.name for s in summary.stages] == ["extração", "geração", "exportação"]
+        assert summary.stages[0].items == 3
+
+    def test_same_name_in_different_folders(self, corpus, tmp_path):
+        """Arquivos homônimos geram GUIDs diferentes (origem relativa à raiz)."""
+        out = tmp_path / "saida"
+
+        run_batch(
+            collect_inputs(corpus),
+            topic="teste",
+            output_format="json",
+            output_dir=out,
+            llm_client=SameFrontMockClient(),
+            parse_workers=1,
+            root=corpus,
+        )
+
+        cards = [
+            AnkiCard(**c)
+            for name in ("lei_a.json", "lei_a_2.json", "lei_b.json")
+            for c in json.loads((out / name).read_text(encoding="utf-8"))["cards"]
+        ]
+        assert [card_source(c) for c in cards] == ["lei_a.txt", "sub/lei_a.txt", "sub/lei_b.txt"]
+        assert len({card_guid(c) for c in cards}) == 3
+
+    def test_per_file_deck_names_use_relative_path(self, corpus, tmp_path, monkeypatch):
+        """No modo por arquivo, o deck leva o caminho relativo (IDs distintos)."""
+        decks = {}
+        real_export = pipeline.export_cards
+
+        def recording_export(cards, output_path, **kwargs):
+            decks[output_path.name] = kwargs["deck_name"]
+            return real_export(cards, output_path, **kwargs)
+
+        monkeypatch.setattr(pipeline, "export_cards", recording_export)
+
+        run_batch(
+            collect_inputs(corpus),
+            topic="teste",
+            output_format="json",
+            output_dir=tmp_path / "saida",
+            llm_client=EchoMockClient(),
+            parse_workers=1,
+        )
+
+        assert decks == {
+            "lei_a.json": "lei_a",
+            "lei_a_2.json": "sub/lei_a",
+            "lei_b.json": "sub/lei_b",
+        }
+        assert deck_id_for(decks["lei_a.json"]) != deck_id_for(decks["lei_a_2.json"])
+
+    def test_export_failure_is_isolated(self, corpus, tmp_path, monkeypatch):
+        """Falha ao exportar um arquivo é registrada sem perder os demais."""
+        real_export = pipeline.export_cards
+
+        def flaky_export(cards, output_path, **kwargs):
+            if output_path.stem == "lei_b":
+                raise ExportError("disco cheio")
+            return real_export(cards, output_path, **kwargs)
+
+        monkeypatch.setattr(pipeline, "export_cards", flaky_export)
+        out = tmp_path / "saida"
+
+        summary = run_batch(
+            collect_inputs(corpus),
+            topic="teste",
+            output_format="json",
+            output_dir=out,
+            llm_client=EchoMockClient(),
+            parse_workers=1,
+        )
+
+        assert sorted(p.name for p in out.iterdir()) == ["lei_a.json", "lei_a_2.json"]
+        assert summary.cards == 2
+        assert summary.failed[str(corpus / "sub" / "lei_b.txt")] == "disco cheio"
+
+    def test_merged_output(self, corpus, tmp_path):
+        """Modo mesclado grava todos os cards num único arquivo."""
+        merged = tmp_path / "todos.json"
+
+        summary = run_batch(
+            collect_inputs(corpus),
+            topic="teste",
+            output_format="json",
+            merged_output=merged,
+            llm_client=EchoMockClient(),
+            parse_workers=1,
+        )
+
+        data = json.loads(merged.read_text(encoding="utf-8"))
+        assert summary.outputs == [str(merged)]
+        assert len(data["cards"]) == 3
+        assert "3 cards" in summary.format()
+
+    def test_requires_exactly_one_output(self, corpus):
+        """Exige output_dir ou merged_output (e não ambos)."""
+        with pytest.raises(ValueError, match="exatamente um"):
+            run_batch([], topic="t", llm_client=EchoMockClient())
+
+    def test_dedupe_passages(self, tmp_path):
+        """Passagens repetidas entre arquivos são geradas uma vez e atribuídas a todos."""
+        art = (
+            "Art. 5º Todos são iguais perante a lei, sem distinção de qualquer "
+            "natureza, garantindo-se aos brasileiros e aos estrangeiros residentes "
+            "no País a inviolabilidade do direito à vida, à liberdade, à "
+            "igualdade, à segurança e à propriedade."
+        )
+        notes = (
+            "Anotações de aula sobre remédios constitucionais: habeas corpus, "
+            "mandado de segurança, habeas data e mandado de injunção, com os "
+            "respectivos legitimados e hipóteses de cabimento segundo a "
+            "jurisprudência do STF."
+        )
+        src = tmp_path / "in"
+        src.mkdir()
+        (src / "lei.txt").write_text(art, encoding="utf-8")
+        (src / "aula.txt").write_text(f"{notes}\n\n{art}", encoding="utf-8")
+        out = tmp_path / "out"
+        mock = PassageMockClient()
+
+        summary = run_batch(
+            collect_inputs(src),
+            topic="teste",
+            output_format="json",
+            output_dir=out,
+            llm_client=mock,
+            parse_workers=1,
+            dedupe_passages=True,
+        )
+
+        assert len(mock.items) == 2
+        assert (summary.passages, summary.unique_passages) == (3, 2)
+        aula = json.loads((out / "aula.json").read_text(encoding="utf-8"))["cards"]
+        lei = json.loads((out / "lei.json").read_text(encoding="utf-8"))["cards"]
+        assert len(aula) == 2
+        assert [c["front"] for c in lei] == [aula[1]["front"]]
+        assert "1 duplicadas" in summary.format()
+
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_dedupe_passages_honours_routing_and_citations(self, tmp_path, enabled):
+        """route_by_type e use_citations também valem para passagens deduplicadas."""
+        src = tmp_path / "in"
+        src.mkdir()
+        (src / "sv.txt").write_text(
+            "Súmula Vinculante 11 do STF: só é lícito o uso de algemas", encoding="utf-8"
+        )
+        mock = PassageMockClient()
+
+        run_batch(
+            collect_inputs(src),
+            topic="teste",
+            output_dir=tmp_path / "out",
+            llm_client=mock,
+            parse_workers=1,
+            dedupe_passages=True,
+            route_by_type=enabled,
+            use_citations=enabled,
+        )
+
+        message = "\n".join(mock.messages)
+        assert ("apenas cards do tipo 'jurisprudencia'" in message) is enabled
+        assert ("Súmulas: Súmula Vinculante 11" in message) is enabled
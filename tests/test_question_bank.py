@@ -0,0 +1,150 @@
+"""Testes para a conversão direta de bancos de questões."""
+
+import pytest
+
+from legal_anki.models import AnkiCard, BatchCardResponse, ItemCards
+from legal_anki.parsers import ParseError
+from legal_anki.question_bank import detect_columns, iter_question_bank, row_to_card
+from legal_anki.validators import CardValidationError
+
+HEADER = "Enunciado;Gabarito;Banca;Ano;Cargo;Fundamentação\n"
+
+
+class FundamentoMockClient:
+    """Mock que devolve um card com fundamento para cada item do lote."""
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def generate_structured(self, system_prompt, user_message, response_model):
+        assert response_model is BatchCardResponse
+        self.calls.append(user_message)
+        n = user_message.count("[/ITEM ")
+        return BatchCardResponse(
+            items=[
+                ItemCards(
+                    item_id=str(i),
+                    cards=[
+                        AnkiCard(
+                            front="Pergunta reescrita pelo modelo?",
+                            back="Resposta do modelo.",
+                            card_type="questao",
+                            extra={"fundamento": "Art. 5º, LXIII, CF/88"},
+                        )
+                    ],
+                )
+                for i in range(1, n + 1)
+            ]
+        )
+
+
+def _write(tmp_path, body: str, header: str = HEADER):
+    path = tmp_path / "banco.csv"
+    path.write_text(header + body, encoding="utf-8")
+    return path
+
+
+class TestDetectColumns:
+    """Testes para detect_columns."""
+
+    def test_aliases_and_accents(self):
+        """Colunas são reconhecidas por alias, sem acento e sem caixa."""
+        columns = detect_columns(["Questão", "Resposta", "BANCA", "Fundamentação"])
+
+        assert columns == {
+            "enunciado": "Questão",
+            "gabarito": "Resposta",
+            "banca": "BANCA",
+            "fundamento": "Fundamentação",
+        }
+
+    def test_missing_required_column(self):
+        """Sem enunciado/gabarito, levanta ParseError."""
+        with pytest.raises(ParseError, match="gabarito"):
+            detect_columns(["enunciado", "banca"])
+
+
+class TestRowToCard:
+    """Testes para row_to_card."""
+
+    COLUMNS = {"enunciado": "e", "gabarito": "g", "banca": "b", "ano": "a"}
+
+    def test_builds_questao_card(self):
+        """Linha completa vira card de questão com tags de tópico e dificuldade."""
+        card = row_to_card(
+            {"e": "O preso tem direito ao silêncio.", "g": "Certo", "b": "CESPE", "a": "2022"},
+            self.COLUMNS,
+            topic="direitos fundamentais",
+        )
+
+        assert card.card_type == "questao"
+        assert card.back == "Gabarito: Certo"
+        assert card.extra == {"banca": "CESPE", "ano": "2022"}
+        assert card.tags == ["direitos_fundamentais", "dificuldade::medio"]
+
+    def test_metadata_from_enunciado(self):
+        """Banca e ano ausentes são extraídos do enunciado."""
+        card = row_to_card(
+            {"e": "(FGV/2019 - Analista) O preso tem direito ao silêncio.", "g": "C"},
+            self.COLUMNS,
+            topic="t",
+        )
+
+        assert card.extra["banca"] == "FGV"
+        assert card.extra["ano"] == "2019"
+
+    def test_invalid_row_raises(self):
+        """Linha sem banca/ano em lugar algum é inválida."""
+        with pytest.raises(CardValidationError, match="banca"):
+            row_to_card({"e": "O preso tem direito ao silêncio.", "g": "Certo"}, self.COLUMNS, "t")
+
+    def test_empty_enunciado_raises(self):
+        """Enunciado vazio é inválido."""
+        with pytest.raises(CardValidationError):
+            row_to_card({"e": "", "g": "Certo", "b": "FCC", "a": "2020"}, self.COLUMNS, "t")
+
+
+class TestIterQuestionBank:
+    """Testes para iter_question_bank."""
+
+    def test_converts_without_llm(self, tmp_path):
+        """Sem enriquecimento, converte todas as linhas válidas."""
+        path = _write(
+            tmp_path,
+            "Questão sobre o direito ao silêncio;Certo;CESPE;2022;Juiz;Art. 5º, LXIII\n"
+            "Questão sobre a casa como asilo;Errado;FCC;2021;;\n"
+            "Questão sem metadados de banca;Certo;;;;\n",
+        )
+
+        result = list(iter_question_bank(path, topic="direitos"))
+
+        assert [item_id for item_id, _ in result] == ["banco.csv:1", "banco.csv:2"]
+        assert result[0][1].extra["fundamento"] == "Art. 5º, LXIII"
+        assert "Fundamento: Art. 5º, LXIII" in result[0][1].back
+
+    def test_enriches_only_rows_missing_fundamento(self, tmp_path):
+        """Apenas linhas sem fundamento vão ao LLM; o resto vem do CSV."""
+        path = _write(
+            tmp_path,
+            "Questão sobre o direito ao silêncio;Certo;CESPE;2022;Juiz;Art. 5º, LXIII\n"
+            "Questão sobre a casa como asilo;Errado;FCC;2021;;\n",
+        )
+        mock = FundamentoMockClient()
+
+        result = dict(
+            iter_question_bank(path, topic="direitos", enrich_missing=True, llm_client=mock)
+        )
+
+        assert len(mock.calls) == 1
+        assert mock.calls[0].count("[/ITEM ") == 1
+        enriched = result["banco.csv:2"]
+        assert enriched.front == "Questão sobre a casa como asilo"
+        assert enriched.extra["banca"] == "FCC"
+        assert enriched.extra["fundamento"] == "Art. 5º, LXIII, CF/88"
+
+    def test_missing_columns(self, tmp_path):
+        """CSV sem colunas de questão levanta ParseError."""
+        path = _write(tmp_path, "a;b\n", header="titulo;texto\n")
+
+        with pytest.raises(ParseError):
+            list(iter_question_bank(path, topic="t"))
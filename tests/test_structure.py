@@ -0,0 +1,125 @@
+"""Testes para o índice estrutural de textos normativos."""
+
+import pytest
+
+from legal_anki.structure import build_index
+
+SAMPLE = """CONSTITUIÇÃO DA REPÚBLICA FEDERATIVA DO BRASIL
+TÍTULO I
+Art. 1º A República Federativa do Brasil tem como fundamentos:
+I - a soberania;
+II - a cidadania;
+Parágrafo único. Todo o poder emana do povo.
+TÍTULO II
+Art. 5º Todos são iguais perante a lei:
+I - homens e mulheres são iguais em direitos e obrigações;
+LXIII - o preso será informado de seus direitos;
+§ 1º As normas definidoras dos direitos têm aplicação imediata.
+§ 3º Os tratados sobre direitos humanos:
+a) aprovados em dois turnos;
+b) por três quintos dos votos;
+Art. 103-A. O Supremo Tribunal Federal poderá aprovar súmula.
+ATO DAS DISPOSIÇÕES CONSTITUCIONAIS TRANSITÓRIAS
+Art. 2º No dia 7 de setembro de 1993 o eleitorado definirá.
+"""
+
+
+@pytest.fixture
+def index():
+    return build_index(SAMPLE)
+
+
+class TestBuildIndex:
+    """Testes para build_index."""
+
+    def test_articles_in_order(self, index):
+        """Artigos são indexados na ordem, com prefixo para o ADCT."""
+        assert list(index.articles) == ["art1", "art5", "art103-a", "adct.art2"]
+        assert len(index) == 4
+
+    def test_nested_lookup(self, index):
+        """Consulta hierárquica por artigo, parágrafo, inciso e alínea."""
+        inciso = index["art5"]["LXIII"]
+        assert inciso.kind == "inciso"
+        assert index.text_of(inciso) == "LXIII - o preso será informado de seus direitos;"
+
+        alinea = index["art5"]["§ 3º"]["b"]
+        assert alinea.kind == "alinea"
+        assert alinea.ref == "art. 5º, § 3º, b"
+
+    def test_lookup_key_normalization(self, index):
+        """Chaves aceitam as grafias usuais."""
+        assert index["Art. 5º"] is index["art5"]
+        assert index["art1"]["Parágrafo único"].ref == "art. 1º, parágrafo único"
+        assert index["art103-A"].ref == "art. 103-A"
+        assert "art9" not in index
+        assert index.get("art9") is None
+
+    def test_incisos_belong_to_article_not_paragraph(self, index):
+        """Incisos antes de um parágrafo pertencem ao caput."""
+        art1 = index["art1"]
+        assert list(art1.children) == ["I", "II", "parunico"]
+        assert art1["parunico"].children == {}
+
+    def test_headings_close_articles(self, index):
+        """Títulos encerram o artigo anterior."""
+        assert index.text_of(index["art1"]).endswith("Todo o poder emana do povo.")
+        assert index.locate(SAMPLE.index("TÍTULO II")) is None
+        assert index.locate(0) is None
+
+    def test_adct(self, index):
+        """Artigos do ADCT não colidem com os do corpo permanente."""
+        assert index["adct.art2"].ref == "art. 2º do ADCT"
+        assert "o eleitorado" in index.text_of(index["adct.art2"])
+
+    def test_duplicate_numbering_keeps_first(self):
+        """Numeração repetida mantém a primeira ocorrência."""
+        text = "Art. 1º Texto original.\nI - inciso;\nArt. 1º Texto repetido.\nII - outro;"
+        index = build_index(text)
+        assert index.text_of(index["art1"]) == "Art. 1º Texto original.\nI - inciso;"
+        assert list(index["art1"].children) == ["I"]
+        assert index.locate(text.index("repetido")) is None
+
+    def test_thousand_separator(self):
+        """Artigos com milhar ('Art. 1.228') são normalizados."""
+        index = build_index("Art. 1.228. O proprietário tem a faculdade de usar.")
+        assert index["art1228"].ref == "art. 1228"
+
+
+class TestLocateAndResolve:
+    """Testes para atribuição de fonte e resolução de citações."""
+
+    def test_locate_deepest(self, index):
+        """locate retorna o dispositivo mais específico."""
+        assert index.locate(SAMPLE.index("preso")).ref == "art. 5º, LXIII"
+        assert index.locate(SAMPLE.index("três quintos")).ref == "art. 5º, § 3º, b"
+        assert index.locate(SAMPLE.index("Todos são iguais")).ref == "art. 5º"
+
+    @pytest.mark.parametrize(
+        "citation,expected",
+        [
+            ("art. 5º, LXIII", "art. 5º, LXIII"),
+            ("Art. 5º, inciso LXIII, da CF", "art. 5º, LXIII"),
+            ("art. 5º, § 3º, alínea b", "art. 5º, § 3º, b"),
+            ("artigo 1º, parágrafo único", "art. 1º, parágrafo único"),
+            ("art. 2º do ADCT", "art. 2º do ADCT"),
+            ("Art. 103-A da CF/88", "art. 103-A"),
+        ],
+    )
+    def test_resolve(self, index, citation, expected):
+        """Citações usuais são resolvidas para o dispositivo."""
+        assert index.resolve(citation).ref == expected
+
+    @pytest.mark.parametrize(
+        "citation", ["art. 9º", "art. 5º, LXXX", "art. 5º, § 2º", "Súmula 473"]
+    )
+    def test_resolve_missing(self, index, citation):
+        """Dispositivos inexistentes resultam em None."""
+        assert index.resolve(citation) is None
+
+    def test_segments(self, index):
+        """segments gera o texto de cada artigo."""
+        segments = list(index.segments())
+        assert len(segments) == 4
+        assert segments[0].startswith("Art. 1º")
+        assert segments[1].endswith("b) por três quintos dos votos;")
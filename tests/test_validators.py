@@ -5,6 +5,7 @@ import pytest
 from legal_anki.models import AnkiCard
 from legal_anki.validators import (
     CardValidationError,
+    has_legal_basis,
     validate_card,
     validate_cards_batch,
 )
@@ -178,6 +179,20 @@ class TestValidateCard:
         assert validate_card(card) is True
 
 
+class TestHasLegalBasis:
+    """Testes para has_legal_basis."""
+
+    def test_extra_or_back(self):
+        """Fundamento vem do extra ou de uma referência legal no verso."""
+        base = {"front": "Qual o prazo?", "card_type": "basic"}
+        with_extra = AnkiCard(**base, back="120 dias", extra={"fundamento": "Lei 12.016/2009"})
+        in_back = AnkiCard(**base, back="120 dias (art. 23 da Lei 12.016)")
+        without = AnkiCard(**base, back="120 dias")
+        assert has_legal_basis(with_extra)
+        assert has_legal_basis(in_back)
+        assert not has_legal_basis(without)
+
+
 class TestValidateCardsBatch:
     """Testes para validate_cards_batch."""
 